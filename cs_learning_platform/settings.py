@@ -77,6 +77,11 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'cs_learning_platform.wsgi.application'
 
+# 生产环境通过gunicorn + UvicornWorker以ASGI方式运行：
+# 流式接口（名词聊天、练习任务状态、资源流式搜索）是异步视图，
+# 在WSGI同步worker下会被整体缓冲后才返回
+ASGI_APPLICATION = 'cs_learning_platform.asgi.application'
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -121,9 +126,46 @@ USE_TZ = True
 
 # Kimi API 配置
 KIMI_API_KEY = os.environ.get('KIMI_API_KEY', '')
-KIMI_API_URL = 'https://api.moonshot.cn/v1/chat/completions'
+KIMI_API_URL = os.environ.get('KIMI_API_URL', 'https://api.moonshot.cn/v1/chat/completions')
 KIMI_MODEL = 'moonshot-v1-8k'
 
+# GLM API 配置（本地测试时可指向 mock_llm_server）
+GLM_API_URL = os.environ.get('GLM_API_URL', 'https://open.bigmodel.cn/api/paas/v4/chat/completions')
+
+# 大模型共享传输层：按服务商覆盖并发上限、连接池大小、重试与熔断参数
+LLM_TRANSPORT = {
+    'kimi': {'max_concurrency': 4, 'pool_size': 4},
+    'glm': {'max_concurrency': 8, 'pool_size': 8},
+}
+
+# AI回答缓存是否持久化到数据库（重启后仍可命中）
+AI_RESPONSE_CACHE_PERSIST = True
+
+# 题库/错题集PDF导出：后台渲染线程数、请求内等待生成的秒数
+PDF_EXPORT_WORKERS = 2
+PDF_EXPORT_WAIT_SECONDS = 8
+# 配置为Nginx internal location前缀（指向 MEDIA_ROOT/pdf_exports）后由Nginx发送文件
+PDF_EXPORT_ACCEL_REDIRECT = os.environ.get('PDF_EXPORT_ACCEL_REDIRECT', '')
+
+# 学习资源聚合：按平台覆盖请求超时、并发上限与连接池大小（'default'对所有平台生效）
+RESOURCE_AGGREGATOR_PLATFORMS = {
+    'default': {'timeout': 8, 'connect_timeout': 3, 'max_concurrency': 4, 'pool_size': 8},
+    'bilibili': {'max_concurrency': 2},
+}
+# 一次多平台搜索的最长等待秒数
+RESOURCE_AGGREGATOR_SEARCH_TIMEOUT = 15
+# 流式搜索的截止秒数，之后仍未返回的平台结果被丢弃
+RESOURCE_AGGREGATOR_STREAM_DEADLINE = 6
+# 搜索结果缓存：新鲜期（秒）、过期后仍可返回旧结果并后台刷新的宽限期（秒）
+RESOURCE_SEARCH_CACHE_TTL = 3600
+RESOURCE_SEARCH_CACHE_STALE_TTL = 6 * 3600
+
+# 交互式数据结构（如单链表可视化）按会话保存：共享缓存别名、空闲过期秒数、每个进程内保留的对象数与估算内存上限
+SESSION_STRUCTURE_CACHE_ALIAS = 'session_structures'
+SESSION_STRUCTURE_IDLE_TTL = 60 * 60
+SESSION_STRUCTURE_LOCAL_MAX_ENTRIES = 256
+SESSION_STRUCTURE_LOCAL_MAX_BYTES = 4 * 1024 * 1024
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
@@ -208,7 +250,14 @@ CACHES = {
             'MAX_ENTRIES': 1000,
             'CULL_FREQUENCY': 3,
         }
-    }
+    },
+    # 交互式数据结构的会话状态：多进程部署时必须使用各进程共享的后端（数据库或Redis），
+    # 进程内缓存只对当前进程可见。数据库缓存表由 createcachetable 创建
+    'session_structures': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'session_structure_cache',
+        'TIMEOUT': 60 * 60,
+    },
 }
 
 # 会话配置优化（暂时使用默认配置）
@@ -105,7 +105,13 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
         'LOCATION': REDIS_URL,
-    }
+    },
+    # 交互式数据结构的会话状态，所有gunicorn工作进程共享
+    'session_structures': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'TIMEOUT': 60 * 60,
+    },
 }
 
 # 邮件配置（用于发送反馈等）
@@ -18,6 +18,7 @@ PROJECT_DIR="/var/www/$PROJECT_NAME"
 VENV_DIR="$PROJECT_DIR/venv"
 NGINX_CONFIG="/etc/nginx/sites-available/$PROJECT_NAME"
 SYSTEMD_SERVICE="/etc/systemd/system/$PROJECT_NAME.service"
+WORKER_SERVICE="/etc/systemd/system/${PROJECT_NAME}_worker.service"
 
 # 检查是否为root用户
 if [ "$EUID" -ne 0 ]; then
@@ -59,7 +60,7 @@ source $VENV_DIR/bin/activate
 
 echo -e "${BLUE}7. 安装Python依赖...${NC}"
 pip install --upgrade pip
-pip install django mysqlclient gunicorn redis python-dotenv
+pip install django mysqlclient gunicorn uvicorn aiohttp redis python-dotenv numpy
 
 # 如果有requirements.txt文件
 if [ -f "requirements.txt" ]; then
@@ -84,6 +85,7 @@ echo -e "${YELLOW}请编辑 $PROJECT_DIR/.env 文件，填入正确的配置信
 echo -e "${BLUE}9. 数据库迁移...${NC}"
 python manage.py makemigrations
 python manage.py migrate --settings=cs_learning_platform.settings_production
+python manage.py createcachetable --settings=cs_learning_platform.settings_production
 
 echo -e "${BLUE}10. 收集静态文件...${NC}"
 python manage.py collectstatic --noinput --settings=cs_learning_platform.settings_production
@@ -103,13 +105,37 @@ User=www-data
 Group=www-data
 WorkingDirectory=$PROJECT_DIR
 Environment="PATH=$VENV_DIR/bin"
-ExecStart=$VENV_DIR/bin/gunicorn --workers 3 --bind unix:$PROJECT_DIR/cs_learning_platform.sock cs_learning_platform.wsgi:application --settings=cs_learning_platform.settings_production
+ExecStart=$VENV_DIR/bin/gunicorn --workers 3 --worker-class uvicorn.workers.UvicornWorker --bind unix:$PROJECT_DIR/cs_learning_platform.sock cs_learning_platform.asgi:application --env DJANGO_SETTINGS_MODULE=cs_learning_platform.settings_production
 Restart=always
 
 [Install]
 WantedBy=multi-user.target
 EOF
 
+# AI练习生成工作进程：练习池未命中时生成任务进入队列，由它领取执行
+cat > $WORKER_SERVICE << EOF
+[Unit]
+Description=CS Learning Platform AI Exercise Worker
+After=network.target
+
+[Service]
+User=www-data
+Group=www-data
+WorkingDirectory=$PROJECT_DIR
+Environment="PATH=$VENV_DIR/bin"
+Environment="DJANGO_SETTINGS_MODULE=cs_learning_platform.settings_production"
+ExecStart=$VENV_DIR/bin/python manage.py run_exercise_worker --processes 2
+# 主进程收到SIGINT后通知子进程做完当前任务再退出
+KillSignal=SIGINT
+KillMode=mixed
+TimeoutStopSec=300
+Restart=always
+RestartSec=10
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
 echo -e "${BLUE}13. 配置Nginx...${NC}"
 cat > $NGINX_CONFIG << EOF
 server {
@@ -153,6 +179,8 @@ echo -e "${BLUE}16. 启动服务...${NC}"
 systemctl daemon-reload
 systemctl enable $PROJECT_NAME
 systemctl start $PROJECT_NAME
+systemctl enable ${PROJECT_NAME}_worker
+systemctl start ${PROJECT_NAME}_worker
 systemctl enable nginx
 systemctl restart nginx
 
@@ -161,8 +189,9 @@ echo -e "${YELLOW}请检查以下内容:${NC}"
 echo "1. 编辑 $PROJECT_DIR/.env 文件"
 echo "2. 编辑 $NGINX_CONFIG 文件中的域名"
 echo "3. 检查服务状态: systemctl status $PROJECT_NAME"
-echo "4. 检查Nginx状态: systemctl status nginx"
-echo "5. 查看日志: journalctl -u $PROJECT_NAME -f"
+echo "4. 检查练习生成工作进程: systemctl status ${PROJECT_NAME}_worker"
+echo "5. 检查Nginx状态: systemctl status nginx"
+echo "6. 查看日志: journalctl -u $PROJECT_NAME -f"
 
 echo -e "${BLUE}如果使用域名，请配置DNS解析到服务器IP${NC}"
 echo -e "${BLUE}如果需要HTTPS，请安装SSL证书${NC}"
@@ -18,6 +18,7 @@ PROJECT_DIR="/var/www/$PROJECT_NAME"
 VENV_DIR="$PROJECT_DIR/venv"
 NGINX_CONFIG="/etc/nginx/sites-available/$PROJECT_NAME"
 SYSTEMD_SERVICE="/etc/systemd/system/$PROJECT_NAME.service"
+WORKER_SERVICE="/etc/systemd/system/${PROJECT_NAME}_worker.service"
 
 # 检查是否为root用户
 if [ "$EUID" -ne 0 ]; then
@@ -56,6 +57,7 @@ pip install -r requirements.txt
 echo -e "${BLUE}6. 运行数据库迁移...${NC}"
 python manage.py makemigrations --settings=cs_learning_platform.settings_production
 python manage.py migrate --settings=cs_learning_platform.settings_production
+python manage.py createcachetable --settings=cs_learning_platform.settings_production
 
 echo -e "${BLUE}7. 收集静态文件...${NC}"
 python manage.py collectstatic --noinput --settings=cs_learning_platform.settings_production
@@ -76,7 +78,32 @@ Group=www-data
 WorkingDirectory=$PROJECT_DIR
 Environment="PATH=$VENV_DIR/bin"
 EnvironmentFile=$PROJECT_DIR/.env
-ExecStart=$VENV_DIR/bin/gunicorn --workers 3 --bind unix:$PROJECT_DIR/cs_learning_platform.sock cs_learning_platform.wsgi:application --settings=cs_learning_platform.settings_production
+ExecStart=$VENV_DIR/bin/gunicorn --workers 3 --worker-class uvicorn.workers.UvicornWorker --bind unix:$PROJECT_DIR/cs_learning_platform.sock cs_learning_platform.asgi:application --env DJANGO_SETTINGS_MODULE=cs_learning_platform.settings_production
+Restart=always
+RestartSec=10
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+# AI练习生成工作进程：练习池未命中时生成任务进入队列，由它领取执行
+cat > $WORKER_SERVICE << EOF
+[Unit]
+Description=CS Learning Platform AI Exercise Worker
+After=network.target
+
+[Service]
+User=www-data
+Group=www-data
+WorkingDirectory=$PROJECT_DIR
+Environment="PATH=$VENV_DIR/bin"
+Environment="DJANGO_SETTINGS_MODULE=cs_learning_platform.settings_production"
+EnvironmentFile=$PROJECT_DIR/.env
+ExecStart=$VENV_DIR/bin/python manage.py run_exercise_worker --processes 2
+# 主进程收到SIGINT后通知子进程做完当前任务再退出
+KillSignal=SIGINT
+KillMode=mixed
+TimeoutStopSec=300
 Restart=always
 RestartSec=10
 
@@ -159,6 +186,8 @@ echo -e "${BLUE}14. 启动服务...${NC}"
 systemctl daemon-reload
 systemctl enable $PROJECT_NAME
 systemctl start $PROJECT_NAME
+systemctl enable ${PROJECT_NAME}_worker
+systemctl start ${PROJECT_NAME}_worker
 systemctl enable nginx
 systemctl restart nginx
 systemctl enable redis-server
@@ -192,6 +221,7 @@ echo -e "${GREEN}✅ 部署完成！${NC}"
 echo -e "${YELLOW}部署后检查清单:${NC}"
 echo "1. 检查服务状态:"
 echo "   systemctl status $PROJECT_NAME"
+echo "   systemctl status ${PROJECT_NAME}_worker"
 echo "   systemctl status nginx"
 echo "   systemctl status redis-server"
 echo ""
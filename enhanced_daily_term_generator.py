@@ -19,6 +19,8 @@ from typing import Dict, List, Optional, Tuple, Any
 from collections import defaultdict, Counter
 import time
 import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 
 # 导入配置
@@ -169,6 +171,25 @@ class QualityAnalyzer:
         
         return suggestions
 
+class RateLimiter:
+    """线程安全的请求限速器（按每分钟请求数均匀放行）"""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute and requests_per_minute > 0 else 0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
 class EnhancedDailyTermGenerator:
     """增强版每日名词生成器"""
     
@@ -181,6 +202,10 @@ class EnhancedDailyTermGenerator:
         self.quality_analyzer = QualityAnalyzer()
         self.generation_history = []
         
+        # 每个线程复用自己的HTTP连接；限速器在批量生成时按配置替换
+        self._local = threading.local()
+        self.rate_limiter = RateLimiter(API_CONFIG.get('requests_per_minute', 0))
+        
         # 设置日志
         self._setup_logging()
         
@@ -243,10 +268,20 @@ class EnhancedDailyTermGenerator:
         
         return self._call_api_with_retry(template_config['system_prompt'], user_prompt)
     
+    def _get_session(self) -> requests.Session:
+        """获取当前线程的HTTP会话（requests.Session不保证线程安全）"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+    
     def _call_api_with_retry(self, system_prompt: str, user_prompt: str) -> Optional[Dict]:
         """带重试的API调用"""
         for attempt in range(API_CONFIG['max_retries']):
             try:
+                self.rate_limiter.acquire()
                 payload = {
                     "model": OPENAI_MODEL,
                     "messages": [
@@ -258,9 +293,8 @@ class EnhancedDailyTermGenerator:
                     "top_p": API_CONFIG['top_p']
                 }
                 
-                response = requests.post(
+                response = self._get_session().post(
                     OPENAI_API_URL,
-                    headers=self.headers,
                     json=payload,
                     timeout=API_CONFIG['timeout']
                 )
@@ -311,60 +345,128 @@ class EnhancedDailyTermGenerator:
         if not domain or not difficulty:
             domain, difficulty = self.select_domain_intelligently()
         
-        self.logger.info(f"生成术语: 领域={CS_DOMAINS[domain]['name']}, 难度={difficulty}, 模板={template}")
-        
-        # 生成术语
-        term_data = self.generate_term_with_template(domain, difficulty, template)
+        term_data = self._generate_and_score(domain, difficulty, template)
         
         if term_data:
-            # 添加领域信息
-            term_data['domain_key'] = domain
-            
-            # 质量分析
-            quality_analysis = self.quality_analyzer.analyze_term(term_data)
-            term_data['quality_analysis'] = quality_analysis
-            
             # 记录到历史
             self.generation_history.append(term_data)
-            
-            self.logger.info(f"生成成功: {term_data.get('term', 'Unknown')} (质量分数: {quality_analysis['overall_score']:.2f})")
-            
             return term_data
         else:
             self.logger.error("生成失败")
             return None
     
-    def batch_generate_with_analysis(self, count: int = 10, min_quality: float = 0.7) -> List[Dict]:
-        """批量生成并筛选高质量术语"""
+    def _generate_and_score(self, domain: str, difficulty: str, template: str) -> Optional[Dict]:
+        """生成术语并完成质量分析（不修改生成历史，可在工作线程中执行）"""
+        self.logger.info(f"生成术语: 领域={CS_DOMAINS[domain]['name']}, 难度={difficulty}, 模板={template}")
+        
+        # 生成术语
+        term_data = self.generate_term_with_template(domain, difficulty, template)
+        if not term_data:
+            return None
+        
+        # 添加领域信息
+        term_data['domain_key'] = domain
+        
+        # 质量分析
+        quality_analysis = self.quality_analyzer.analyze_term(term_data)
+        term_data['quality_analysis'] = quality_analysis
+        
+        self.logger.info(f"生成成功: {term_data.get('term', 'Unknown')} (质量分数: {quality_analysis['overall_score']:.2f})")
+        return term_data
+    
+    def batch_generate_with_analysis(self, count: int = 10, min_quality: float = 0.7,
+                                     max_workers: int = None, requests_per_minute: float = None,
+                                     stream_file: str = None) -> List[Dict]:
+        """
+        批量生成并筛选高质量术语
+        
+        多个请求在线程池中并发执行，生成和质量分析都在工作线程完成；
+        领域选择与结果汇总在主线程进行，通过质量检查的术语完成一个就追加写入
+        stream_file（JSON Lines），中途中断也不会丢失已生成的结果。
+        
+        Args:
+            count: 需要的术语数量
+            min_quality: 最低质量分数
+            max_workers: 并发请求数，默认读取 API_CONFIG['max_concurrency']
+            requests_per_minute: 每分钟最多请求数，默认读取 API_CONFIG['requests_per_minute']，0表示不限速
+            stream_file: 实时写入结果的文件名（位于输出目录），默认按时间戳生成
+        """
+        max_workers = max(1, max_workers or API_CONFIG.get('max_concurrency', 4))
+        if requests_per_minute is None:
+            requests_per_minute = API_CONFIG.get('requests_per_minute', 60)
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        
+        if not stream_file:
+            stream_file = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        stream_path = self.output_dir / stream_file
+        
         results = []
         attempts = 0
         max_attempts = count * 3  # 最多尝试3倍数量
         
-        self.logger.info(f"开始批量生成 {count} 个术语，最低质量要求: {min_quality}")
+        self.logger.info(
+            f"开始批量生成 {count} 个术语，最低质量要求: {min_quality}，"
+            f"并发数: {max_workers}，限速: {requests_per_minute or '不限'}/分钟"
+        )
         
-        while len(results) < count and attempts < max_attempts:
-            attempts += 1
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='term-gen') as executor, \
+                open(stream_path, 'a', encoding='utf-8') as stream:
+            pending = set()
             
-            # 选择模板
-            template = random.choice(list(TERM_GENERATION_TEMPLATES.keys()))
-            
-            term = self.generate_and_analyze(template=template)
-            
-            if term:
-                quality_score = term['quality_analysis']['overall_score']
+            while True:
+                # 保持线程池满载，已在途的请求足够补齐缺口时不再提交
+                while (len(pending) < max_workers and attempts < max_attempts
+                       and len(results) + len(pending) < count + max_workers // 2):
+                    attempts += 1
+                    domain, difficulty = self.select_domain_intelligently()
+                    template = random.choice(list(TERM_GENERATION_TEMPLATES.keys()))
+                    # 提前记录领域，后续选择时降低其权重
+                    self.generation_history.append({'domain_key': domain, 'pending': True})
+                    pending.add(executor.submit(self._generate_and_score, domain, difficulty, template))
                 
-                if quality_score >= min_quality:
-                    results.append(term)
-                    print(f"✅ 接受术语 {len(results)}/{count}: {term.get('term', 'Unknown')} (质量: {quality_score:.2f})")
-                else:
-                    print(f"❌ 拒绝术语: {term.get('term', 'Unknown')} (质量: {quality_score:.2f} < {min_quality})")
-            
-            # 避免API限制
-            time.sleep(1)
-        
-        self.logger.info(f"批量生成完成: {len(results)}/{count} 个术语通过质量检查")
+                if not pending:
+                    break
+                
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        term = future.result()
+                    except Exception as e:
+                        self.logger.error(f"生成任务异常: {e}")
+                        term = None
+                    
+                    if not term:
+                        continue
+                    
+                    self._replace_pending_history(term)
+                    quality_score = term['quality_analysis']['overall_score']
+                    
+                    if quality_score < min_quality:
+                        print(f"❌ 拒绝术语: {term.get('term', 'Unknown')} (质量: {quality_score:.2f} < {min_quality})")
+                    elif len(results) < count:
+                        results.append(term)
+                        stream.write(json.dumps(term, ensure_ascii=False) + '\n')
+                        stream.flush()
+                        print(f"✅ 接受术语 {len(results)}/{count}: {term.get('term', 'Unknown')} (质量: {quality_score:.2f})")
+                
+                if len(results) >= count:
+                    # 已满足数量，取消尚未开始的请求
+                    for future in pending:
+                        future.cancel()
+                    break
+        
+        self.generation_history = [h for h in self.generation_history if not h.get('pending')]
+        self.logger.info(f"批量生成完成: {len(results)}/{count} 个术语通过质量检查，实时结果: {stream_path}")
         return results
     
+    def _replace_pending_history(self, term: Dict):
+        """用生成结果替换对应领域的占位历史记录"""
+        for i, entry in enumerate(self.generation_history):
+            if entry.get('pending') and entry.get('domain_key') == term.get('domain_key'):
+                self.generation_history[i] = term
+                return
+        self.generation_history.append(term)
+    
     def generate_statistics(self, terms: List[Dict]) -> Dict:
         """生成统计信息"""
         if not terms:
@@ -518,8 +620,11 @@ def main():
             except ValueError:
                 min_quality = 0.7
             
+            workers = input(f"并发请求数 (默认{API_CONFIG.get('max_concurrency', 4)}): ").strip()
+            workers = int(workers) if workers.isdigit() else None
+            
             print(f"\n🔄 开始批量生成 {count} 个高质量术语...")
-            results = generator.batch_generate_with_analysis(count, min_quality)
+            results = generator.batch_generate_with_analysis(count, min_quality, max_workers=workers)
             
             if results:
                 print(f"\n📊 生成完成，共 {len(results)} 个术语")
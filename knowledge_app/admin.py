@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import KnowledgePoint, DailyTerm, TermHistory, AIExerciseSession
+from .models import KnowledgePoint, DailyTerm, TermHistory, AIExerciseSession, CachedAIResponse, ExerciseGenerationJob, PooledExercise
 from .search_models import (
     SearchHistory, PopularSearch, SearchSuggestion,
     KnowledgePointIndex, SearchFilter
@@ -290,6 +290,35 @@ class AIExerciseSessionAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ExerciseGenerationJob)
+class ExerciseGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'knowledge_point', 'difficulty', 'count', 'status', 'attempts', 'worker', 'created_at']
+    list_filter = ['status', 'difficulty', 'created_at']
+    search_fields = ['user__username', 'knowledge_point']
+    readonly_fields = ['session', 'duplicate_of', 'attempts', 'worker', 'error_message', 'created_at', 'started_at', 'finished_at']
+    ordering = ['-created_at']
+
+
+@admin.register(PooledExercise)
+class PooledExerciseAdmin(admin.ModelAdmin):
+    list_display = ['id', 'knowledge_point', 'difficulty', 'created_at', 'used_at']
+    list_filter = ['knowledge_point', 'difficulty', 'used_at']
+    readonly_fields = ['fingerprint', 'created_at', 'used_at']
+
+
+@admin.register(CachedAIResponse)
+class CachedAIResponseAdmin(admin.ModelAdmin):
+    list_display = ['cache_key', 'namespace', 'hit_count', 'created_at', 'expires_at']
+    list_filter = ['namespace', 'created_at']
+    search_fields = ['cache_key']
+    readonly_fields = ['cache_key', 'namespace', 'payload', 'hit_count', 'created_at']
+    ordering = ['-hit_count']
+
+    def has_add_permission(self, request):
+        """缓存由系统自动写入"""
+        return False
+
+
 # 导入练习题管理配置
 from .exercise_admin import *
 
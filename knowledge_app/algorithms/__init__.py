@@ -12,7 +12,7 @@
 4. 测试函数
 """
 
-from .hamming_code import HammingCode
-from .crc_check import CRCChecker
+from .hamming_code import HammingCode, HammingLayout
+from .crc_check import CRCChecker, CRCEngine
 from .single_linklist import SingleLinkedList
-__all__ = ['HammingCode', 'CRCChecker','SingleLinkedList']
\ No newline at end of file
+__all__ = ['HammingCode', 'HammingLayout', 'CRCChecker', 'CRCEngine', 'SingleLinkedList']
\ No newline at end of file
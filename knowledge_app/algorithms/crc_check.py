@@ -8,6 +8,100 @@ CRC是一种根据数据产生简短固定位数校验码的错误检测技术
 创建时间: 2025
 """
 
+from functools import lru_cache
+
+# 常用标准生成多项式（含最高位的二进制串）
+STANDARD_POLYNOMIALS = {
+    'CRC-8': '100000111',                            # x⁸+x²+x+1
+    'CRC-16': '11000000000000101',                   # x¹⁶+x¹⁵+x²+1
+    'CRC-CCITT': '10001000000100001',                # x¹⁶+x¹²+x⁵+1
+    'CRC-32': '100000100110000010001110110110111',   # IEEE 802.3
+}
+
+BINARY_DIGITS = frozenset('01')
+
+
+def is_binary_string(value):
+    """是否为非空的0/1字符串"""
+    return isinstance(value, str) and bool(value) and set(value) <= BINARY_DIGITS
+
+
+@lru_cache(maxsize=32)
+def _build_table(poly_low, width):
+    """生成按字节查表用的256项余数表（寄存器宽度width >= 8）"""
+    top = 1 << (width - 1)
+    mask = (1 << width) - 1
+    table = []
+    for byte in range(256):
+        reg = byte << (width - 8)
+        for _ in range(8):
+            reg = ((reg << 1) ^ poly_low) if reg & top else (reg << 1)
+        table.append(reg & mask)
+    return tuple(table)
+
+
+class CRCEngine:
+    """
+    CRC快速计算引擎
+
+    用整数位运算代替逐位的字符列表除法：数据按字节查表（每个多项式的表首次使用时生成并缓存），
+    不足一字节的开头几位逐位处理。计算结果与多项式除法得到的余数一致（初值0、不反转、不异或输出）。
+    位数小于8的多项式左移补齐到8位寄存器，结果再右移回来。
+    """
+
+    def __init__(self, polynomial):
+        """
+        Args:
+            polynomial (str): 生成多项式，最高位必须为1且至少2位
+        """
+        if not is_binary_string(polynomial) or len(polynomial) < 2 or polynomial[0] != '1':
+            raise ValueError("生成多项式必须是以1开头、至少2位的二进制串")
+
+        self.polynomial = polynomial
+        self.crc_length = len(polynomial) - 1
+        self.width = max(self.crc_length, 8)
+        self.shift = self.width - self.crc_length
+        self.mask = (1 << self.width) - 1
+        self.poly_low = (int(polynomial, 2) & ((1 << self.crc_length) - 1)) << self.shift
+        self.table = _build_table(self.poly_low, self.width)
+
+    def remainder(self, bits):
+        """计算 数据·x^r mod G 的余数（整数）"""
+        width, mask, table, poly_low = self.width, self.mask, self.table, self.poly_low
+        top = 1 << (width - 1)
+        reg = 0
+
+        # 开头不足一字节的位逐位处理
+        lead = len(bits) % 8
+        for bit in bits[:lead]:
+            if bit == '1':
+                reg ^= top
+            reg = (((reg << 1) ^ poly_low) if reg & top else (reg << 1)) & mask
+
+        # 其余按字节查表
+        body = bits[lead:]
+        if body:
+            high = width - 8
+            for byte in int(body, 2).to_bytes(len(body) // 8, 'big'):
+                reg = ((reg << 8) & mask) ^ table[((reg >> high) ^ byte) & 0xFF]
+
+        return reg >> self.shift
+
+    def crc(self, bits):
+        """计算CRC校验码（长度为r的二进制串）"""
+        return format(self.remainder(bits), f'0{self.crc_length}b')
+
+    def check(self, bits_with_crc):
+        """
+        验证带CRC的数据
+
+        Returns:
+            tuple: (是否有效, 余数二进制串)
+        """
+        data_length = len(bits_with_crc) - self.crc_length
+        remainder = self.remainder(bits_with_crc[:data_length]) ^ int(bits_with_crc[data_length:], 2)
+        return remainder == 0, format(remainder, f'0{self.crc_length}b')
+
 
 class CRCChecker:
     """
@@ -16,8 +110,9 @@ class CRCChecker:
     功能:
     1. CRC计算: 根据数据和生成多项式计算CRC校验码
     2. CRC验证: 验证带CRC的数据是否正确
-    3. 详细步骤记录: 记录多项式除法的每个步骤
-    4. 多种生成多项式支持: 支持常用的CRC多项式
+    3. 详细步骤记录: 记录多项式除法的每个步骤（可关闭，关闭时使用CRCEngine快速计算）
+    4. 多种生成多项式支持: 支持常用的CRC多项式（可用名称，如 CRC-32）
+    5. 批量计算与验证
     """
 
     def __init__(self, polynomial='1011'):
@@ -25,18 +120,39 @@ class CRCChecker:
         初始化CRC检验器
 
         Args:
-            polynomial (str): 生成多项式，默认为CRC-3: x³+x+1 = 1011
+            polynomial (str): 生成多项式，默认为CRC-3: x³+x+1 = 1011；
+                              也可以是 STANDARD_POLYNOMIALS 中的名称
         """
-        self.polynomial = polynomial
+        self.polynomial = self.resolve_polynomial(polynomial)
         self.steps = []
-        self.crc_length = len(polynomial) - 1
-
-    def calculate_crc(self, data):
+        self.crc_length = len(self.polynomial) - 1
+        self._engine = None
+
+    @staticmethod
+    def resolve_polynomial(polynomial):
+        """将标准多项式名称转换为二进制串，其他输入原样返回"""
+        if isinstance(polynomial, str):
+            return STANDARD_POLYNOMIALS.get(polynomial.upper(), polynomial)
+        return polynomial
+
+    @property
+    def engine(self):
+        """快速计算引擎，多项式不满足要求（如最高位为0）时为None，此时只能逐位除法计算"""
+        if self._engine is None:
+            try:
+                self._engine = CRCEngine(self.polynomial)
+            except ValueError:
+                return None
+        return self._engine
+
+    def calculate_crc(self, data, record_steps=True):
         """
         计算CRC校验码
 
         Args:
             data (str): 输入数据（二进制字符串）
+            record_steps (bool): 是否记录除法步骤，为False时走快速计算且步骤列表为空；
+                                 快速计算要求多项式最高位为1，否则返回错误
 
         Returns:
             tuple: (CRC校验码, 详细步骤列表)
@@ -51,12 +167,17 @@ class CRCChecker:
         if not data:
             return None, ["错误：输入不能为空"]
 
-        if not all(bit in '01' for bit in data):
+        if not is_binary_string(data):
             return None, ["错误：输入只能包含0和1"]
 
-        if not all(bit in '01' for bit in self.polynomial):
+        if not is_binary_string(self.polynomial):
             return None, ["错误：生成多项式只能包含0和1"]
 
+        if not record_steps:
+            if self.engine is None:
+                return None, ["错误：快速计算要求生成多项式最高位为1且至少2位"]
+            return self.engine.crc(data), self.steps
+
         # 记录初始信息
         self.steps.append(f"步骤1: CRC计算初始化")
         self.steps.append(f"       原始数据: {data}")
@@ -123,12 +244,14 @@ class CRCChecker:
 
         return crc_code, self.steps
 
-    def verify_crc(self, data_with_crc):
+    def verify_crc(self, data_with_crc, record_steps=True):
         """
         验证CRC校验码
 
         Args:
             data_with_crc (str): 包含CRC的完整数据
+            record_steps (bool): 是否记录除法步骤，为False时走快速计算且步骤列表为空；
+                                 快速计算要求多项式最高位为1，否则返回错误
 
         Returns:
             tuple: (是否有效, 详细步骤列表)
@@ -142,12 +265,18 @@ class CRCChecker:
         if not data_with_crc:
             return False, ["错误：输入不能为空"]
 
-        if not all(bit in '01' for bit in data_with_crc):
+        if not is_binary_string(data_with_crc):
             return False, ["错误：输入只能包含0和1"]
 
         if len(data_with_crc) <= self.crc_length:
             return False, [f"错误：数据长度必须大于{self.crc_length}位"]
 
+        if not record_steps:
+            if self.engine is None:
+                return False, ["错误：快速计算要求生成多项式最高位为1且至少2位"]
+            is_valid, _ = self.engine.check(data_with_crc)
+            return is_valid, self.steps
+
         # 记录验证信息
         data_length = len(data_with_crc) - self.crc_length
         received_data = data_with_crc[:data_length]
@@ -169,8 +298,8 @@ class CRCChecker:
 
         division_step = 1
 
-        # 执行除法运算（处理整个数据长度）
-        for i in range(len(data_with_crc) - self.crc_length + 1):
+        # 执行除法运算（处理到余数部分之前，否则会对余数本身再做一次XOR）
+        for i in range(len(data_with_crc) - self.crc_length):
             if dividend[i] == '1':
                 # 记录除法步骤
                 self.steps.append(f"")
@@ -213,4 +342,42 @@ class CRCChecker:
 
         return is_valid, self.steps
 
-  
\ No newline at end of file
+  
+
+    def calculate_batch(self, items):
+        """
+        批量计算CRC（不记录步骤）
+
+        Args:
+            items (list): 二进制字符串列表
+
+        Returns:
+            list: 每项为 {'data', 'crc', 'complete_data'}，无效输入为 {'data', 'error'}
+        """
+        results = []
+        for data in items:
+            crc_code, errors = self.calculate_crc(data, record_steps=False)
+            if crc_code is None:
+                results.append({'data': data, 'error': errors[0]})
+            else:
+                results.append({'data': data, 'crc': crc_code, 'complete_data': data + crc_code})
+        return results
+
+    def verify_batch(self, items):
+        """
+        批量验证带CRC的数据（不记录步骤）
+
+        Args:
+            items (list): 包含CRC的二进制字符串列表
+
+        Returns:
+            list: 每项为 {'data_with_crc', 'is_valid'}，无效输入另带 'error'
+        """
+        results = []
+        for data_with_crc in items:
+            is_valid, errors = self.verify_crc(data_with_crc, record_steps=False)
+            result = {'data_with_crc': data_with_crc, 'is_valid': is_valid}
+            if errors:
+                result['error'] = errors[0]
+            results.append(result)
+        return results
@@ -9,6 +9,165 @@
 """
 
 import math
+from functools import lru_cache
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# 批量数量达到该值时才使用NumPy矩阵运算（数量太少时构造数组的开销更大）
+NUMPY_MIN_BATCH = 32
+
+
+def is_binary_string(value):
+    """是否为非空的0/1字符串"""
+    return isinstance(value, str) and bool(value) and set(value) <= {'0', '1'}
+
+
+class HammingLayout:
+    """
+    指定码长的海明码结构
+
+    预先计算校验位/数据位位置和每个校验位覆盖位置的整数掩码，单个码字用整数位运算编解码；
+    安装了NumPy时还生成生成矩阵G、校验矩阵H和症状表，批量编解码为一次矩阵乘法。
+    通过 get_layout()/for_data_length() 获取，按码长缓存。
+    """
+
+    def __init__(self, code_length):
+        n = code_length
+        self.code_length = n
+        self.parity_bits = n.bit_length()  # 不超过码长的2的幂的个数
+        self.data_length = n - self.parity_bits
+        self.data_positions = [pos for pos in range(1, n + 1) if pos & (pos - 1)]
+
+        # 第i个校验位覆盖的位置掩码（位置pos对应整数的第n-pos位）
+        self.parity_masks = [
+            sum(1 << (n - pos) for pos in range(1, n + 1) if pos & (1 << i))
+            for i in range(self.parity_bits)
+        ]
+
+        if NUMPY_AVAILABLE:
+            self._build_matrices()
+
+    @classmethod
+    def for_data_length(cls, data_length):
+        """按数据位数获取结构（校验位数满足 2^r ≥ n+r+1）"""
+        r = 0
+        while (1 << r) < data_length + r + 1:
+            r += 1
+        return get_layout(data_length + r)
+
+    def _build_matrices(self):
+        n, r = self.code_length, self.parity_bits
+        positions = np.arange(1, n + 1)
+        data_columns = np.array(self.data_positions, dtype=np.intp) - 1
+        parity_columns = (1 << np.arange(r)) - 1
+
+        # 校验矩阵H：第pos列为pos的二进制表示，症状值即出错位置
+        self.check_matrix = ((positions[None, :] >> np.arange(r)[:, None]) & 1).astype(np.int32)
+
+        # 生成矩阵G：数据位原样放置，校验位取所在位置的H列
+        generator = np.zeros((self.data_length, n), dtype=np.int32)
+        generator[np.arange(self.data_length), data_columns] = 1
+        generator[:, parity_columns] = self.check_matrix[:, data_columns].T
+        self.generator_matrix = generator
+
+        # 症状表：症状值 -> 需要翻转的列，-1表示无错误，n表示超出码长无法纠正
+        table = np.full(1 << r, n, dtype=np.intp)
+        table[0] = -1
+        table[1:n + 1] = np.arange(n)
+        self.syndrome_table = table
+        self.syndrome_weights = 1 << np.arange(r)
+        self.data_columns = data_columns
+
+    # ---------- 单个码字（整数位运算） ----------
+
+    def encode_word(self, data_bits):
+        """编码一个数据串"""
+        bits = ['0'] * self.code_length
+        for pos, bit in zip(self.data_positions, data_bits):
+            bits[pos - 1] = bit
+
+        word = int(''.join(bits), 2)
+        for i, mask in enumerate(self.parity_masks):
+            if bin(word & mask).count('1') & 1:
+                bits[(1 << i) - 1] = '1'
+        return ''.join(bits)
+
+    def decode_word(self, hamming_bits):
+        """
+        解码一个码字
+
+        Returns:
+            tuple: (原始数据或None, 症状值即出错位置，0表示无错误)
+        """
+        n = self.code_length
+        word = int(hamming_bits, 2)
+        syndrome = 0
+        for i, mask in enumerate(self.parity_masks):
+            if bin(word & mask).count('1') & 1:
+                syndrome |= 1 << i
+
+        if syndrome > n:
+            return None, syndrome
+        if syndrome:
+            word ^= 1 << (n - syndrome)
+
+        bits = format(word, f'0{n}b')
+        return ''.join(bits[pos - 1] for pos in self.data_positions), syndrome
+
+    # ---------- 批量（NumPy矩阵运算，不可用时逐个计算） ----------
+
+    def encode_many(self, items):
+        """批量编码等长数据串，返回码字列表"""
+        if not NUMPY_AVAILABLE or len(items) < NUMPY_MIN_BATCH:
+            return [self.encode_word(data_bits) for data_bits in items]
+
+        codes = (_to_matrix(items, self.data_length) @ self.generator_matrix) & 1
+        return _to_strings(codes, self.code_length)
+
+    def decode_many(self, items):
+        """批量解码等长码字，返回 [(原始数据或None, 症状值), ...]"""
+        if not NUMPY_AVAILABLE or len(items) < NUMPY_MIN_BATCH:
+            return [self.decode_word(hamming_bits) for hamming_bits in items]
+
+        n = self.code_length
+        words = _to_matrix(items, n)
+        syndromes = ((words @ self.check_matrix.T) & 1) @ self.syndrome_weights
+        columns = self.syndrome_table[syndromes]
+
+        # 翻转可纠正的出错位
+        rows = np.nonzero((columns >= 0) & (columns < n))[0]
+        words[rows, columns[rows]] ^= 1
+
+        data = _to_strings(words[:, self.data_columns], self.data_length)
+        return [
+            (None if column == n else bits, int(syndrome))
+            for bits, column, syndrome in zip(data, columns.tolist(), syndromes.tolist())
+        ]
+
+
+def _to_matrix(items, width):
+    """等长0/1字符串列表 -> 整数矩阵"""
+    raw = np.frombuffer(''.join(items).encode('ascii'), dtype=np.uint8)
+    return raw.reshape(len(items), width).astype(np.int32) - ord('0')
+
+
+def _to_strings(matrix, width):
+    """0/1整数矩阵 -> 字符串列表"""
+    if width == 0:
+        return [''] * len(matrix)
+    text = (matrix.astype(np.uint8) + ord('0')).tobytes().decode('ascii')
+    return [text[i:i + width] for i in range(0, len(text), width)]
+
+
+@lru_cache(maxsize=64)
+def get_layout(code_length):
+    """按码长获取（缓存的）海明码结构"""
+    return HammingLayout(code_length)
 
 
 class HammingCode:
@@ -19,18 +178,20 @@ class HammingCode:
     1. 编码: 将原始数据转换为海明码
     2. 解码: 从海明码恢复原始数据
     3. 错误检测与纠正: 自动检测并纠正单比特错误
-    4. 详细步骤记录: 记录每个计算步骤便于学习
+    4. 详细步骤记录: 记录每个计算步骤便于学习（可关闭，关闭时使用HammingLayout快速计算）
+    5. 批量编解码: 同一码长的数据一次矩阵运算完成
     """
 
     def __init__(self):
         self.steps = []  # 存储详细的计算步骤
 
-    def encode(self, data_bits):
+    def encode(self, data_bits, record_steps=True):
         """
         海明码编码
 
         Args:
             data_bits (str): 原始数据位，如 "1011"
+            record_steps (bool): 是否记录计算步骤，为False时走快速计算且步骤列表为空
 
         Returns:
             tuple: (编码结果字符串, 详细步骤列表)
@@ -45,9 +206,12 @@ class HammingCode:
         if not data_bits:
             return None, ["错误：输入不能为空"]
 
-        if not all(bit in '01' for bit in data_bits):
+        if not is_binary_string(data_bits):
             return None, ["错误：输入只能包含0和1"]
 
+        if not record_steps:
+            return HammingLayout.for_data_length(len(data_bits)).encode_word(data_bits), self.steps
+
         data_list = [int(bit) for bit in data_bits]
         n = len(data_list)
 
@@ -135,12 +299,13 @@ class HammingCode:
 
         return result, self.steps
 
-    def decode(self, hamming_bits):
+    def decode(self, hamming_bits, record_steps=True):
         """
         海明码解码
 
         Args:
             hamming_bits (str): 海明码字符串，如 "1011010"
+            record_steps (bool): 是否记录计算步骤，为False时走快速计算且步骤列表为空
 
         Returns:
             tuple: (解码结果, 是否有错误, 详细步骤列表)
@@ -155,20 +320,23 @@ class HammingCode:
         if not hamming_bits:
             return None, False, ["错误：输入不能为空"]
 
-        if not all(bit in '01' for bit in hamming_bits):
+        if not is_binary_string(hamming_bits):
             return None, False, ["错误：输入只能包含0和1"]
 
+        if not record_steps:
+            result, error_pos = get_layout(len(hamming_bits)).decode_word(hamming_bits)
+            if result is None:
+                return None, True, [f"错误：错误位置{error_pos}超出码长，无法纠正"]
+            return result, error_pos != 0, self.steps
+
         hamming_list = [int(bit) for bit in hamming_bits]
         n = len(hamming_list)
 
         self.steps.append(f"步骤1: 接收海明码")
         self.steps.append(f"       接收到的海明码 = {hamming_bits} (共{n}位)")
 
-        # 计算校验位数量
-        r = 0
-        while (1 << r) < n + 1:
-            r += 1
-        r -= 1  # 实际的校验位数量
+        # 计算校验位数量（位置1..n中2的幂的个数）
+        r = n.bit_length()
 
         self.steps.append(f"步骤2: 分析海明码结构")
         self.steps.append(f"       推断校验位数量 = {r}")
@@ -215,6 +383,10 @@ class HammingCode:
 
         # 错误纠正
         has_error = error_pos != 0
+        if error_pos > n:
+            self.steps.append(f"步骤5: 错误位置{error_pos}超出码长{n}，无法纠正（可能有多位错误）")
+            return None, True, self.steps
+
         if has_error:
             self.steps.append(f"步骤5: 错误纠正")
             self.steps.append(f"       检测到位置{error_pos}有错误")
@@ -243,6 +415,67 @@ class HammingCode:
 
         return result, has_error, self.steps
 
+    def encode_batch(self, items):
+        """
+        批量编码（不记录步骤，需要步骤时对单条数据调用encode）
+
+        Args:
+            items (list): 原始数据位字符串列表
+
+        Returns:
+            list: 每项为 {'data', 'result'}，无效输入为 {'data', 'error'}
+        """
+        results = [None] * len(items)
+        groups = {}
+        for index, data_bits in enumerate(items):
+            if not is_binary_string(data_bits):
+                results[index] = {'data': data_bits, 'error': "错误：输入只能包含0和1"}
+            else:
+                groups.setdefault(len(data_bits), []).append(index)
+
+        for data_length, indexes in groups.items():
+            layout = HammingLayout.for_data_length(data_length)
+            codes = layout.encode_many([items[index] for index in indexes])
+            for index, code in zip(indexes, codes):
+                results[index] = {'data': items[index], 'result': code}
+        return results
+
+    def decode_batch(self, items):
+        """
+        批量解码（不记录步骤，需要步骤时对单条数据调用decode）
+
+        Args:
+            items (list): 海明码字符串列表
+
+        Returns:
+            list: 每项为 {'hamming_bits', 'result', 'has_error', 'error_position'}，
+                  无效或无法纠正的输入为 {'hamming_bits', 'error'}
+        """
+        results = [None] * len(items)
+        groups = {}
+        for index, hamming_bits in enumerate(items):
+            if not is_binary_string(hamming_bits):
+                results[index] = {'hamming_bits': hamming_bits, 'error': "错误：输入只能包含0和1"}
+            else:
+                groups.setdefault(len(hamming_bits), []).append(index)
+
+        for code_length, indexes in groups.items():
+            decoded = get_layout(code_length).decode_many([items[index] for index in indexes])
+            for index, (result, error_pos) in zip(indexes, decoded):
+                if result is None:
+                    results[index] = {
+                        'hamming_bits': items[index],
+                        'error': f"错误：错误位置{error_pos}超出码长，无法纠正",
+                    }
+                else:
+                    results[index] = {
+                        'hamming_bits': items[index],
+                        'result': result,
+                        'has_error': error_pos != 0,
+                        'error_position': error_pos,
+                    }
+        return results
+
     def _is_power_of_2(self, n):
         """
         检查一个数是否为2的幂
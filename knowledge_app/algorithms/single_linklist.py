@@ -603,6 +603,25 @@ class SingleLinkedList:
             'display': self.display()
         }
 
+    def to_snapshot(self):
+        """导出紧凑快照（按顺序的节点值列表），用于跨请求保存"""
+        return self.to_list()
+
+    @classmethod
+    def from_snapshot(cls, values):
+        """从快照重建链表（不记录步骤）"""
+        linked_list = cls()
+        tail = None
+        for val in values:
+            node = ListNode(val)
+            if tail is None:
+                linked_list.head = node
+            else:
+                tail.next = node
+            tail = node
+        linked_list.size = len(values)
+        return linked_list
+
     def get_steps_with_animation_data(self):
         """获取包含动画数据的步骤信息"""
         return self.steps
\ No newline at end of file
@@ -19,11 +19,19 @@ class KnowledgeAppConfig(AppConfig):
 
         if should_start:
             self.start_daily_term_scheduler()
+            self.warm_up_pdf_toolkit()
         else:
             print("跳过调度器启动")
             print(f"   RUN_MAIN: {os.environ.get('RUN_MAIN')}")
             print(f"   START_SCHEDULER: {os.environ.get('START_SCHEDULER')}")
 
+    def warm_up_pdf_toolkit(self):
+        """后台预先注册PDF中文字体和样式，首次导出时不再等待"""
+        import threading
+        from .services.pdf_toolkit import pdf_toolkit
+
+        threading.Thread(target=pdf_toolkit.warm_up, daemon=True).start()
+
     def start_daily_term_scheduler(self):
         """启动每日名词调度器"""
         try:
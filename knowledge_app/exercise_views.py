@@ -10,6 +10,7 @@ from .exercise_models import (
     ExerciseCategory, ExerciseDifficulty, Exercise, ExerciseSet,
     UserExerciseAttempt, UserExerciseSetAttempt
 )
+from .services.answer_grader import exercise_answer_grader
 import json
 import random
 from datetime import timedelta
@@ -187,24 +188,8 @@ def submit_exercise(request, slug):
         time_spent = int((submit_time - start_time).total_seconds())
         
         # 判断答案是否正确
-        is_correct = False
         score = 0
-        
-        if exercise.question_type in ['single_choice', 'multiple_choice']:
-            if exercise.question_type == 'single_choice':
-                is_correct = user_answer.strip().upper() == exercise.correct_answer.strip().upper()
-            else:  # multiple_choice
-                user_answers = set(user_answer.strip().upper().split(','))
-                correct_answers = set(exercise.correct_answer.strip().upper().split(','))
-                is_correct = user_answers == correct_answers
-        elif exercise.question_type == 'true_false':
-            is_correct = user_answer.strip().lower() == exercise.correct_answer.strip().lower()
-        elif exercise.question_type == 'fill_blank':
-            # 简单的字符串匹配，可以扩展为更复杂的匹配逻辑
-            is_correct = user_answer.strip().lower() == exercise.correct_answer.strip().lower()
-        else:  # short_answer, coding
-            # 这些类型需要人工评判，暂时标记为正确
-            is_correct = True
+        is_correct = exercise_answer_grader.grade(exercise.question_type, exercise.correct_answer, user_answer)
         
         # 计算分数
         if is_correct:
@@ -0,0 +1,112 @@
+"""
+本地模拟大模型服务
+提供兼容OpenAI/GLM格式的 /v1/chat/completions 接口，支持流式(SSE)和非流式响应，
+用于在不消耗API额度的情况下测试聊天、练习生成等AI功能。
+
+使用方式：
+    python manage.py mock_llm_server --port 8765 --delay 0.05
+    GLM_API_URL=http://127.0.0.1:8765/v1/chat/completions python manage.py runserver
+"""
+
+import asyncio
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+
+DEFAULT_REPLY = (
+    "这是来自本地模拟服务的回答。根据给定的解释，这个概念通常用于描述计算机系统中的一种机制，"
+    "一般来说可以从定义、工作原理和应用场景三个方面来理解。"
+)
+
+
+def build_app(reply: str, delay: float, first_token_delay: float, fail_rate: int):
+    """创建aiohttp应用"""
+    from aiohttp import web
+
+    state = {'requests': 0}
+
+    def completion_payload(content: str, model: str) -> dict:
+        return {
+            'id': f'mock-{state["requests"]}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+        }
+
+    async def chat_completions(request):
+        state['requests'] += 1
+        body = await request.json()
+        model = body.get('model', 'mock-model')
+
+        # 每 fail_rate 个请求返回一次503，用于测试重试和熔断
+        if fail_rate and state['requests'] % fail_rate == 0:
+            return web.json_response({'error': 'mock upstream unavailable'}, status=503)
+
+        if not body.get('stream'):
+            await asyncio.sleep(first_token_delay + delay * len(reply))
+            return web.json_response(completion_payload(reply, model))
+
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+        })
+        await response.prepare(request)
+
+        await asyncio.sleep(first_token_delay)
+        for char in reply:
+            chunk = {
+                'id': f'mock-{state["requests"]}',
+                'object': 'chat.completion.chunk',
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': char}, 'finish_reason': None}],
+            }
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+            if delay:
+                await asyncio.sleep(delay)
+
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post('/v1/chat/completions', chat_completions)
+    app.router.add_post('/api/paas/v4/chat/completions', chat_completions)
+    return app
+
+
+class Command(BaseCommand):
+    help = '启动本地模拟大模型服务（OpenAI兼容接口，支持SSE流式输出）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1', help='监听地址')
+        parser.add_argument('--port', type=int, default=8765, help='监听端口')
+        parser.add_argument('--delay', type=float, default=0.02, help='每个token之间的延迟（秒）')
+        parser.add_argument('--first-token-delay', type=float, default=0.1, help='首个token的延迟（秒）')
+        parser.add_argument('--reply', type=str, default=DEFAULT_REPLY, help='固定回复内容')
+        parser.add_argument('--fail-rate', type=int, default=0, help='每N个请求返回一次503，0表示不失败')
+
+    def handle(self, *args, **options):
+        try:
+            from aiohttp import web
+        except ImportError:
+            self.stdout.write(self.style.ERROR('需要安装 aiohttp：pip install aiohttp'))
+            return
+
+        app = build_app(
+            reply=options['reply'],
+            delay=options['delay'],
+            first_token_delay=options['first_token_delay'],
+            fail_rate=options['fail_rate'],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"模拟大模型服务已启动: http://{options['host']}:{options['port']}/v1/chat/completions"
+        ))
+        web.run_app(app, host=options['host'], port=options['port'], print=None)
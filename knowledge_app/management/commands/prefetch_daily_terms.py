@@ -0,0 +1,50 @@
+"""
+每日名词预生成命令
+提前生成未来几天的名词（预生成待发布状态），当天零点只需启用，不再实时调用API
+
+使用方式：
+    python manage.py prefetch_daily_terms
+    python manage.py prefetch_daily_terms --days 30 --status
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = '预生成未来几天的每日名词'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='预生成的天数（默认7天）')
+        parser.add_argument('--status', action='store_true', help='显示未来各日期的名词状态')
+
+    def handle(self, *args, **options):
+        from knowledge_app.models import DailyTerm
+        from knowledge_app.services.daily_term_service import DailyTermService
+        from knowledge_app.services.domain_scheduler import domain_scheduler
+
+        service = DailyTermService()
+        days = options.get('days') or service.PREFETCH_DAYS
+
+        self.stdout.write(f'📚 正在预生成未来 {days} 天的名词...')
+        result = service.prefetch_terms(days=days)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 新增 {result['generated']} 个，已存在 {result['skipped']} 个，失败 {result['failed']} 个"
+        ))
+
+        if options['status']:
+            today = timezone.now().date()
+            terms = {
+                term.display_date: term
+                for term in DailyTerm.objects.filter(display_date__gte=today, display_date__lte=today + timedelta(days=days))
+            }
+            for offset in range(days + 1):
+                target_date = today + timedelta(days=offset)
+                domain = domain_scheduler.get_current_domain(target_date)
+                term = terms.get(target_date)
+                if term:
+                    self.stdout.write(f"  {target_date} {domain['name']:<12} {term.term} ({term.get_status_display()})")
+                else:
+                    self.stdout.write(self.style.WARNING(f"  {target_date} {domain['name']:<12} 未生成"))
@@ -0,0 +1,33 @@
+"""
+练习题池补充命令
+按(知识点, 难度)预生成练习题，可配合cron定时执行
+
+使用方式：
+    python manage.py refill_exercise_pool
+    python manage.py refill_exercise_pool --max-batches 30 --status
+"""
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = '补充预生成练习题池'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-batches', type=int, help='本次最多调用AI的次数')
+        parser.add_argument('--status', action='store_true', help='补充后显示各组合的可用题目数')
+
+    def handle(self, *args, **options):
+        from knowledge_app.services.exercise_pool import exercise_pool
+
+        self.stdout.write('🧩 正在补充练习题池...')
+        result = exercise_pool.refill(max_batches=options.get('max_batches'))
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 调用AI {result['batches']} 次，新增 {result['added']} 道题目，清理 {result['purged']} 道已使用题目"
+        ))
+
+        if options['status']:
+            for knowledge_point, difficulty in exercise_pool.pool_keys():
+                available = exercise_pool.available_count(knowledge_point, difficulty)
+                style = self.style.SUCCESS if available >= exercise_pool.TARGET_SIZE else self.style.WARNING
+                self.stdout.write(style(f"  {knowledge_point:<24} {difficulty:<8} {available:>3}/{exercise_pool.TARGET_SIZE}"))
@@ -0,0 +1,79 @@
+"""
+AI练习生成工作进程
+从数据库队列领取练习生成任务并执行，可启动多个进程并行处理
+
+使用方式：
+    python manage.py run_exercise_worker --processes 2
+    python manage.py run_exercise_worker --once    # 处理完当前队列后退出
+"""
+
+import multiprocessing
+import signal
+
+from django.core.management.base import BaseCommand
+
+
+def worker_main(poll_interval: float, stop_event):
+    """子进程入口：子进程需要独立初始化Django和数据库连接"""
+    import django
+    django.setup()
+
+    from knowledge_app.services.exercise_job_queue import exercise_job_queue
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # 由主进程统一处理Ctrl+C
+    exercise_job_queue.run_worker(poll_interval=poll_interval, stop_event=stop_event)
+
+
+class Command(BaseCommand):
+    help = '启动AI练习生成工作进程'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='工作进程数量')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='队列为空时的轮询间隔（秒）')
+        parser.add_argument('--once', action='store_true', help='在当前进程中处理完队列中的任务后退出')
+
+    def handle(self, *args, **options):
+        from django.db import connections
+        from knowledge_app.services.exercise_job_queue import exercise_job_queue
+
+        if options['once']:
+            processed = 0
+            exercise_job_queue.recover_stale()
+            while True:
+                job = exercise_job_queue.claim_next('once')
+                if job is None:
+                    break
+                exercise_job_queue.run_job(job)
+                processed += 1
+            self.stdout.write(self.style.SUCCESS(f'✅ 已处理 {processed} 个任务'))
+            return
+
+        # 子进程不能继承父进程的数据库连接
+        connections.close_all()
+
+        stop_event = multiprocessing.Event()
+        processes = [
+            multiprocessing.Process(
+                target=worker_main,
+                args=(options['poll_interval'], stop_event),
+                name=f'exercise-worker-{index}',
+            )
+            for index in range(max(options['processes'], 1))
+        ]
+        for process in processes:
+            process.start()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'🚀 已启动 {len(processes)} 个练习生成工作进程，按 Ctrl+C 停止'
+        ))
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            self.stdout.write('正在停止工作进程（等待当前任务完成）...')
+            stop_event.set()
+            for process in processes:
+                process.join()
+
+        self.stdout.write(self.style.SUCCESS('工作进程已停止'))
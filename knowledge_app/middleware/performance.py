@@ -21,8 +21,9 @@ class PerformanceMiddleware(MiddlewareMixin):
             duration = time.time() - request._start_time
             response['X-Response-Time'] = f'{duration:.3f}s'
         
-        # Gzip压缩
-        if (response.get('Content-Type', '').startswith(('text/', 'application/json', 'application/javascript')) and
+        # Gzip压缩（流式响应不压缩，否则会缓冲整个响应）
+        if (not response.streaming and
+            response.get('Content-Type', '').startswith(('text/', 'application/json', 'application/javascript')) and
             'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '') and
             len(response.content) > 1024):  # 只压缩大于1KB的内容
             
@@ -9,73 +9,31 @@ class Migration(migrations.Migration):
         ('knowledge_app', '0009_libraryshare_librarycopy_and_more'),
     ]
 
+    # 按依赖顺序直接删除模型（先删引用方）。逐个RemoveField在SQLite上会重建表，
+    # 而表上的索引/联合唯一约束仍引用被删除的字段，导致全新数据库迁移失败
     operations = [
-        migrations.RemoveField(
-            model_name='exercise',
-            name='category',
-        ),
-        migrations.RemoveField(
-            model_name='exercise',
-            name='difficulty',
-        ),
-        migrations.RemoveField(
-            model_name='userexerciseattempt',
-            name='exercise',
-        ),
-        migrations.RemoveField(
-            model_name='exerciseset',
-            name='exercises',
-        ),
-        migrations.RemoveField(
-            model_name='exercisesetitem',
-            name='exercise',
-        ),
-        migrations.RemoveField(
-            model_name='exerciseset',
-            name='category',
-        ),
-        migrations.RemoveField(
-            model_name='exercisesetitem',
-            name='exercise_set',
-        ),
-        migrations.RemoveField(
-            model_name='userexercisesetattempt',
-            name='exercise_set',
-        ),
-        migrations.AlterUniqueTogether(
-            name='exercisesetitem',
-            unique_together=None,
-        ),
-        migrations.RemoveField(
-            model_name='userexerciseattempt',
-            name='user',
-        ),
-        migrations.RemoveField(
-            model_name='userexercisesetattempt',
-            name='user',
-        ),
         migrations.DeleteModel(
-            name='AIExerciseSession',
+            name='UserExerciseSetAttempt',
         ),
         migrations.DeleteModel(
-            name='ExerciseDifficulty',
+            name='UserExerciseAttempt',
         ),
         migrations.DeleteModel(
-            name='Exercise',
+            name='ExerciseSetItem',
         ),
         migrations.DeleteModel(
-            name='ExerciseCategory',
+            name='ExerciseSet',
         ),
         migrations.DeleteModel(
-            name='ExerciseSetItem',
+            name='Exercise',
         ),
         migrations.DeleteModel(
-            name='ExerciseSet',
+            name='ExerciseCategory',
         ),
         migrations.DeleteModel(
-            name='UserExerciseAttempt',
+            name='ExerciseDifficulty',
         ),
         migrations.DeleteModel(
-            name='UserExerciseSetAttempt',
+            name='AIExerciseSession',
         ),
     ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 22:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('knowledge_app', '0010_remove_exercise_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizsession',
+            name='question_ids',
+            field=models.JSONField(blank=True, default=list, verbose_name='题目顺序'),
+        ),
+        migrations.AddField(
+            model_name='quizsession',
+            name='current_index',
+            field=models.PositiveIntegerField(default=0, verbose_name='当前题号'),
+        ),
+    ]
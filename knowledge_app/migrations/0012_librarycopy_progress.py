@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('knowledge_app', '0011_quizsession_question_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='librarycopy',
+            name='status',
+            field=models.CharField(choices=[('running', '复制中'), ('completed', '已完成'), ('failed', '失败')], default='completed', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='librarycopy',
+            name='total_questions',
+            field=models.PositiveIntegerField(default=0, help_text='需要复制的题目数'),
+        ),
+        migrations.AddField(
+            model_name='librarycopy',
+            name='copied_questions',
+            field=models.PositiveIntegerField(default=0, help_text='已复制的题目数'),
+        ),
+        migrations.AddField(
+            model_name='librarycopy',
+            name='error_message',
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('knowledge_app', '0012_librarycopy_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CachedAIResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(max_length=64, unique=True, verbose_name='缓存键')),
+                ('namespace', models.CharField(max_length=50, verbose_name='缓存类型')),
+                ('payload', models.JSONField(verbose_name='缓存内容')),
+                ('hit_count', models.PositiveIntegerField(default=0, verbose_name='命中次数')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('expires_at', models.DateTimeField(verbose_name='过期时间')),
+            ],
+            options={
+                'verbose_name': 'AI回答缓存',
+                'verbose_name_plural': 'AI回答缓存',
+                'indexes': [models.Index(fields=['namespace', 'expires_at'], name='knowledge_a_namespa_5daf6b_idx')],
+            },
+        ),
+    ]
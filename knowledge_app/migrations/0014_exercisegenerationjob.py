@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('knowledge_app', '0013_cachedairesponse'),
+    ]
+
+    operations = [
+        # 0010 删除了 AIExerciseSession，但模型仍在使用（练习会话与生成任务关联），在此恢复
+        migrations.CreateModel(
+            name='AIExerciseSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('knowledge_point', models.CharField(max_length=100, verbose_name='知识点')),
+                ('exercises', models.JSONField(help_text='生成的题目数据', verbose_name='练习题目')),
+                ('user_answers', models.JSONField(default=list, verbose_name='用户答案')),
+                ('score', models.IntegerField(default=0, verbose_name='得分')),
+                ('total_questions', models.IntegerField(default=0, verbose_name='题目总数')),
+                ('correct_count', models.IntegerField(default=0, verbose_name='正确数量')),
+                ('started_at', models.DateTimeField(auto_now_add=True, verbose_name='开始时间')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='完成时间')),
+                ('time_spent', models.IntegerField(default=0, verbose_name='用时（秒）')),
+                ('is_completed', models.BooleanField(default=False, verbose_name='是否完成')),
+                ('difficulty_level', models.CharField(choices=[('easy', '简单'), ('medium', '中等'), ('hard', '困难')], default='medium', max_length=20, verbose_name='难度等级')),
+                ('api_source', models.CharField(default='kimi', max_length=50, verbose_name='API来源')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': 'AI练习会话',
+                'verbose_name_plural': 'AI练习会话',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['user', 'knowledge_point'], name='knowledge_a_user_id_843e7e_idx'), models.Index(fields=['started_at'], name='knowledge_a_started_90987d_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ExerciseGenerationJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('knowledge_point', models.CharField(max_length=100, verbose_name='知识点')),
+                ('difficulty', models.CharField(default='medium', max_length=20, verbose_name='难度')),
+                ('count', models.PositiveIntegerField(default=5, verbose_name='题目数量')),
+                ('status', models.CharField(choices=[('pending', '排队中'), ('running', '生成中'), ('completed', '已完成'), ('failed', '失败')], default='pending', max_length=20, verbose_name='状态')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='执行次数')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='工作进程')),
+                ('error_message', models.TextField(blank=True, verbose_name='错误信息')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='完成时间')),
+                ('duplicate_of', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='duplicates', to='knowledge_app.exercisegenerationjob', verbose_name='合并到任务')),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='knowledge_app.aiexercisesession', verbose_name='练习会话')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exercise_jobs', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '练习生成任务',
+                'verbose_name_plural': '练习生成任务',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='knowledge_a_status_1f76c6_idx'), models.Index(fields=['knowledge_point', 'difficulty', 'count', 'status'], name='knowledge_a_knowled_9d1fa5_idx')],
+            },
+        ),
+    ]
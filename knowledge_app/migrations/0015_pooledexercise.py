@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('knowledge_app', '0014_exercisegenerationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PooledExercise',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('knowledge_point', models.CharField(max_length=100, verbose_name='知识点')),
+                ('difficulty', models.CharField(max_length=20, verbose_name='难度')),
+                ('exercise', models.JSONField(verbose_name='题目数据')),
+                ('fingerprint', models.CharField(help_text='用于去重的题干摘要', max_length=40, verbose_name='题目指纹')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('used_at', models.DateTimeField(blank=True, null=True, verbose_name='取用时间')),
+            ],
+            options={
+                'verbose_name': '预生成练习题',
+                'verbose_name_plural': '预生成练习题',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['knowledge_point', 'difficulty', 'used_at'], name='knowledge_a_knowled_cf109d_idx')],
+                'unique_together': {('knowledge_point', 'difficulty', 'fingerprint')},
+            },
+        ),
+    ]
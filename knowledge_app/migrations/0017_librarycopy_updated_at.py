@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('knowledge_app', '0016_restore_exercise_models'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='librarycopy',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+"""
+预生成的每日名词改用独立的 prefetched 状态，零点只自动发布这些名词，
+管理员保存的草稿不再被当作预生成结果发布。
+已有草稿中，由API生成（有API请求时间）且展示日期未过的视为预生成结果转换过去。
+"""
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_prefetched_drafts(apps, schema_editor):
+    DailyTerm = apps.get_model('knowledge_app', 'DailyTerm')
+    DailyTerm.objects.filter(
+        status='draft',
+        api_request_time__isnull=False,
+        display_date__gte=timezone.now().date(),
+    ).update(status='prefetched')
+
+
+def unmark_prefetched_drafts(apps, schema_editor):
+    DailyTerm = apps.get_model('knowledge_app', 'DailyTerm')
+    DailyTerm.objects.filter(status='prefetched').update(status='draft')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('knowledge_app', '0017_librarycopy_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyterm',
+            name='status',
+            field=models.CharField(choices=[('active', '当前展示'), ('archived', '已归档'), ('draft', '草稿'), ('prefetched', '预生成待发布')], default='draft', max_length=20, verbose_name='状态'),
+        ),
+        migrations.RunPython(mark_prefetched_drafts, unmark_prefetched_drafts),
+    ]
@@ -85,7 +85,10 @@ class DailyTerm(models.Model):
         ('active', '当前展示'),
         ('archived', '已归档'),
         ('draft', '草稿'),
+        ('prefetched', '预生成待发布'),
     ]
+    # 可以公开访问的状态；草稿（管理员未审核）和预生成的名词在发布前都不可见
+    PUBLISHED_STATUSES = ('active', 'archived')
 
     term = models.CharField(max_length=200, verbose_name='专业名词')
     explanation = models.TextField(verbose_name='详细解释')
@@ -230,6 +233,14 @@ class DailyTerm(models.Model):
         self.like_count += 1
         self.save(update_fields=['like_count'])
 
+    def get_chat_content(self):
+        """获取预生成的聊天推荐问题和开场内容"""
+        info = self.extended_info or {}
+        return {
+            'suggested_questions': info.get('suggested_questions', []),
+            'quick_start': info.get('chat_quick_start', {}),
+        }
+
 
 class TermHistory(models.Model):
     """名词历史记录模型 - 用于去重"""
@@ -344,16 +355,14 @@ class AIExerciseSession(models.Model):
         if not self.user_answers or not self.exercises:
             return 0
 
-        correct = 0
-        total = len(self.exercises)
-
-        for i, exercise in enumerate(self.exercises):
-            if i < len(self.user_answers):
-                user_answer = self.user_answers[i]
-                correct_answer = exercise.get('answer', '')
+        from .services.answer_grader import answer_grader
 
-                if str(user_answer).strip().lower() == str(correct_answer).strip().lower():
-                    correct += 1
+        total = len(self.exercises)
+        answered = list(zip(self.exercises, self.user_answers))
+        correct = sum(answer_grader.grade_many(
+            (exercise.get('type', 'choice'), exercise.get('answer', ''), user_answer)
+            for exercise, user_answer in answered
+        ))
 
         self.correct_count = correct
         self.total_questions = total
@@ -368,6 +377,110 @@ class AIExerciseSession(models.Model):
         return (self.correct_count / self.total_questions) * 100
 
 
+class ExerciseGenerationJob(models.Model):
+    """AI练习生成任务 - 由后台工作进程异步执行"""
+
+    STATUS_CHOICES = [
+        ('pending', '排队中'),
+        ('running', '生成中'),
+        ('completed', '已完成'),
+        ('failed', '失败'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='exercise_jobs',
+        verbose_name='用户'
+    )
+    knowledge_point = models.CharField(max_length=100, verbose_name='知识点')
+    difficulty = models.CharField(max_length=20, default='medium', verbose_name='难度')
+    count = models.PositiveIntegerField(default=5, verbose_name='题目数量')
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='状态')
+    # 相同参数的任务正在执行时不重复调用AI，等待该任务的结果
+    duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='duplicates',
+        verbose_name='合并到任务'
+    )
+    session = models.ForeignKey(
+        AIExerciseSession,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name='练习会话'
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name='执行次数')
+    worker = models.CharField(max_length=100, blank=True, verbose_name='工作进程')
+    error_message = models.TextField(blank=True, verbose_name='错误信息')
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='开始时间')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='完成时间')
+
+    class Meta:
+        verbose_name = '练习生成任务'
+        verbose_name_plural = '练习生成任务'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['knowledge_point', 'difficulty', 'count', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.knowledge_point} ({self.get_status_display()})"
+
+
+class PooledExercise(models.Model):
+    """预生成练习题池 - 定时补充，练习请求直接从池中取题"""
+
+    knowledge_point = models.CharField(max_length=100, verbose_name='知识点')
+    difficulty = models.CharField(max_length=20, verbose_name='难度')
+    exercise = models.JSONField(verbose_name='题目数据')
+    fingerprint = models.CharField(max_length=40, verbose_name='题目指纹', help_text='用于去重的题干摘要')
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    used_at = models.DateTimeField(null=True, blank=True, verbose_name='取用时间')
+
+    class Meta:
+        verbose_name = '预生成练习题'
+        verbose_name_plural = '预生成练习题'
+        ordering = ['id']
+        unique_together = ['knowledge_point', 'difficulty', 'fingerprint']
+        indexes = [
+            models.Index(fields=['knowledge_point', 'difficulty', 'used_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.knowledge_point} ({self.difficulty})"
+
+
+class CachedAIResponse(models.Model):
+    """AI回答缓存 - 持久化相同问题的回答，避免重复调用API"""
+
+    cache_key = models.CharField(max_length=64, unique=True, verbose_name='缓存键')
+    namespace = models.CharField(max_length=50, verbose_name='缓存类型')
+    payload = models.JSONField(verbose_name='缓存内容')
+    hit_count = models.PositiveIntegerField(default=0, verbose_name='命中次数')
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    expires_at = models.DateTimeField(verbose_name='过期时间')
+
+    class Meta:
+        verbose_name = 'AI回答缓存'
+        verbose_name_plural = 'AI回答缓存'
+        indexes = [
+            models.Index(fields=['namespace', 'expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.namespace}:{self.cache_key[:12]} (命中{self.hit_count}次)"
+
+
 # 导入搜索相关模型
 from .search_models import *
 
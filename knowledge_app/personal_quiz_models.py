@@ -111,15 +111,36 @@ class LibraryShare(models.Model):
 
 class LibraryCopy(models.Model):
     """题库复制记录"""
+    STATUS_CHOICES = [
+        ('running', '复制中'),
+        ('completed', '已完成'),
+        ('failed', '失败'),
+    ]
+
     original_library = models.ForeignKey(QuizLibrary, on_delete=models.CASCADE, related_name='copies')
     copied_library = models.ForeignKey(QuizLibrary, on_delete=models.CASCADE, related_name='original')
     copied_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='copied_libraries')
     share = models.ForeignKey(LibraryShare, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # 复制进度（大题库在后台复制）
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='completed')
+    total_questions = models.PositiveIntegerField(default=0, help_text="需要复制的题目数")
+    copied_questions = models.PositiveIntegerField(default=0, help_text="已复制的题目数")
+    error_message = models.TextField(blank=True)
+    # 后台复制每完成一批更新一次，长时间未更新说明复制线程已随进程退出
+    updated_at = models.DateTimeField(auto_now=True)
+
     def __str__(self):
         return f"{self.copied_by.username} 复制了 '{self.original_library.name}'"
 
+    @property
+    def progress_rate(self):
+        """复制进度百分比"""
+        if self.total_questions == 0:
+            return 100
+        return round((self.copied_questions / self.total_questions) * 100, 1)
+
 
 class QuizTag(models.Model):
     """题目标签"""
@@ -224,6 +245,10 @@ class QuizSession(models.Model):
     total_questions = models.PositiveIntegerField(default=0, verbose_name='总题数')
     answered_questions = models.PositiveIntegerField(default=0, verbose_name='已答题数')
     correct_answers = models.PositiveIntegerField(default=0, verbose_name='正确答案数')
+
+    # 题目顺序与当前进度（持久化，支持断点续练）
+    question_ids = models.JSONField(default=list, blank=True, verbose_name='题目顺序')
+    current_index = models.PositiveIntegerField(default=0, verbose_name='当前题号')
     
     class Meta:
         verbose_name = '练习会话'
@@ -1,18 +1,21 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
+from django.urls import reverse
 from django.db.models import Q, Count, Avg
 from django.core.paginator import Paginator
 import json
-import random
 
 from .personal_quiz_models import (
     QuizLibrary, QuizQuestion, QuizTag, QuizSession, 
     QuizAnswer, WrongAnswer, StudyStats
 )
+from .services.quiz_session_service import quiz_session_runner
+from .services.question_sampler import question_sampler
+from .services.answer_grader import answer_grader
 
 
 @login_required
@@ -144,7 +147,6 @@ def library_detail(request, library_id):
                 public_share.record_access(request.user)
             else:
                 # 没有访问权限
-                from django.http import Http404
                 raise Http404("题库不存在或您没有访问权限")
     
     # 获取题目列表
@@ -318,7 +320,6 @@ def start_quiz(request, library_id):
                 public_share.record_access(request.user)
             else:
                 # 没有访问权限
-                from django.http import Http404
                 raise Http404("题库不存在或您没有访问权限")
     
     if request.method == 'POST':
@@ -326,6 +327,7 @@ def start_quiz(request, library_id):
         question_count = int(request.POST.get('question_count', 10))
         question_type = request.POST.get('question_type', '')
         difficulty = request.POST.get('difficulty', '')
+        strategy = request.POST.get('strategy', 'random')
         
         # 获取题目
         questions = library.questions.filter(is_active=True)
@@ -335,24 +337,23 @@ def start_quiz(request, library_id):
         if difficulty:
             questions = questions.filter(difficulty=int(difficulty))
         
-        if not questions.exists():
+        # 随机选择题目（只读取ID，选中的题目在会话开始时再加载）
+        selected_ids = question_sampler.sample_ids(questions, question_count, strategy)
+        
+        if not selected_ids:
             messages.error(request, '没有符合条件的题目')
             return render(request, 'knowledge_app/quiz/start_quiz.html', {'library': library})
         
-        # 随机选择题目
-        selected_questions = random.sample(list(questions), min(question_count, questions.count()))
-        
         # 创建练习会话
         session = QuizSession.objects.create(
             user=request.user,
             library=library,
             session_name=session_name,
-            total_questions=len(selected_questions)
+            total_questions=len(selected_ids)
         )
         
-        # 将选择的题目ID存储在session中
-        request.session[f'quiz_questions_{session.id}'] = [q.id for q in selected_questions]
-        request.session[f'current_question_{session.id}'] = 0
+        # 持久化题目顺序并一次性预加载整套题目
+        quiz_session_runner.start(session, selected_ids)
         
         return redirect('knowledge_app:quiz_session', session.id)
     
@@ -368,22 +369,21 @@ def quiz_session(request, session_id):
     """练习会话"""
     session = get_object_or_404(QuizSession, id=session_id, user=request.user)
     
-    # 获取题目列表
-    question_ids = request.session.get(f'quiz_questions_{session.id}', [])
-    current_index = request.session.get(f'current_question_{session.id}', 0)
+    # 从预加载的会话快照中获取题目，进度以会话记录为准
+    snapshot = quiz_session_runner.get_snapshot(session)
+    question_ids = snapshot['question_ids']
+    current_index = session.current_index
     
     if current_index >= len(question_ids):
         # 练习完成
-        session.status = 'completed'
-        session.completed_at = timezone.now()
-        session.save()
+        quiz_session_runner.finish(session)
         return redirect('knowledge_app:quiz_result', session.id)
     
     # 获取当前题目
-    current_question = get_object_or_404(QuizQuestion, id=question_ids[current_index])
+    current_question = quiz_session_runner.get_current_question(session)
     
     # 检查是否已经回答过这道题
-    existing_answer = QuizAnswer.objects.filter(session=session, question=current_question).first()
+    existing_answer = quiz_session_runner.get_answer(session, current_question['id'])
     
     context = {
         'session': session,
@@ -407,23 +407,18 @@ def submit_answer(request, session_id):
     user_answer = request.POST.get('answer', '').strip()
     time_spent = int(request.POST.get('time_spent', 0))
     
-    question = get_object_or_404(QuizQuestion, id=question_id)
+    # 从会话快照中获取题目，不再重复查询
+    question = quiz_session_runner.get_question(session, question_id)
+    if question is None:
+        raise Http404("题目不存在")
     
     # 检查答案是否正确
-    is_correct = False
-    if question.question_type == 'multiple_choice':
-        # 多选题：用户答案和正确答案都按逗号分割后比较
-        user_answers = set(user_answer.split(','))
-        correct_answers = set(question.correct_answer.split(','))
-        is_correct = user_answers == correct_answers
-    else:
-        # 其他题型：直接比较（忽略大小写和空格）
-        is_correct = user_answer.lower().strip() == question.correct_answer.lower().strip()
+    is_correct = answer_grader.grade_question(question, user_answer)
     
     # 保存答题记录
     answer, created = QuizAnswer.objects.get_or_create(
         session=session,
-        question=question,
+        question_id=question['id'],
         defaults={
             'user_answer': user_answer,
             'is_correct': is_correct,
@@ -435,10 +430,10 @@ def submit_answer(request, session_id):
     if not is_correct:
         wrong_answer, created = WrongAnswer.objects.get_or_create(
             user=request.user,
-            question=question,
+            question_id=question['id'],
             defaults={
                 'wrong_answer': user_answer,
-                'correct_answer': question.correct_answer,
+                'correct_answer': question['correct_answer'],
             }
         )
         if not created:
@@ -447,17 +442,39 @@ def submit_answer(request, session_id):
             wrong_answer.save()
     
     # 移动到下一题
-    current_index = request.session.get(f'current_question_{session.id}', 0)
-    request.session[f'current_question_{session.id}'] = current_index + 1
+    quiz_session_runner.advance(session)
     
     return JsonResponse({
         'success': True,
         'is_correct': is_correct,
-        'correct_answer': question.correct_answer,
-        'explanation': question.explanation,
+        'correct_answer': question['correct_answer'],
+        'explanation': question['explanation'],
     })
 
 
+@login_required
+@require_http_methods(["POST"])
+def submit_answers_batch(request, session_id):
+    """批量提交答案（离线/考试模式）"""
+    session = get_object_or_404(QuizSession, id=session_id, user=request.user)
+
+    try:
+        data = json.loads(request.body)
+        answers = data.get('answers', [])
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({'success': False, 'error': '无效的JSON数据'}, status=400)
+
+    if not isinstance(answers, list) or not answers:
+        return JsonResponse({'success': False, 'error': '请提供要提交的答案列表'}, status=400)
+
+    try:
+        result = quiz_session_runner.submit_batch(session, answers)
+    except (TypeError, ValueError) as e:
+        return JsonResponse({'success': False, 'error': f'答案格式错误：{str(e)}'}, status=400)
+
+    return JsonResponse({'success': True, **result})
+
+
 @login_required
 def quiz_result(request, session_id):
     """练习结果"""
@@ -563,6 +580,7 @@ def analyze_wrong_answer(request, wrong_answer_id):
 
         # 构建错题数据
         wrong_answer_data = {
+            'question_id': wrong_answer.question_id,
             'question': wrong_answer.question.content,
             'user_answer': wrong_answer.wrong_answer,
             'correct_answer': wrong_answer.correct_answer,
@@ -618,10 +636,9 @@ def practice_wrong_answers(request):
             total_questions=wrong_answers.count()
         )
 
-        # 将错题ID存储在session中
-        question_ids = [wa.question.id for wa in wrong_answers]
-        request.session[f'quiz_questions_{session.id}'] = question_ids
-        request.session[f'current_question_{session.id}'] = 0
+        # 持久化错题顺序并一次性预加载
+        question_ids = list(wrong_answers.values_list('question_id', flat=True))
+        quiz_session_runner.start(session, question_ids)
 
         return redirect('knowledge_app:quiz_session', session.id)
 
@@ -698,242 +715,37 @@ def study_statistics(request):
 @login_required
 @require_http_methods(["GET"])
 def export_library_pdf(request, library_id):
-    """导出题库PDF"""
+    """导出题库PDF（内容未变化时直接返回已生成的文件）"""
     library = get_object_or_404(QuizLibrary, id=library_id, owner=request.user)
 
     import logging
     logger = logging.getLogger(__name__)
 
     try:
-        import io
-        from django.http import HttpResponse
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import cm
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-        from django.conf import settings
-        from reportlab.lib.fonts import addMapping
+        import re
+        from .services.pdf_export_service import pdf_export_service
 
         logger.info(f"开始导出题库PDF: {library.name} (ID: {library_id})")
 
-        # 获取题目
-        questions = library.questions.all().order_by('created_at')
-        logger.info(f"找到 {questions.count()} 道题目")
-
-        if not questions.exists():
+        if not library.questions.exists():
             messages.warning(request, '该题库没有题目，无法导出PDF')
             return redirect('knowledge_app:quiz_library_detail', library_id=library_id)
 
-        # 创建PDF
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-
-        # 注册中文字体
-        try:
-            # 尝试注册系统中文字体
-            import platform
-            if platform.system() == 'Windows':
-                # Windows系统字体路径
-                font_paths = [
-                    'C:/Windows/Fonts/msyh.ttc',  # 微软雅黑
-                    'C:/Windows/Fonts/simhei.ttf',  # 黑体
-                    'C:/Windows/Fonts/simsun.ttc',  # 宋体
-                ]
-            else:
-                # Linux/Mac系统字体路径
-                font_paths = [
-                    '/System/Library/Fonts/PingFang.ttc',  # Mac
-                    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',  # Linux
-                ]
-
-            chinese_font_registered = False
-            for font_path in font_paths:
-                try:
-                    import os
-                    if os.path.exists(font_path):
-                        pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-                        chinese_font_registered = True
-                        break
-                except:
-                    continue
-
-            if not chinese_font_registered:
-                # 如果没有找到系统字体，使用ReportLab内置字体
-                chinese_font_name = 'Helvetica'
-            else:
-                chinese_font_name = 'ChineseFont'
-
-        except Exception as e:
-            logger.warning(f"字体注册失败，使用默认字体: {e}")
-            chinese_font_name = 'Helvetica'
-
-        # 获取样式并创建中文样式
-        styles = getSampleStyleSheet()
-
-        # 创建支持中文的样式
-        chinese_title_style = ParagraphStyle(
-            'ChineseTitle',
-            parent=styles['Title'],
-            fontName=chinese_font_name,
-            fontSize=18,
-            spaceAfter=12,
-        )
-
-        chinese_normal_style = ParagraphStyle(
-            'ChineseNormal',
-            parent=styles['Normal'],
-            fontName=chinese_font_name,
-            fontSize=12,
-            spaceAfter=6,
-        )
-
-        chinese_heading_style = ParagraphStyle(
-            'ChineseHeading',
-            parent=styles['Heading2'],
-            fontName=chinese_font_name,
-            fontSize=14,
-            spaceAfter=6,
-        )
-
-        story = []
-
-        # 标题
-        story.append(Paragraph(f"{library.name} - 题库", chinese_title_style))
-        story.append(Spacer(1, 12))
-
-        # 基本信息
-        story.append(Paragraph(f"题库名称: {library.name}", chinese_normal_style))
-        story.append(Paragraph(f"创建时间: {library.created_at.strftime('%Y-%m-%d %H:%M')}", chinese_normal_style))
-        story.append(Paragraph(f"题目数量: {questions.count()} 道", chinese_normal_style))
-        story.append(Paragraph(f"生成时间: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}", chinese_normal_style))
-        story.append(Spacer(1, 20))
-
-        # 题目列表
-        for i, question in enumerate(questions, 1):
-            story.append(Paragraph(f"{i}. {question.title}", chinese_heading_style))
-            story.append(Paragraph(question.content, chinese_normal_style))
-            story.append(Spacer(1, 6))
-
-            # 题目图片
-            if question.question_image:
-                try:
-                    import os
-                    # 获取图片的完整路径
-                    if hasattr(question.question_image, 'path'):
-                        image_path = question.question_image.path
-                    else:
-                        image_path = os.path.join(settings.MEDIA_ROOT, str(question.question_image))
-
-                    logger.info(f"尝试添加题目图片: {image_path}")
-
-                    if os.path.exists(image_path):
-                        img = Image(image_path)
-                        # 设置图片大小，保持比例
-                        img_width, img_height = img.imageWidth, img.imageHeight
-                        max_width = 12*cm  # 最大宽度
-                        max_height = 8*cm  # 最大高度
-
-                        # 计算缩放比例
-                        width_ratio = max_width / img_width
-                        height_ratio = max_height / img_height
-                        scale_ratio = min(width_ratio, height_ratio, 1.0)  # 不放大
-
-                        img.drawWidth = img_width * scale_ratio
-                        img.drawHeight = img_height * scale_ratio
-
-                        story.append(img)
-                        story.append(Spacer(1, 6))
-                        logger.info(f"成功添加题目图片，尺寸: {img.drawWidth}x{img.drawHeight}")
-                    else:
-                        logger.warning(f"题目图片文件不存在: {image_path}")
-                except Exception as e:
-                    logger.error(f"无法添加题目图片: {e}")
-                    import traceback
-                    logger.error(f"错误详情: {traceback.format_exc()}")
-
-            # 选项
-            if question.question_type in ['single_choice', 'multiple_choice'] and question.options:
-                for key, value in question.options.items():
-                    story.append(Paragraph(f"{key}. {value}", chinese_normal_style))
-
-                    # 选项图片
-                    if question.option_images and key in question.option_images:
-                        try:
-                            import os
-                            option_image_path = question.option_images[key]
-                            full_image_path = os.path.join(settings.MEDIA_ROOT, option_image_path)
-
-                            logger.info(f"尝试添加选项{key}图片: {full_image_path}")
-
-                            if os.path.exists(full_image_path):
-                                opt_img = Image(full_image_path)
-                                # 选项图片较小
-                                opt_img_width, opt_img_height = opt_img.imageWidth, opt_img.imageHeight
-                                max_opt_width = 6*cm
-                                max_opt_height = 4*cm
-
-                                opt_width_ratio = max_opt_width / opt_img_width
-                                opt_height_ratio = max_opt_height / opt_img_height
-                                opt_scale_ratio = min(opt_width_ratio, opt_height_ratio, 1.0)
-
-                                opt_img.drawWidth = opt_img_width * opt_scale_ratio
-                                opt_img.drawHeight = opt_img_height * opt_scale_ratio
-
-                                story.append(opt_img)
-                                story.append(Spacer(1, 3))
-                                logger.info(f"成功添加选项{key}图片，尺寸: {opt_img.drawWidth}x{opt_img.drawHeight}")
-                            else:
-                                logger.warning(f"选项{key}图片文件不存在: {full_image_path}")
-                        except Exception as e:
-                            logger.error(f"无法添加选项{key}图片: {e}")
-                            import traceback
-                            logger.error(f"错误详情: {traceback.format_exc()}")
-
-            story.append(Spacer(1, 6))
-            story.append(Paragraph(f"答案: {question.correct_answer}", chinese_normal_style))
-
-            if question.explanation:
-                story.append(Paragraph(f"解析: {question.explanation}", chinese_normal_style))
-
-            story.append(Spacer(1, 15))
-
-        # 构建PDF
-        doc.build(story)
-        buffer.seek(0)
-        pdf_content = buffer.getvalue()
-        buffer.close()
-
-        logger.info("PDF内容生成成功")
+        pdf_path = pdf_export_service.export_library(library)
+        if pdf_path is None:
+            return render(request, 'knowledge_app/quiz/pdf_export_pending.html', {
+                'export_name': library.name,
+                'back_url': reverse('knowledge_app:quiz_library_detail', args=[library_id]),
+            }, status=202)
 
-        # 生成文件名
-        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
         # 保留中文字符，只移除特殊字符
-        import re
         safe_name = re.sub(r'[<>:"/\\|?*]', '', library.name)[:30]
         if not safe_name.strip():
             safe_name = '题库'
-        filename = f"{safe_name}_题库_{timestamp}.pdf"
-
-        # 创建响应
-        response = HttpResponse(pdf_content, content_type='application/pdf')
-        # 设置文件名，支持中文文件名
-        from urllib.parse import quote
-        # 为了更好的兼容性，使用ASCII安全的文件名作为fallback
-        ascii_filename = f"Library_{library.id}_{timestamp}.pdf"
-        encoded_filename = quote(filename.encode('utf-8'))
-        response['Content-Disposition'] = f'inline; filename="{ascii_filename}"; filename*=UTF-8\'\'{encoded_filename}'
+        filename = f"{safe_name}_题库_{timezone.now().strftime('%Y%m%d')}.pdf"
 
         logger.info(f"PDF导出成功: {filename}")
-        return response
+        return pdf_export_service.file_response(request, pdf_path, filename)
 
     except Exception as e:
         import traceback
@@ -946,225 +758,33 @@ def export_library_pdf(request, library_id):
 @login_required
 @require_http_methods(["GET"])
 def export_wrong_answers_pdf(request):
-    """导出错题集PDF"""
+    """导出错题集PDF（错题未变化时直接返回已生成的文件）"""
     import logging
     logger = logging.getLogger(__name__)
 
     try:
-        import io
-        from django.http import HttpResponse
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import cm
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
-        from django.conf import settings
+        from .services.pdf_export_service import pdf_export_service
 
         logger.info(f"开始导出错题集PDF: {request.user.username}")
 
-        # 获取错题
-        wrong_answers = WrongAnswer.objects.filter(user=request.user).order_by('-last_wrong_at')
-
-        if not wrong_answers.exists():
+        if not WrongAnswer.objects.filter(user=request.user).exists():
             messages.warning(request, '您还没有错题，无法导出PDF')
             return redirect('knowledge_app:quiz_wrong_answers')
 
-        # 创建PDF
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-
-        # 注册中文字体
-        try:
-            import platform
-            if platform.system() == 'Windows':
-                font_paths = [
-                    'C:/Windows/Fonts/msyh.ttc',  # 微软雅黑
-                    'C:/Windows/Fonts/simhei.ttf',  # 黑体
-                    'C:/Windows/Fonts/simsun.ttc',  # 宋体
-                ]
-            else:
-                font_paths = [
-                    '/System/Library/Fonts/PingFang.ttc',  # Mac
-                    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',  # Linux
-                ]
-
-            chinese_font_registered = False
-            for font_path in font_paths:
-                try:
-                    import os
-                    if os.path.exists(font_path):
-                        pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-                        chinese_font_registered = True
-                        break
-                except:
-                    continue
-
-            if not chinese_font_registered:
-                chinese_font_name = 'Helvetica'
-            else:
-                chinese_font_name = 'ChineseFont'
-
-        except Exception as e:
-            logger.warning(f"字体注册失败，使用默认字体: {e}")
-            chinese_font_name = 'Helvetica'
-
-        # 获取样式并创建中文样式
-        styles = getSampleStyleSheet()
-
-        chinese_title_style = ParagraphStyle(
-            'ChineseTitle',
-            parent=styles['Title'],
-            fontName=chinese_font_name,
-            fontSize=18,
-            spaceAfter=12,
-        )
-
-        chinese_normal_style = ParagraphStyle(
-            'ChineseNormal',
-            parent=styles['Normal'],
-            fontName=chinese_font_name,
-            fontSize=12,
-            spaceAfter=6,
-        )
-
-        chinese_heading_style = ParagraphStyle(
-            'ChineseHeading',
-            parent=styles['Heading2'],
-            fontName=chinese_font_name,
-            fontSize=14,
-            spaceAfter=6,
-        )
-
-        story = []
-
-        # 标题
-        story.append(Paragraph(f"{request.user.username} - 错题集", chinese_title_style))
-        story.append(Spacer(1, 12))
-
-        # 基本信息
-        story.append(Paragraph(f"用户名: {request.user.username}", chinese_normal_style))
-        story.append(Paragraph(f"错题数量: {wrong_answers.count()} 道", chinese_normal_style))
-        story.append(Paragraph(f"生成时间: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}", chinese_normal_style))
-        story.append(Spacer(1, 20))
-
-        # 错题列表
-        for i, wrong_answer in enumerate(wrong_answers, 1):
-            question = wrong_answer.question
-            story.append(Paragraph(f"{i}. {question.title}", chinese_heading_style))
-            story.append(Paragraph(question.content, chinese_normal_style))
-            story.append(Spacer(1, 6))
-
-            # 题目图片
-            if question.question_image:
-                try:
-                    import os
-                    # 获取图片的完整路径
-                    if hasattr(question.question_image, 'path'):
-                        image_path = question.question_image.path
-                    else:
-                        image_path = os.path.join(settings.MEDIA_ROOT, str(question.question_image))
-
-                    logger.info(f"尝试添加错题图片: {image_path}")
-
-                    if os.path.exists(image_path):
-                        img = Image(image_path)
-                        img_width, img_height = img.imageWidth, img.imageHeight
-                        max_width = 12*cm
-                        max_height = 8*cm
-
-                        width_ratio = max_width / img_width
-                        height_ratio = max_height / img_height
-                        scale_ratio = min(width_ratio, height_ratio, 1.0)
-
-                        img.drawWidth = img_width * scale_ratio
-                        img.drawHeight = img_height * scale_ratio
-
-                        story.append(img)
-                        story.append(Spacer(1, 6))
-                        logger.info(f"成功添加错题图片，尺寸: {img.drawWidth}x{img.drawHeight}")
-                    else:
-                        logger.warning(f"错题图片文件不存在: {image_path}")
-                except Exception as e:
-                    logger.error(f"无法添加错题图片: {e}")
-                    import traceback
-                    logger.error(f"错误详情: {traceback.format_exc()}")
-
-            # 选项
-            if question.question_type in ['single_choice', 'multiple_choice'] and question.options:
-                for key, value in question.options.items():
-                    story.append(Paragraph(f"{key}. {value}", chinese_normal_style))
-
-                    # 选项图片
-                    if question.option_images and key in question.option_images:
-                        try:
-                            import os
-                            option_image_path = question.option_images[key]
-                            full_image_path = os.path.join(settings.MEDIA_ROOT, option_image_path)
-
-                            logger.info(f"尝试添加选项{key}图片: {full_image_path}")
-
-                            if os.path.exists(full_image_path):
-                                opt_img = Image(full_image_path)
-                                opt_img_width, opt_img_height = opt_img.imageWidth, opt_img.imageHeight
-                                max_opt_width = 6*cm
-                                max_opt_height = 4*cm
-
-                                opt_width_ratio = max_opt_width / opt_img_width
-                                opt_height_ratio = max_opt_height / opt_img_height
-                                opt_scale_ratio = min(opt_width_ratio, opt_height_ratio, 1.0)
-
-                                opt_img.drawWidth = opt_img_width * opt_scale_ratio
-                                opt_img.drawHeight = opt_img_height * opt_scale_ratio
-
-                                story.append(opt_img)
-                                story.append(Spacer(1, 3))
-                                logger.info(f"成功添加选项{key}图片，尺寸: {opt_img.drawWidth}x{opt_img.drawHeight}")
-                            else:
-                                logger.warning(f"选项{key}图片文件不存在: {full_image_path}")
-                        except Exception as e:
-                            logger.error(f"无法添加选项{key}图片: {e}")
-                            import traceback
-                            logger.error(f"错误详情: {traceback.format_exc()}")
-
-            story.append(Spacer(1, 6))
-            story.append(Paragraph(f"正确答案: {question.correct_answer}", chinese_normal_style))
-            story.append(Paragraph(f"您的答案: {wrong_answer.wrong_answer}", chinese_normal_style))
-            story.append(Paragraph(f"错误次数: {wrong_answer.wrong_count}", chinese_normal_style))
-
-            if question.explanation:
-                story.append(Paragraph(f"解析: {question.explanation}", chinese_normal_style))
-
-            story.append(Spacer(1, 15))
-
-        # 构建PDF
-        doc.build(story)
-        buffer.seek(0)
-        pdf_content = buffer.getvalue()
-        buffer.close()
+        pdf_path = pdf_export_service.export_wrong_answers(request.user)
+        if pdf_path is None:
+            return render(request, 'knowledge_app/quiz/pdf_export_pending.html', {
+                'export_name': '错题集',
+                'back_url': reverse('knowledge_app:quiz_wrong_answers'),
+            }, status=202)
 
-        logger.info("错题集PDF内容生成成功")
-
-        # 生成文件名
-        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
         safe_username = ''.join(c for c in request.user.username if c.isalnum() or c in '-_')[:20]
         if not safe_username.strip():
             safe_username = 'User'
-        filename = f"{safe_username}_WrongAnswers_{timestamp}.pdf"
-
-        # 创建响应
-        response = HttpResponse(pdf_content, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        filename = f"{safe_username}_WrongAnswers_{timezone.now().strftime('%Y%m%d')}.pdf"
 
         logger.info(f"错题集PDF导出成功: {filename}")
-        return response
+        return pdf_export_service.file_response(request, pdf_path, filename, as_attachment=True)
 
     except Exception as e:
         import traceback
@@ -1178,20 +798,12 @@ def export_wrong_answers_pdf(request):
 def test_pdf_generation(request):
     """测试PDF生成功能"""
     try:
-        import io
         from django.http import HttpResponse
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph
-        from reportlab.lib.styles import getSampleStyleSheet
-
-        # 创建PDF缓冲区
-        buffer = io.BytesIO()
-
-        # 创建PDF文档
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
+        from reportlab.platypus import Paragraph
+        from .services.pdf_toolkit import pdf_toolkit
 
         # 获取样式
-        styles = getSampleStyleSheet()
+        styles = pdf_toolkit.base_styles
 
         # 创建内容
         story = []
@@ -1201,12 +813,7 @@ def test_pdf_generation(request):
         story.append(Paragraph(f"Generated at: {timezone.now()}", styles['Normal']))
 
         # 构建PDF
-        doc.build(story)
-
-        # 获取PDF内容
-        buffer.seek(0)
-        pdf_content = buffer.getvalue()
-        buffer.close()
+        pdf_content = pdf_toolkit.render(story)
 
         # 创建响应
         response = HttpResponse(pdf_content, content_type='application/pdf')
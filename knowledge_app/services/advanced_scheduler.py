@@ -116,6 +116,60 @@ class AdvancedDailyTermScheduler:
             replace_existing=True
         )
         
+        # 添加名词预生成任务（每天03:30，避开零点高峰）
+        self.scheduler.add_job(
+            func=self._prefetch_terms_job,
+            trigger=CronTrigger(hour=3, minute=30, second=0),
+            id='daily_term_prefetch',
+            name='名词预生成',
+            replace_existing=True
+        )
+        
+        # 添加练习题池补充任务（每30分钟）
+        self.scheduler.add_job(
+            func=self._refill_exercise_pool_job,
+            trigger=CronTrigger(minute='15,45'),
+            id='exercise_pool_refill',
+            name='练习题池补充',
+            replace_existing=True
+        )
+        
+        # 添加资源搜索缓存清理任务（每小时）
+        self.scheduler.add_job(
+            func=self._clear_resource_cache_job,
+            trigger=CronTrigger(minute=20),
+            id='resource_cache_cleanup',
+            name='资源搜索缓存清理',
+            replace_existing=True
+        )
+        
+        # 添加AI回答缓存清理任务（每小时）
+        self.scheduler.add_job(
+            func=self._clear_ai_response_cache_job,
+            trigger=CronTrigger(minute=40),
+            id='ai_response_cache_cleanup',
+            name='AI回答缓存清理',
+            replace_existing=True
+        )
+        
+        # 添加中断的题库复制恢复任务（每10分钟）
+        self.scheduler.add_job(
+            func=self._recover_library_copies_job,
+            trigger=CronTrigger(minute='5,15,25,35,45,55'),
+            id='library_copy_recovery',
+            name='题库复制恢复',
+            replace_existing=True
+        )
+        
+        # 添加资源统计快照刷新任务（每10分钟）
+        self.scheduler.add_job(
+            func=self._refresh_resource_stats_job,
+            trigger=CronTrigger(minute='*/10'),
+            id='resource_stats_refresh',
+            name='资源统计快照刷新',
+            replace_existing=True
+        )
+        
         # 启动调度器
         self.scheduler.start()
         
@@ -151,6 +205,12 @@ class AdvancedDailyTermScheduler:
                     if is_generation_time or (current_hour == 23 and current_minute >= 55):
                         time.sleep(60)  # 零点前后每分钟检查
                     else:
+                        self._prefetch_terms_job()
+                        self._refill_exercise_pool_job()
+                        self._clear_resource_cache_job()
+                        self._clear_ai_response_cache_job()
+                        self._recover_library_copies_job()
+                        self._refresh_resource_stats_job()
                         time.sleep(1800)  # 其他时间每30分钟检查
                         
                 except Exception as e:
@@ -218,6 +278,67 @@ class AdvancedDailyTermScheduler:
         else:
             print(f"⚠️  状态监控 - {beijing_now.strftime('%H:%M')} - 今日名词缺失！")
     
+    def _prefetch_terms_job(self):
+        """名词预生成任务：保持未来几天的名词已生成并通过质量检查"""
+        try:
+            result = DailyTermService().prefetch_terms()
+            if result['generated'] or result['failed']:
+                print(f"📚 名词预生成 - 新增 {result['generated']} 个，失败 {result['failed']} 个")
+        except Exception as e:
+            logger.error(f"名词预生成失败: {e}")
+    
+    def _refill_exercise_pool_job(self):
+        """练习题池补充任务"""
+        from knowledge_app.services.exercise_pool import exercise_pool
+
+        try:
+            result = exercise_pool.refill()
+            print(f"🧩 练习题池补充 - 新增 {result['added']} 道题目")
+        except Exception as e:
+            logger.error(f"练习题池补充失败: {e}")
+    
+    def _clear_resource_cache_job(self):
+        """资源搜索缓存清理任务：删除超过宽限期的缓存记录"""
+        from resource_aggregator.search_cache import search_cache
+
+        try:
+            deleted = search_cache.clear_expired()
+            if deleted:
+                print(f"🧹 资源缓存清理 - 删除 {deleted} 条过期记录")
+        except Exception as e:
+            logger.error(f"资源缓存清理失败: {e}")
+    
+    def _clear_ai_response_cache_job(self):
+        """AI回答缓存清理任务：删除已过期的持久化回答"""
+        from knowledge_app.services.ai_response_cache import ai_response_cache
+
+        try:
+            deleted = ai_response_cache.clear_expired()
+            if deleted:
+                print(f"🧹 AI回答缓存清理 - 删除 {deleted} 条过期记录")
+        except Exception as e:
+            logger.error(f"AI回答缓存清理失败: {e}")
+    
+    def _recover_library_copies_job(self):
+        """题库复制恢复任务：重新执行进程退出后中断的后台复制"""
+        from knowledge_app.services.library_copy_service import library_copy_service
+
+        try:
+            recovered = library_copy_service.recover_stale()
+            if recovered:
+                print(f"📚 题库复制恢复 - 重新执行 {recovered} 个中断的复制")
+        except Exception as e:
+            logger.error(f"题库复制恢复失败: {e}")
+    
+    def _refresh_resource_stats_job(self):
+        """资源统计快照刷新任务"""
+        from resource_aggregator.stats import resource_stats
+
+        try:
+            resource_stats.refresh_global()
+        except Exception as e:
+            logger.error(f"资源统计快照刷新失败: {e}")
+    
     def _should_generate_term(self, date) -> bool:
         """检查是否需要生成名词"""
         existing_term = DailyTerm.objects.filter(
@@ -0,0 +1,162 @@
+"""
+AI回答缓存服务
+同一名词下的相似提问、同一道题的相同错误答案往往重复出现，
+按规范化后的提示内容生成缓存键，依次查询进程内LRU、Django缓存和数据库，
+命中时直接返回，不再调用大模型API
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class AIResponseCache:
+    """AI回答多级缓存"""
+
+    CACHE_PREFIX = 'ai_response'
+    LOCAL_MAX_ENTRIES = 512
+
+    # 各类回答的有效期（秒）
+    NAMESPACE_TTL = {
+        'term_chat': 60 * 60 * 24 * 7,
+        'term_suggestions': 60 * 60 * 24 * 7,
+        'wrong_answer': 60 * 60 * 24 * 30,
+    }
+    DEFAULT_TTL = 60 * 60 * 24
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def persist(self) -> bool:
+        """是否持久化到数据库"""
+        return getattr(settings, 'AI_RESPONSE_CACHE_PERSIST', False)
+
+    @staticmethod
+    def fingerprint(text: Any) -> str:
+        """
+        规范化文本：统一全半角和大小写，连续空白合并为一个空格
+
+        运算符和标点保留不变，i++ 与 i--、O(n) 与 On 属于不同的提问
+        """
+        text = unicodedata.normalize('NFKC', str(text or '')).lower()
+        return _WHITESPACE_RE.sub(' ', text).strip()
+
+    def make_key(self, namespace: str, *parts: Any) -> str:
+        """根据缓存类型和规范化后的内容生成缓存键"""
+        digest = hashlib.sha1('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+        return f'{namespace}:{digest}'
+
+    def _ttl(self, key: str) -> int:
+        return self.NAMESPACE_TTL.get(key.split(':', 1)[0], self.DEFAULT_TTL)
+
+    def _local_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return payload
+
+    def _local_set(self, key: str, payload: Any, ttl: int):
+        with self._lock:
+            self._local[key] = (time.monotonic() + ttl, payload)
+            self._local.move_to_end(key)
+            while len(self._local) > self.LOCAL_MAX_ENTRIES:
+                self._local.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Any]:
+        """查询缓存，未命中返回None"""
+        payload = self._local_get(key)
+        if payload is not None:
+            return payload
+
+        ttl = self._ttl(key)
+        payload = cache.get(f'{self.CACHE_PREFIX}:{key}')
+        if payload is None and self.persist:
+            payload = self._db_get(key)
+            if payload is not None:
+                cache.set(f'{self.CACHE_PREFIX}:{key}', payload, ttl)
+
+        if payload is not None:
+            self._local_set(key, payload, ttl)
+        return payload
+
+    def set(self, key: str, payload: Any):
+        """写入缓存"""
+        ttl = self._ttl(key)
+        self._local_set(key, payload, ttl)
+        cache.set(f'{self.CACHE_PREFIX}:{key}', payload, ttl)
+
+        if self.persist:
+            from ..models import CachedAIResponse
+            try:
+                CachedAIResponse.objects.update_or_create(
+                    cache_key=key,
+                    defaults={
+                        'namespace': key.split(':', 1)[0],
+                        'payload': payload,
+                        'expires_at': timezone.now() + timedelta(seconds=ttl),
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"Failed to persist AI response {key}: {e}")
+
+    def delete(self, key: str):
+        """删除缓存"""
+        with self._lock:
+            self._local.pop(key, None)
+        cache.delete(f'{self.CACHE_PREFIX}:{key}')
+        if self.persist:
+            from ..models import CachedAIResponse
+            CachedAIResponse.objects.filter(cache_key=key).delete()
+
+    def clear_expired(self) -> int:
+        """清理进程内和数据库中已过期的缓存，返回删除的数据库记录数"""
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, entry in self._local.items() if entry[0] < now]:
+                del self._local[key]
+
+        from ..models import CachedAIResponse
+        deleted, _ = CachedAIResponse.objects.filter(expires_at__lte=timezone.now()).delete()
+        return deleted
+
+    def _db_get(self, key: str) -> Optional[Any]:
+        from ..models import CachedAIResponse
+        try:
+            row = CachedAIResponse.objects.filter(
+                cache_key=key, expires_at__gt=timezone.now()
+            ).values('id', 'payload').first()
+        except Exception as e:
+            logger.warning(f"Failed to read AI response cache {key}: {e}")
+            return None
+
+        if row is None:
+            return None
+        CachedAIResponse.objects.filter(id=row['id']).update(hit_count=F('hit_count') + 1)
+        return row['payload']
+
+
+# 全局实例
+ai_response_cache = AIResponseCache()
@@ -0,0 +1,138 @@
+"""
+答案判分服务
+为个人题库、练习题系统和AI练习提供统一的判分规则：
+按题型选择判分策略，正确答案预先规范化并缓存，支持整场练习批量判分；
+各系统对同一题型的判分方式不同时，通过覆盖题型策略创建各自的判分器
+"""
+
+import re
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class TextStrategy:
+    """文本题：忽略大小写与首尾空白"""
+
+    def normalize(self, answer: Any) -> Any:
+        return str(answer or '').strip().lower()
+
+    def match(self, user_normalized: Any, correct_normalized: Any) -> bool:
+        return user_normalized == correct_normalized
+
+
+class ChoiceStrategy(TextStrategy):
+    """单选/判断题：忽略大小写与所有空白"""
+
+    def normalize(self, answer: Any) -> Any:
+        return _WHITESPACE_RE.sub('', str(answer or '')).upper()
+
+
+class MultipleChoiceStrategy(TextStrategy):
+    """多选题：按逗号拆分后比较选项集合，与顺序无关"""
+
+    def normalize(self, answer: Any) -> Any:
+        if isinstance(answer, (list, tuple, set, frozenset)):
+            parts = answer
+        else:
+            parts = str(answer or '').split(',')
+        return frozenset(p for p in (_WHITESPACE_RE.sub('', str(part)).upper() for part in parts) if p)
+
+
+class ManualStrategy(TextStrategy):
+    """需要人工评判的题型（编程题），自动判分一律视为正确"""
+
+    def match(self, user_normalized: Any, correct_normalized: Any) -> bool:
+        return True
+
+
+STRATEGIES = {
+    'single_choice': ChoiceStrategy(),
+    'choice': ChoiceStrategy(),  # AI练习生成的选择题
+    'true_false': ChoiceStrategy(),
+    'multiple_choice': MultipleChoiceStrategy(),
+    'fill_blank': TextStrategy(),
+    'short_answer': TextStrategy(),
+    'coding': ManualStrategy(),
+}
+
+DEFAULT_STRATEGY = TextStrategy()
+
+
+@lru_cache(maxsize=4096)
+def _normalized_correct(strategy: TextStrategy, correct_answer: str) -> Any:
+    """规范化正确答案（同一题目的正确答案只规范化一次）"""
+    return strategy.normalize(correct_answer)
+
+
+class AnswerGrader:
+    """答案判分器"""
+
+    def __init__(self, overrides: Optional[Dict[str, TextStrategy]] = None):
+        """
+        Args:
+            overrides: 按题型覆盖默认判分策略，例如 {'short_answer': ManualStrategy()}
+        """
+        self.strategies = {**STRATEGIES, **(overrides or {})}
+
+    def get_strategy(self, question_type: str):
+        return self.strategies.get(question_type, DEFAULT_STRATEGY)
+
+    def normalize_correct(self, question_type: str, correct_answer: Any) -> Any:
+        """获取规范化后的正确答案，可存入题目快照中复用"""
+        return _normalized_correct(self.get_strategy(question_type), str(correct_answer or ''))
+
+    def grade(self, question_type: str, correct_answer: Any, user_answer: Any) -> bool:
+        """判断单道题是否正确"""
+        return self.grade_normalized(
+            question_type, self.normalize_correct(question_type, correct_answer), user_answer
+        )
+
+    def grade_normalized(self, question_type: str, correct_normalized: Any, user_answer: Any) -> bool:
+        """使用预先规范化的正确答案判分"""
+        strategy = self.get_strategy(question_type)
+        return strategy.match(strategy.normalize(user_answer), correct_normalized)
+
+    def grade_question(self, question: Dict[str, Any], user_answer: Any) -> bool:
+        """对会话快照中的题目判分，优先使用快照中存储的规范化答案"""
+        correct_normalized = question.get('normalized_answer')
+        if correct_normalized is None:
+            correct_normalized = self.normalize_correct(question['question_type'], question['correct_answer'])
+        return self.grade_normalized(question['question_type'], correct_normalized, user_answer)
+
+    def grade_many(self, items: Iterable[Tuple[str, Any, Any]]) -> List[bool]:
+        """
+        批量判分
+
+        Args:
+            items: (题型, 正确答案, 用户答案) 序列
+
+        Returns:
+            与输入顺序一致的判分结果
+        """
+        items = list(items)
+        results = [False] * len(items)
+
+        # 按题型分组，每组只查找一次策略
+        groups: Dict[str, List[int]] = {}
+        for index, (question_type, _, _) in enumerate(items):
+            groups.setdefault(question_type, []).append(index)
+
+        for question_type, indexes in groups.items():
+            strategy = self.get_strategy(question_type)
+            for index in indexes:
+                _, correct_answer, user_answer = items[index]
+                correct_normalized = self.normalize_correct(question_type, correct_answer)
+                results[index] = strategy.match(strategy.normalize(user_answer), correct_normalized)
+
+        return results
+
+
+# 全局实例
+answer_grader = AnswerGrader()
+# 练习题系统的简答题需要人工评判，与编程题一样自动判分视为正确
+exercise_answer_grader = AnswerGrader({'short_answer': ManualStrategy()})
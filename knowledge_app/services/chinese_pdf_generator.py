@@ -3,21 +3,17 @@
 专门处理中文内容的PDF生成，确保中文正确显示
 """
 
-import io
-import os
 from datetime import datetime
 from django.http import HttpResponse
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.lib.colors import black, blue, red, green, orange
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.colors import black, blue, orange
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.platypus.flowables import HRFlowable
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 import logging
 
+from .pdf_toolkit import pdf_toolkit
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,129 +25,22 @@ class ChinesePDFGenerator:
         self.setup_styles()
     
     def setup_chinese_font(self):
-        """设置中文字体"""
-        try:
-            # Windows系统中文字体路径
-            font_paths = [
-                "C:/Windows/Fonts/simhei.ttf",    # 黑体
-                "C:/Windows/Fonts/simsun.ttc",    # 宋体
-                "C:/Windows/Fonts/msyh.ttc",      # 微软雅黑
-                "C:/Windows/Fonts/simkai.ttf",    # 楷体
-            ]
-            
-            self.chinese_font = None
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    try:
-                        pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-                        self.chinese_font = 'ChineseFont'
-                        logger.info(f"Successfully registered Chinese font: {font_path}")
-                        break
-                    except Exception as e:
-                        logger.warning(f"Failed to register font {font_path}: {e}")
-                        continue
-            
-            if not self.chinese_font:
-                # 如果没有找到中文字体，使用Helvetica
-                self.chinese_font = 'Helvetica'
-                logger.warning("No Chinese font found, using Helvetica")
-                
-        except Exception as e:
-            logger.error(f"Font setup failed: {e}")
-            self.chinese_font = 'Helvetica'
+        """设置中文字体（字体在进程内只注册一次）"""
+        self.chinese_font = pdf_toolkit.font_name
     
     def setup_styles(self):
-        """设置样式"""
-        self.styles = getSampleStyleSheet()
-        
-        # 标题样式
-        self.title_style = ParagraphStyle(
-            'ChineseTitle',
-            parent=self.styles['Title'],
-            fontName=self.chinese_font,
-            fontSize=18,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            textColor=black
-        )
-        
-        # 副标题样式
-        self.subtitle_style = ParagraphStyle(
-            'ChineseSubtitle',
-            parent=self.styles['Heading2'],
-            fontName=self.chinese_font,
-            fontSize=14,
-            spaceAfter=12,
-            textColor=blue
-        )
-        
-        # 正文样式
-        self.body_style = ParagraphStyle(
-            'ChineseBody',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=11,
-            spaceAfter=8,
-            alignment=TA_LEFT,
-            leading=16
-        )
-        
-        # 题目样式
-        self.question_style = ParagraphStyle(
-            'ChineseQuestion',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=12,
-            spaceAfter=6,
-            leftIndent=0,
-            textColor=black,
-            leading=18
-        )
-        
-        # 选项样式
-        self.option_style = ParagraphStyle(
-            'ChineseOption',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=11,
-            spaceAfter=3,
-            leftIndent=20,
-            leading=16
-        )
-        
-        # 答案样式
-        self.answer_style = ParagraphStyle(
-            'ChineseAnswer',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=11,
-            spaceAfter=6,
-            textColor=green,
-            leading=16
-        )
-        
-        # 错误答案样式
-        self.wrong_answer_style = ParagraphStyle(
-            'ChineseWrongAnswer',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=11,
-            spaceAfter=6,
-            textColor=red,
-            leading=16
-        )
-        
-        # 解析样式
-        self.explanation_style = ParagraphStyle(
-            'ChineseExplanation',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=10,
-            spaceAfter=10,
-            leftIndent=10,
-            textColor=black,
-            leading=14
-        )
+        """设置样式（共享PDF组件中预先构建的样式）"""
+        self.styles = pdf_toolkit.base_styles
+        sheet = pdf_toolkit.stylesheet('chinese')
+        
+        self.title_style = sheet['title']
+        self.subtitle_style = sheet['subtitle']
+        self.body_style = sheet['body']
+        self.question_style = sheet['question']
+        self.option_style = sheet['option']
+        self.answer_style = sheet['answer']
+        self.wrong_answer_style = sheet['wrong_answer']
+        self.explanation_style = sheet['explanation']
     
     def safe_text(self, text):
         """安全处理文本"""
@@ -249,17 +138,6 @@ class ChinesePDFGenerator:
     
     def generate_library_pdf(self, library, questions=None):
         """生成题库PDF"""
-        buffer = io.BytesIO()
-        
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-        
         story = []
         
         # 标题
@@ -327,23 +205,10 @@ class ChinesePDFGenerator:
                 story.append(HRFlowable(width="100%", thickness=0.5, color=black))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_toolkit.render(story)
     
     def generate_wrong_answers_pdf(self, user, wrong_answers=None):
         """生成错题集PDF"""
-        buffer = io.BytesIO()
-        
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-        
         story = []
         
         # 标题
@@ -431,9 +296,7 @@ class ChinesePDFGenerator:
                 story.append(HRFlowable(width="100%", thickness=0.5, color=black))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_toolkit.render(story)
     
     def create_pdf_response(self, pdf_content, filename):
         """创建PDF响应"""
@@ -3,10 +3,9 @@
 负责与kimi API交互，获取和处理每日名词
 """
 
-import requests
 import json
 import logging
-import time
+import re
 import random
 import pytz
 from datetime import datetime, date, timedelta
@@ -18,6 +17,7 @@ from django.core.cache import cache
 from ..models import DailyTerm, TermHistory
 from .domain_scheduler import domain_scheduler, build_domain_specific_prompt
 from .agent_quality_monitor import quality_monitor
+from .llm_transport import llm_transport
 
 logger = logging.getLogger(__name__)
 
@@ -38,11 +38,6 @@ class KimiAPIClient:
             logger.error("Kimi API key not configured")
             return None
         
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {self.api_key}'
-        }
-        
         data = {
             'model': self.model,
             'messages': messages,
@@ -50,28 +45,10 @@ class KimiAPIClient:
             'temperature': temperature
         }
         
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self.base_url,
-                    headers=headers,
-                    json=data,
-                    timeout=self.timeout
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result['choices'][0]['message']['content'].strip()
-                else:
-                    logger.warning(f"API request failed with status {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                logger.error(f"API request error (attempt {attempt + 1}): {e}")
-                
-            if attempt < self.max_retries - 1:
-                time.sleep(2 ** attempt)  # 指数退避
-        
-        return None
+        return llm_transport.chat_completion(
+            'kimi', self.base_url, self.api_key, data,
+            timeout=self.timeout, max_retries=self.max_retries
+        )
     
     def get_computer_term(self, target_date: date = None) -> Optional[str]:
         """获取一个计算机相关的名词（基于当前领域）"""
@@ -83,10 +60,11 @@ class KimiAPIClient:
         domain_info = domain_scheduler.get_domain_info(target_date)
         domain = domain_info['domain']
 
-        # 获取最近使用过的名词，避免重复
+        # 获取最近使用过的名词（包括已预生成的后续名词和草稿），避免重复
         recent_terms = DailyTerm.objects.filter(
-            status='active',
-            display_date__gte=target_date - timedelta(days=30)
+            status__in=['active', 'draft', 'prefetched'],
+            display_date__gte=target_date - timedelta(days=30),
+            display_date__lte=target_date + timedelta(days=30)
         ).values_list('term', flat=True)
 
         recent_terms_str = ', '.join(recent_terms) if recent_terms else '无'
@@ -336,12 +314,14 @@ class KimiAPIClient:
 class DailyTermService:
     """每日名词服务"""
     
+    PREFETCH_DAYS = 7  # 预生成名词的天数
+    
     def __init__(self):
         self.api_client = KimiAPIClient()
         self.max_retry_attempts = 5
     
     def generate_daily_term(self, target_date: date = None) -> Optional[DailyTerm]:
-        """生成每日名词"""
+        """生成每日名词：优先启用预生成的名词，没有时才实时调用API"""
         if target_date is None:
             target_date = timezone.now().date()
         
@@ -353,11 +333,79 @@ class DailyTermService:
         
         if existing_term:
             logger.info(f"Daily term already exists for {target_date}: {existing_term.term}")
+            # 补齐旧名词缺少的聊天预生成内容
+            if not existing_term.get_chat_content()['suggested_questions']:
+                self.prepare_chat_content(existing_term)
+                cache.delete(f'today_term_{target_date}')
             return existing_term
         
-        # 尝试获取新名词
+        # 启用预生成的名词，不需要调用外部API
+        activated = self.activate_prefetched_term(target_date)
+        if activated:
+            return activated
+        
+        # 管理员保存的草稿等待人工审核，不自动发布，也不再生成（展示日期唯一）
+        if DailyTerm.objects.filter(display_date=target_date, status='draft').exists():
+            logger.warning(f"Daily term for {target_date} is an unreviewed draft, not publishing")
+            return None
+        
+        logger.warning(f"No prefetched term for {target_date}, generating on demand")
+        daily_term = self._create_term(target_date, status='active')
+        if daily_term:
+            # 预生成聊天推荐问题，页面访问时不再实时调用AI
+            self.prepare_chat_content(daily_term)
+        return daily_term
+    
+    def activate_prefetched_term(self, target_date: date) -> Optional[DailyTerm]:
+        """将指定日期预生成的名词设为当前展示（只处理prefetched状态，管理员的草稿不会被发布）"""
+        activated = DailyTerm.objects.filter(
+            display_date=target_date,
+            status='prefetched'
+        ).update(status='active', updated_at=timezone.now())
+        if not activated:
+            return None
+        
+        daily_term = DailyTerm.objects.get(display_date=target_date)
+        cache.delete(f'today_term_{target_date}')
+        logger.info(f"Activated prefetched daily term for {target_date}: {daily_term.term}")
+        return daily_term
+    
+    def prefetch_terms(self, days: int = None, start_date: date = None) -> Dict[str, int]:
+        """
+        预生成未来几天的名词（prefetched状态），按领域轮换计划逐日生成
+
+        默认从明天开始；已有记录（任何状态）的日期跳过，单个日期失败
+        不影响后续日期，下次运行时会再次尝试。
+        """
+        days = self.PREFETCH_DAYS if days is None else days
+        start_date = start_date or timezone.now().date() + timedelta(days=1)
+        target_dates = [start_date + timedelta(days=offset) for offset in range(days)]
+        
+        existing_dates = set(DailyTerm.objects.filter(
+            display_date__in=target_dates
+        ).values_list('display_date', flat=True))
+        
+        result = {'generated': 0, 'skipped': len(existing_dates), 'failed': 0}
+        for target_date in target_dates:
+            if target_date in existing_dates:
+                continue
+            daily_term = self._create_term(target_date, status='prefetched')
+            if daily_term:
+                self.prepare_chat_content(daily_term)
+                result['generated'] += 1
+            else:
+                result['failed'] += 1
+        
+        logger.info(
+            f"Term prefetch: {result['generated']} generated, {result['skipped']} already present, "
+            f"{result['failed']} failed"
+        )
+        return result
+    
+    def _create_term(self, target_date: date, status: str) -> Optional[DailyTerm]:
+        """调用API生成指定日期的名词并保存"""
         for attempt in range(self.max_retry_attempts):
-            logger.info(f"Attempting to generate daily term (attempt {attempt + 1})")
+            logger.info(f"Attempting to generate daily term for {target_date} (attempt {attempt + 1})")
             
             # 获取名词（基于指定日期的领域）
             term = self.api_client.get_computer_term(target_date)
@@ -391,24 +439,57 @@ class DailyTermService:
                     difficulty_level=explanation_data['difficulty'],
                     extended_info=explanation_data['extended_info'],
                     display_date=target_date,
-                    status='active',
+                    status=status,
                     api_source='kimi',
                     api_request_time=timezone.now()
                 )
                 
-                # 添加到历史记录
+                # 添加到历史记录（预生成时即占用，避免后续日期重复）
                 TermHistory.add_term(term, target_date)
                 
-                logger.info(f"Successfully generated daily term: {term}")
+                logger.info(f"Successfully generated daily term for {target_date}: {term}")
                 return daily_term
                 
             except Exception as e:
                 logger.error(f"Failed to create daily term record: {e}")
                 continue
         
-        logger.error(f"Failed to generate daily term after {self.max_retry_attempts} attempts")
+        logger.error(f"Failed to generate daily term for {target_date} after {self.max_retry_attempts} attempts")
         return None
     
+    def prepare_chat_content(self, daily_term: DailyTerm) -> bool:
+        """
+        预生成名词的聊天推荐问题和开场内容，保存到extended_info
+
+        AI生成失败时不保存，接口返回默认问题，下次运行生成流程时重试。
+        """
+        from .glm_chatbot_service import GLMChatbotService
+
+        try:
+            result = GLMChatbotService().get_suggested_questions(daily_term.term, daily_term.explanation)
+        except Exception as e:
+            logger.error(f"Failed to prepare chat content for '{daily_term.term}': {e}")
+            return False
+
+        if result.get('is_default'):
+            logger.warning(f"Suggested questions unavailable for '{daily_term.term}', will retry later")
+            return False
+
+        # 开场内容取解释的第一句话作为要点
+        summary = re.split(r'(?<=[。！？!?])', daily_term.explanation.strip(), maxsplit=1)[0][:120]
+
+        extended_info = dict(daily_term.extended_info or {})
+        extended_info['suggested_questions'] = result['questions']
+        extended_info['chat_quick_start'] = {
+            'welcome': f'你可以问我任何关于"{daily_term.term}"的问题，我会尽力为你解答！',
+            'summary': summary,
+        }
+        daily_term.extended_info = extended_info
+        daily_term.save(update_fields=['extended_info'])
+
+        logger.info(f"Prepared {len(result['questions'])} suggested questions for '{daily_term.term}'")
+        return True
+
     def _clean_term(self, term: str) -> Optional[str]:
         """清理和验证名词"""
         if not term:
@@ -3,7 +3,6 @@
 负责调用AI API生成练习题
 """
 
-import requests
 import json
 import logging
 import random
@@ -13,12 +12,28 @@ from django.utils import timezone
 
 from ..models import AIExerciseSession
 from .agent_quality_monitor import quality_monitor
+from .llm_transport import llm_transport
+from .answer_grader import answer_grader
 
 logger = logging.getLogger(__name__)
 
 
 class ExerciseGeneratorClient:
     """练习生成AI客户端"""
+
+    # 知识点相关的提示
+    KNOWLEDGE_PROMPTS = {
+        'hamming-code': '海明码编码解码，包括校验位计算、错误检测与纠正',
+        'crc-check': 'CRC循环冗余检验，包括多项式除法、校验码计算',
+        'single-linklist': '单链表操作，包括插入、删除、查找、遍历',
+        'graph-dfs': '图的深度优先搜索，包括遍历过程、递归实现、应用场景',
+        'binary-search-tree': '二叉搜索树，包括插入、删除、查找操作',
+        'quick-sort': '快速排序算法，包括分治思想、划分过程',
+        'hash-table': '哈希表，包括哈希函数、冲突解决',
+        'dynamic-programming': '动态规划，包括状态转移、最优子结构'
+    }
+
+    DIFFICULTIES = ('easy', 'medium', 'hard')
     
     def __init__(self):
         self.api_key = getattr(settings, 'KIMI_API_KEY', '')
@@ -33,11 +48,6 @@ class ExerciseGeneratorClient:
             logger.error("AI API key not configured")
             return None
         
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {self.api_key}'
-        }
-        
         data = {
             'model': self.model,
             'messages': messages,
@@ -45,29 +55,10 @@ class ExerciseGeneratorClient:
             'temperature': 0.7
         }
         
-        for attempt in range(self.max_retries):
-            try:
-                response = requests.post(
-                    self.base_url,
-                    headers=headers,
-                    json=data,
-                    timeout=self.timeout
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result['choices'][0]['message']['content'].strip()
-                else:
-                    logger.warning(f"API request failed with status {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                logger.error(f"API request error (attempt {attempt + 1}): {e}")
-                
-            if attempt < self.max_retries - 1:
-                import time
-                time.sleep(2 ** attempt)  # 指数退避
-        
-        return None
+        return llm_transport.chat_completion(
+            'kimi', self.base_url, self.api_key, data,
+            timeout=self.timeout, max_retries=self.max_retries
+        )
     
     def generate_exercises(self, knowledge_point: str, difficulty: str = 'medium', count: int = 5) -> Optional[List[Dict]]:
         """生成练习题"""
@@ -114,18 +105,7 @@ class ExerciseGeneratorClient:
         """构建练习题生成提示词"""
         
         # 知识点相关的提示
-        knowledge_prompts = {
-            'hamming-code': '海明码编码解码，包括校验位计算、错误检测与纠正',
-            'crc-check': 'CRC循环冗余检验，包括多项式除法、校验码计算',
-            'single-linklist': '单链表操作，包括插入、删除、查找、遍历',
-            'graph-dfs': '图的深度优先搜索，包括遍历过程、递归实现、应用场景',
-            'binary-search-tree': '二叉搜索树，包括插入、删除、查找操作',
-            'quick-sort': '快速排序算法，包括分治思想、划分过程',
-            'hash-table': '哈希表，包括哈希函数、冲突解决',
-            'dynamic-programming': '动态规划，包括状态转移、最优子结构'
-        }
-        
-        knowledge_desc = knowledge_prompts.get(knowledge_point, knowledge_point)
+        knowledge_desc = self.KNOWLEDGE_PROMPTS.get(knowledge_point, knowledge_point)
         
         # 难度相关的提示
         difficulty_prompts = {
@@ -272,19 +252,22 @@ class ExerciseGeneratorService:
             logger.error(f"Failed to generate exercises for {knowledge_point}")
             return None
         
-        # 创建练习会话
-        session = AIExerciseSession.objects.create(
+        session = self.create_session(user, knowledge_point, difficulty, exercises)
+        
+        # 记录日志
+        logger.info(f"Generated exercise session {session.id} for {knowledge_point}")
+        
+        return session
+
+    def create_session(self, user, knowledge_point: str, difficulty: str, exercises: List[Dict]) -> AIExerciseSession:
+        """用已生成的题目创建练习会话"""
+        return AIExerciseSession.objects.create(
             user=user,
             knowledge_point=knowledge_point,
             exercises=exercises,
             total_questions=len(exercises),
             difficulty_level=difficulty
         )
-        
-        # 记录日志
-        logger.info(f"Generated exercise session {session.id} for {knowledge_point}")
-        
-        return session
 
     def submit_answers(self, session_id: int, answers: List[str]) -> Optional[AIExerciseSession]:
         """提交答案并计算得分"""
@@ -334,10 +317,16 @@ class ExerciseGeneratorService:
             }
             
             # 添加每道题的详细信息
-            for i, exercise in enumerate(session.exercises):
-                user_answer = session.user_answers[i] if i < len(session.user_answers) else ''
+            user_answers = [
+                session.user_answers[i] if i < len(session.user_answers) else ''
+                for i in range(len(session.exercises))
+            ]
+            verdicts = answer_grader.grade_many(
+                (exercise.get('type', 'choice'), exercise.get('answer', ''), user_answer)
+                for exercise, user_answer in zip(session.exercises, user_answers)
+            )
+            for exercise, user_answer, is_correct in zip(session.exercises, user_answers, verdicts):
                 correct_answer = exercise.get('answer', '')
-                is_correct = str(user_answer).strip().lower() == str(correct_answer).strip().lower()
                 
                 exercise_detail = {
                     'question': exercise.get('question', ''),
@@ -0,0 +1,210 @@
+"""
+AI练习生成任务队列
+生成请求写入数据库后立即返回任务ID，由 run_exercise_worker 命令启动的工作进程领取执行，
+相同参数（知识点、难度、题量）的任务在执行期间只调用一次AI，结果分发给所有等待的用户
+"""
+
+import logging
+import os
+import socket
+import time
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import ExerciseGenerationJob
+from .exercise_generator_service import ExerciseGeneratorService
+
+logger = logging.getLogger(__name__)
+
+
+class ExerciseJobQueue:
+    """练习生成任务队列"""
+
+    MAX_ATTEMPTS = 3
+    MAX_COUNT = 20
+    STALE_AFTER = timedelta(minutes=5)  # 超过该时间仍在执行视为工作进程已退出
+    IN_FLIGHT = ('pending', 'running')
+
+    def __init__(self):
+        self.service = ExerciseGeneratorService()
+
+    def enqueue(self, user, knowledge_point: str, difficulty: str = 'medium', count: int = 5) -> ExerciseGenerationJob:
+        """创建生成任务，相同参数的任务正在排队或执行时合并到该任务"""
+        knowledge_point = knowledge_point.strip()
+        count = min(max(int(count), 1), self.MAX_COUNT)
+
+        leader = ExerciseGenerationJob.objects.filter(
+            knowledge_point=knowledge_point,
+            difficulty=difficulty,
+            count=count,
+            status__in=self.IN_FLIGHT,
+            duplicate_of__isnull=True,
+        ).order_by('created_at').first()
+
+        job = ExerciseGenerationJob.objects.create(
+            user=user,
+            knowledge_point=knowledge_point,
+            difficulty=difficulty,
+            count=count,
+            duplicate_of=leader,
+        )
+        if leader:
+            logger.info(f"Exercise job {job.id} merged into in-flight job {leader.id}")
+        return job
+
+    def recover_stale(self) -> int:
+        """将长时间未完成的任务重新放回队列，超过重试次数的标记为失败"""
+        deadline = timezone.now() - self.STALE_AFTER
+        stale = ExerciseGenerationJob.objects.filter(status='running', started_at__lt=deadline)
+
+        failed = stale.filter(attempts__gte=self.MAX_ATTEMPTS)
+        for job in failed:
+            self._fail(job, '生成超时，请稍后重试')
+
+        # 合并到的任务已结束但自身仍在排队（结束瞬间才合并进来），改为独立执行
+        ExerciseGenerationJob.objects.filter(
+            status='pending', duplicate_of__isnull=False
+        ).exclude(duplicate_of__status__in=self.IN_FLIGHT).update(duplicate_of=None)
+
+        return stale.filter(attempts__lt=self.MAX_ATTEMPTS).update(status='pending', worker='')
+
+    def claim_next(self, worker: str) -> Optional[ExerciseGenerationJob]:
+        """
+        领取一个待执行任务
+
+        使用条件更新实现乐观领取：只有把状态从pending改为running成功的进程
+        才能执行该任务，不依赖数据库的行锁支持。
+        """
+        candidates = ExerciseGenerationJob.objects.filter(
+            status='pending', duplicate_of__isnull=True
+        ).order_by('created_at').values_list('id', flat=True)[:5]
+
+        for job_id in candidates:
+            claimed = ExerciseGenerationJob.objects.filter(id=job_id, status='pending').update(
+                status='running',
+                worker=worker,
+                started_at=timezone.now(),
+                attempts=F('attempts') + 1,
+            )
+            if claimed:
+                return ExerciseGenerationJob.objects.select_related('user').get(id=job_id)
+        return None
+
+    def run_job(self, job: ExerciseGenerationJob) -> bool:
+        """执行任务，为任务本身和合并进来的任务分别创建练习会话"""
+        try:
+            exercises = self.service.client.generate_exercises(job.knowledge_point, job.difficulty, job.count)
+        except Exception as e:
+            logger.error(f"Exercise job {job.id} raised: {e}", exc_info=True)
+            exercises = None
+
+        if not exercises:
+            self._retry_or_fail(job)
+            return False
+
+        now = timezone.now()
+        with transaction.atomic():
+            for member in [job, *job.duplicates.select_related('user')]:
+                member.session = self.service.create_session(
+                    member.user, member.knowledge_point, member.difficulty, exercises
+                )
+                member.status = 'completed'
+                member.finished_at = now
+                member.save(update_fields=['session', 'status', 'finished_at'])
+
+        logger.info(f"Exercise job {job.id} completed with {len(exercises)} exercises")
+        return True
+
+    def _retry_or_fail(self, job: ExerciseGenerationJob):
+        """执行失败时重新排队，超过重试次数标记为失败"""
+        if job.attempts < self.MAX_ATTEMPTS:
+            ExerciseGenerationJob.objects.filter(id=job.id).update(status='pending', worker='')
+            logger.warning(f"Exercise job {job.id} failed (attempt {job.attempts}), requeued")
+        else:
+            self._fail(job, '生成练习题失败，请稍后重试')
+
+    def _fail(self, job: ExerciseGenerationJob, message: str):
+        now = timezone.now()
+        ExerciseGenerationJob.objects.filter(id=job.id).update(status='failed', error_message=message, finished_at=now)
+        job.duplicates.update(status='failed', error_message=message, finished_at=now)
+
+    def get_status(self, job_id: int, user) -> Optional[Dict[str, Any]]:
+        """查询任务状态，完成时附带练习数据（与同步生成接口的返回格式一致）"""
+        job = ExerciseGenerationJob.objects.filter(id=job_id, user=user).select_related(
+            'session', 'duplicate_of'
+        ).first()
+        if job is None:
+            return None
+
+        status = job.status
+        if status == 'pending' and job.duplicate_of and job.duplicate_of.status == 'running':
+            status = 'running'
+
+        result = {
+            'job_id': job.id,
+            'status': status,
+            'error': job.error_message,
+        }
+        if job.status == 'completed' and job.session:
+            session = job.session
+            result['data'] = {
+                'session_id': session.id,
+                'knowledge_point': session.knowledge_point,
+                'total_questions': session.total_questions,
+                'exercises': session.exercises,
+                'started_at': session.started_at.isoformat(),
+            }
+        return result
+
+    def run_worker(self, worker: str = None, poll_interval: float = 1.0, max_jobs: int = None, stop_event=None) -> int:
+        """
+        工作进程主循环
+
+        Args:
+            worker: 工作进程名称，默认使用主机名和进程ID
+            poll_interval: 队列为空时的轮询间隔（秒）
+            max_jobs: 执行指定数量的任务后退出，None表示一直运行
+            stop_event: 外部停止信号（multiprocessing.Event）
+
+        Returns:
+            执行的任务数
+        """
+        worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+        processed = 0
+        logger.info(f"Exercise worker {worker} started")
+
+        while not (stop_event and stop_event.is_set()):
+            close_old_connections()
+            job = None
+            try:
+                self.recover_stale()
+                job = self.claim_next(worker)
+                if job is None:
+                    time.sleep(poll_interval)
+                    continue
+                self.run_job(job)
+            except Exception as e:
+                # 数据库暂时不可用（如SQLite写锁）时不退出进程，已领取的任务放回队列
+                logger.error(f"Exercise worker {worker} error: {e}", exc_info=True)
+                if job is not None:
+                    try:
+                        self._retry_or_fail(job)
+                    except Exception:
+                        logger.error(f"Failed to release exercise job {job.id}, it will be recovered when stale")
+                time.sleep(poll_interval)
+                continue
+
+            processed += 1
+            if max_jobs and processed >= max_jobs:
+                break
+
+        logger.info(f"Exercise worker {worker} stopped after {processed} jobs")
+        return processed
+
+
+# 全局实例
+exercise_job_queue = ExerciseJobQueue()
@@ -0,0 +1,128 @@
+"""
+预生成练习题池
+知识点与难度的组合有限，定时任务按(知识点, 难度)预先生成并经过质量检查的题目存入题池，
+练习请求直接从题池取用未使用的题目，题池不足时才进入AI生成队列
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from ..models import PooledExercise
+from .exercise_generator_service import ExerciseGeneratorClient
+
+logger = logging.getLogger(__name__)
+
+
+class ExercisePool:
+    """练习题池"""
+
+    TARGET_SIZE = 15          # 每个(知识点, 难度)保持的可用题目数
+    BATCH_SIZE = 5            # 每次调用AI生成的题目数
+    MAX_BATCHES_PER_RUN = 12  # 单次补充最多调用AI的次数，避免集中消耗额度
+    USED_RETENTION = timedelta(days=7)
+
+    def __init__(self):
+        self.client = ExerciseGeneratorClient()
+
+    @staticmethod
+    def fingerprint(exercise: Dict) -> str:
+        """题干摘要，用于避免同一题目重复入池"""
+        question = ''.join(str(exercise.get('question', '')).split()).lower()
+        return hashlib.sha1(question.encode('utf-8')).hexdigest()
+
+    def available_count(self, knowledge_point: str, difficulty: str) -> int:
+        return PooledExercise.objects.filter(
+            knowledge_point=knowledge_point, difficulty=difficulty, used_at__isnull=True
+        ).count()
+
+    def draw(self, knowledge_point: str, difficulty: str, count: int) -> Optional[List[Dict]]:
+        """
+        取出count道未使用的题目，题池不足时返回None
+
+        先读出候选题目，再用条件更新标记为已使用；并发请求抢到同一批题目时
+        更新行数不足，回滚后重新选取。
+        """
+        available = PooledExercise.objects.filter(
+            knowledge_point=knowledge_point, difficulty=difficulty, used_at__isnull=True
+        )
+
+        for _ in range(3):
+            rows = list(available.values('id', 'exercise')[:count])
+            if len(rows) < count:
+                return None
+
+            with transaction.atomic():
+                claimed = PooledExercise.objects.filter(
+                    id__in=[row['id'] for row in rows], used_at__isnull=True
+                ).update(used_at=timezone.now())
+                if claimed == count:
+                    return [row['exercise'] for row in rows]
+                transaction.set_rollback(True)
+
+        return None
+
+    def add(self, knowledge_point: str, difficulty: str, exercises: Iterable[Dict]) -> int:
+        """题目入池（已在生成时通过格式与质量检查），返回新增数量"""
+        before = self.available_count(knowledge_point, difficulty)
+        PooledExercise.objects.bulk_create([
+            PooledExercise(
+                knowledge_point=knowledge_point,
+                difficulty=difficulty,
+                exercise=exercise,
+                fingerprint=self.fingerprint(exercise),
+            )
+            for exercise in exercises
+        ], ignore_conflicts=True)
+        return self.available_count(knowledge_point, difficulty) - before
+
+    def pool_keys(self) -> List[Tuple[str, str]]:
+        """
+        需要维护的(知识点, 难度)组合，只包含内置的知识点和难度
+
+        生成接口只接受这些组合，用户提交的任意字符串不会进入定时补充，避免无上限地消耗AI额度。
+        """
+        return sorted(
+            (knowledge_point, difficulty)
+            for knowledge_point in ExerciseGeneratorClient.KNOWLEDGE_PROMPTS
+            for difficulty in ExerciseGeneratorClient.DIFFICULTIES
+        )
+
+    def refill(self, max_batches: int = None) -> Dict[str, int]:
+        """补充题池，优先补充缺口最大的组合"""
+        max_batches = self.MAX_BATCHES_PER_RUN if max_batches is None else max_batches
+
+        # 清理已使用较久的题目
+        purged, _ = PooledExercise.objects.filter(
+            used_at__lt=timezone.now() - self.USED_RETENTION
+        ).delete()
+
+        deficits = sorted(
+            ((self.TARGET_SIZE - self.available_count(kp, diff), kp, diff) for kp, diff in self.pool_keys()),
+            reverse=True,
+        )
+
+        batches = added = 0
+        for deficit, knowledge_point, difficulty in deficits:
+            while deficit > 0 and batches < max_batches:
+                batches += 1
+                exercises = self.client.generate_exercises(knowledge_point, difficulty, self.BATCH_SIZE)
+                if not exercises:
+                    logger.warning(f"Exercise pool refill failed for {knowledge_point}/{difficulty}")
+                    break
+                new = self.add(knowledge_point, difficulty, exercises)
+                added += new
+                deficit -= new
+                if new == 0:
+                    break  # 全部与池中题目重复，换下一个组合
+
+        logger.info(f"Exercise pool refill: {batches} batches, {added} added, {purged} purged")
+        return {'batches': batches, 'added': added, 'purged': purged}
+
+
+# 全局实例
+exercise_pool = ExercisePool()
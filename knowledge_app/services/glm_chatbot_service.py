@@ -3,13 +3,15 @@ GLM4.5 聊天机器人服务
 专门用于每日名词解释的智能问答
 """
 
-import requests
 import json
 import logging
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.utils import timezone
 from .agent_quality_monitor import quality_monitor
+from .llm_transport import llm_transport, RETRYABLE_STATUS
+from .ai_response_cache import ai_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -30,48 +32,103 @@ class GLMChatbotClient:
             logger.error("GLM API key not configured")
             return None
         
+        data = {
+            'model': self.model,
+            'messages': messages,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'stream': False
+        }
+        
+        return llm_transport.chat_completion(
+            'glm', self.base_url, self.api_key, data,
+            timeout=self.timeout, max_retries=self.max_retries
+        )
+
+    async def stream_request(self, messages: List[Dict], max_tokens: int = 1000, temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        以流式方式发送API请求，逐段产出模型生成的文本
+
+        与_make_request不同，这里不做重试和退避：首个token到达前失败直接结束，
+        由调用方决定如何降级，避免长时间占用连接。
+        """
+        if not self.api_key:
+            logger.error("GLM API key not configured")
+            return
+
+        import aiohttp
+
+        # 与非流式请求共用长连接、并发名额和熔断状态，服务商不可用时直接降级
+        transport = llm_transport.get('glm')
+        if not transport.breaker.allow_request():
+            logger.warning("GLM circuit open, skipping stream request")
+            return
+
         headers = {
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {self.api_key}'
         }
-        
+
         data = {
             'model': self.model,
             'messages': messages,
             'max_tokens': max_tokens,
             'temperature': temperature,
-            'stream': False
+            'stream': True
         }
-        
-        for attempt in range(self.max_retries):
+
+        # 流式响应不限制总时长，只限制连接建立和两次数据之间的间隔
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=self.timeout)
+
+        # 半开状态下这可能是唯一的试探请求，每条退出路径都要结算熔断状态；
+        # 客户端断开导致的取消不代表服务商故障，只交还试探名额
+        reachable = None
+        try:
+            if not await transport.acquire_async():
+                logger.warning("GLM concurrency limit reached, stream request dropped")
+                return
+
             try:
-                response = requests.post(
-                    self.base_url,
-                    headers=headers,
-                    json=data,
-                    timeout=self.timeout
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'choices' in result and len(result['choices']) > 0:
-                        return result['choices'][0]['message']['content'].strip()
-                    else:
-                        logger.warning(f"Unexpected response format: {result}")
-                else:
-                    logger.warning(f"GLM API request failed with status {response.status_code}: {response.text}")
-                    
-            except requests.exceptions.RequestException as e:
-                logger.error(f"GLM API request error (attempt {attempt + 1}): {e}")
-                
-            if attempt < self.max_retries - 1:
-                import time
-                time.sleep(2 ** attempt)  # 指数退避
-        
-        return None
-    
-    def chat_about_term(self, term: str, term_explanation: str, user_question: str, theme_info: Dict = None) -> Optional[str]:
-        """针对特定名词进行问答"""
+                async with transport.async_session().post(
+                    self.base_url, headers=headers, json=data, timeout=timeout
+                ) as response:
+                    if response.status != 200:
+                        text = await response.text()
+                        logger.warning(f"GLM stream request failed with status {response.status}: {text}")
+                        reachable = response.status not in RETRYABLE_STATUS
+                        return
+
+                    reachable = True
+
+                    async for raw_line in response.content:
+                        line = raw_line.decode('utf-8').strip()
+                        if not line.startswith('data:'):
+                            continue
+
+                        payload = line[len('data:'):].strip()
+                        if payload == '[DONE]':
+                            break
+
+                        try:
+                            chunk = json.loads(payload)
+                            delta = chunk['choices'][0].get('delta', {}).get('content')
+                        except (ValueError, KeyError, IndexError) as e:
+                            logger.warning(f"Unexpected stream chunk: {payload} ({e})")
+                            continue
+
+                        if delta:
+                            yield delta
+            except Exception:
+                if reachable is None:
+                    reachable = False
+                raise
+            finally:
+                transport.release()
+        finally:
+            transport.breaker.settle(reachable)
+
+    def build_term_chat_messages(self, term: str, term_explanation: str, user_question: str, theme_info: Dict = None) -> List[Dict]:
+        """构建名词问答的对话消息"""
 
         # 获取当前领域信息以提供更准确的上下文
         from .domain_scheduler import domain_scheduler
@@ -133,12 +190,21 @@ class GLMChatbotClient:
 - 适当使用比喻和概念性例子
 - 鼓励学生继续学习和思考"""
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_question}
         ]
 
+    def chat_about_term(self, term: str, term_explanation: str, user_question: str, theme_info: Dict = None) -> Optional[str]:
+        """针对特定名词进行问答"""
+        messages = self.build_term_chat_messages(term, term_explanation, user_question, theme_info)
         return self._make_request(messages, max_tokens=500, temperature=0.3)  # 降低temperature减少随机性
+
+    async def stream_chat_about_term(self, term: str, term_explanation: str, user_question: str, theme_info: Dict = None) -> AsyncIterator[str]:
+        """针对特定名词进行流式问答"""
+        messages = self.build_term_chat_messages(term, term_explanation, user_question, theme_info)
+        async for delta in self.stream_request(messages, max_tokens=500, temperature=0.3):
+            yield delta
     
     def get_related_questions(self, term: str, term_explanation: str) -> List[str]:
         """生成与名词相关的推荐问题"""
@@ -287,6 +353,17 @@ class GLMChatbotService:
         if user_id:
             logger.info(f"User {user_id} asked about '{term}': {user_question}")
 
+        # 相同名词、主题下的相似提问直接返回缓存的回答
+        cache_key = self._chat_cache_key(term, term_explanation, user_question, self.current_theme)
+        cached = ai_response_cache.get(cache_key)
+        if cached:
+            return {
+                'success': True,
+                'answer': cached['answer'],
+                'timestamp': timezone.now().isoformat(),
+                'cached': True
+            }
+
         # 获取当前主题信息
         current_theme_info = self.get_current_theme()
 
@@ -312,6 +389,9 @@ class GLMChatbotService:
                         'quality_fallback': True
                     }
 
+            if is_quality_ok:
+                ai_response_cache.set(cache_key, {'answer': answer})
+
             return {
                 'success': True,
                 'answer': answer,
@@ -324,10 +404,77 @@ class GLMChatbotService:
                 'timestamp': timezone.now().isoformat()
             }
     
+    def _chat_cache_key(self, term: str, term_explanation: str, user_question: str, theme_key: str) -> str:
+        """名词问答缓存键：名词 + 解释 + 主题 + 规范化后的问题"""
+        return ai_response_cache.make_key(
+            'term_chat',
+            term,
+            ai_response_cache.fingerprint(term_explanation),
+            theme_key,
+            ai_response_cache.fingerprint(user_question),
+        )
+
+    async def stream_about_term(self, term: str, term_explanation: str, user_question: str, user_id: int = None, theme: str = None) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        流式询问关于名词的问题
+
+        依次产出 ('delta', {'content': ...}) 事件，最后产出一个 'done' 或 'error' 事件。
+        回答已实时展示，质量检查结果随 'done' 事件返回，供前端提示。
+        """
+        theme_key = theme if theme in self.CHATBOT_THEMES else self.current_theme
+        theme_info = self.CHATBOT_THEMES.get(theme_key, self.CHATBOT_THEMES['friendly'])
+
+        if user_id:
+            logger.info(f"User {user_id} asked about '{term}' (stream): {user_question}")
+
+        cache_key = self._chat_cache_key(term, term_explanation, user_question, theme_key)
+        cached = await sync_to_async(ai_response_cache.get)(cache_key)
+        if cached:
+            yield 'delta', {'content': cached['answer']}
+            yield 'done', {
+                'quality_issues': [],
+                'timestamp': timezone.now().isoformat(),
+                'cached': True
+            }
+            return
+
+        parts = []
+        try:
+            async for delta in self.client.stream_chat_about_term(term, term_explanation, user_question, theme_info):
+                parts.append(delta)
+                yield 'delta', {'content': delta}
+        except Exception as e:
+            logger.error(f"GLM stream error: {e}")
+
+        answer = ''.join(parts).strip()
+        if not answer:
+            yield 'error', {
+                'error': 'AI服务暂时不可用，请稍后重试',
+                'timestamp': timezone.now().isoformat()
+            }
+            return
+
+        is_quality_ok, quality_issues = quality_monitor.validate_chat_response_quality(answer, term_explanation)
+        if is_quality_ok:
+            await sync_to_async(ai_response_cache.set)(cache_key, {'answer': answer})
+        else:
+            logger.warning(f"Chat response quality issues: {', '.join(quality_issues)}")
+            quality_monitor.log_quality_issue('chatbot', 'response', quality_issues, answer)
+
+        yield 'done', {
+            'quality_issues': quality_issues,
+            'timestamp': timezone.now().isoformat()
+        }
+
     def get_suggested_questions(self, term: str, term_explanation: str) -> Dict:
         """获取推荐问题"""
-        
-        questions = self.client.get_related_questions(term, term_explanation)
+
+        cache_key = ai_response_cache.make_key('term_suggestions', term, ai_response_cache.fingerprint(term_explanation))
+        questions = ai_response_cache.get(cache_key)
+        if questions is None:
+            questions = self.client.get_related_questions(term, term_explanation)
+            if questions:
+                ai_response_cache.set(cache_key, questions)
         
         if questions:
             return {
@@ -337,13 +484,7 @@ class GLMChatbotService:
             }
         else:
             # 提供默认问题
-            default_questions = [
-                f"{term}的主要作用是什么？",
-                f"{term}在实际项目中如何应用？",
-                f"学习{term}需要什么基础知识？",
-                f"{term}有哪些常见的误区？",
-                f"如何更好地理解{term}这个概念？"
-            ]
+            default_questions = self.get_default_questions(term)
             
             return {
                 'success': True,
@@ -352,6 +493,17 @@ class GLMChatbotService:
                 'is_default': True
             }
     
+    @staticmethod
+    def get_default_questions(term: str) -> List[str]:
+        """AI不可用时的默认推荐问题"""
+        return [
+            f"{term}的主要作用是什么？",
+            f"{term}在实际项目中如何应用？",
+            f"学习{term}需要什么基础知识？",
+            f"{term}有哪些常见的误区？",
+            f"如何更好地理解{term}这个概念？"
+        ]
+
     def is_available(self) -> bool:
         """检查服务是否可用"""
         return bool(self.client.api_key)
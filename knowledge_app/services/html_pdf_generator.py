@@ -4,7 +4,6 @@ HTML转PDF生成器
 """
 
 import os
-import io
 from datetime import datetime
 from django.http import HttpResponse
 from django.template.loader import render_to_string
@@ -94,16 +93,11 @@ class HTMLPDFGenerator:
     
     def create_simple_text_pdf(self, html_content):
         """创建简单的文本PDF（回退方案）"""
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet
-        from reportlab.lib.units import cm
+        from reportlab.platypus import Paragraph, Spacer
+        from .pdf_toolkit import pdf_toolkit
         import re
         
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=2*cm, leftMargin=2*cm, topMargin=2*cm, bottomMargin=2*cm)
-        
-        styles = getSampleStyleSheet()
+        styles = pdf_toolkit.base_styles
         story = []
         
         # 简单解析HTML内容
@@ -126,9 +120,7 @@ class HTMLPDFGenerator:
                     logger.warning(f"Skipped paragraph due to encoding issue: {e}")
                     continue
         
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_toolkit.render(story)
     
     def create_pdf_response(self, pdf_content, filename):
         """创建PDF响应"""
@@ -0,0 +1,187 @@
+"""
+题库复制服务
+按批次使用bulk_create复制题目及其标签关联（不支持返回批量插入主键的数据库逐条插入题目），大题库在后台线程中复制并记录进度；
+复制线程随进程退出而中断时，由定时任务将长时间没有进度的复制重新执行
+"""
+
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, List, Optional
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from ..personal_quiz_models import QuizLibrary, QuizQuestion, LibraryCopy, LibraryShare
+
+logger = logging.getLogger(__name__)
+
+
+class LibraryCopyService:
+    """题库批量复制服务"""
+
+    CHUNK_SIZE = 200
+    ASYNC_THRESHOLD = 200  # 超过该题目数时转为后台复制
+    STALE_AFTER = timedelta(minutes=10)  # 超过该时间没有进度视为复制线程已退出
+
+    COPY_FIELDS = [
+        'title', 'content', 'question_type', 'options',
+        'correct_answer', 'explanation', 'difficulty',
+    ]
+
+    def copy_shared_library(self, share: LibraryShare, user) -> LibraryCopy:
+        """
+        复制分享的题库
+
+        小题库在当前请求内同步复制完成；大题库创建空题库和复制记录后
+        立即返回，题目在后台线程中分批复制，进度写入LibraryCopy。
+        """
+        total = share.library.questions.filter(is_active=True).count()
+
+        if total <= self.ASYNC_THRESHOLD:
+            with transaction.atomic():
+                copy_record = self._create_copy_record(share, user, total)
+                self._copy_questions(copy_record)
+            return copy_record
+
+        copy_record = self._create_copy_record(share, user, total)
+        thread = threading.Thread(target=self._run_in_background, args=(copy_record.id,), daemon=True)
+        transaction.on_commit(thread.start)
+        return copy_record
+
+    def _create_copy_record(self, share: LibraryShare, user, total: int) -> LibraryCopy:
+        """创建新题库及复制记录"""
+        original_library = share.library
+        new_library = QuizLibrary.objects.create(
+            owner=user,
+            name=f"{original_library.name} (副本)",
+            description=f"复制自 {share.shared_by.username} 的题库：{original_library.description}",
+        )
+        return LibraryCopy.objects.create(
+            original_library=original_library,
+            copied_library=new_library,
+            copied_by=user,
+            share=share,
+            status='running',
+            total_questions=total,
+        )
+
+    def _run_in_background(self, copy_id: int):
+        """后台线程入口"""
+        try:
+            self._run_copy(copy_id)
+        finally:
+            connection.close()
+
+    def _run_copy(self, copy_id: int):
+        """执行复制，失败时清理已复制的题目并记录原因"""
+        copy_record = LibraryCopy.objects.select_related('original_library', 'copied_library').get(id=copy_id)
+        try:
+            self._copy_questions(copy_record)
+        except Exception as e:
+            logger.error(f"Background library copy {copy_id} failed: {e}", exc_info=True)
+            # 清理部分复制的题目，保留复制记录以便查看失败原因
+            copy_record.copied_library.questions.all().delete()
+            copy_record.copied_library.is_active = False
+            copy_record.copied_library.save(update_fields=['is_active'])
+            copy_record.status = 'failed'
+            copy_record.error_message = str(e)
+            copy_record.save(update_fields=['status', 'error_message', 'updated_at'])
+
+    def recover_stale(self) -> int:
+        """
+        重新执行长时间没有进度的后台复制
+
+        已复制的部分题目先删除，再从头复制；通过条件更新认领记录，
+        多个进程同时执行时每条记录只会被恢复一次。返回恢复的记录数。
+        """
+        cutoff = timezone.now() - self.STALE_AFTER
+        stale_ids = list(LibraryCopy.objects.filter(
+            status='running', updated_at__lt=cutoff
+        ).values_list('id', flat=True))
+
+        recovered = 0
+        for copy_id in stale_ids:
+            claimed = LibraryCopy.objects.filter(
+                id=copy_id, status='running', updated_at__lt=cutoff
+            ).update(copied_questions=0, updated_at=timezone.now())
+            if not claimed:
+                continue
+
+            copy_record = LibraryCopy.objects.select_related('copied_library').get(id=copy_id)
+            copy_record.copied_library.questions.all().delete()
+            logger.warning(f"Restarting stale library copy {copy_id}")
+            self._run_copy(copy_id)
+            recovered += 1
+        return recovered
+
+    def _copy_questions(self, copy_record: LibraryCopy):
+        """分批复制题目和标签关联"""
+        source = copy_record.original_library.questions.filter(is_active=True).order_by('id')
+        target_library = copy_record.copied_library
+        through = QuizQuestion.tags.through
+
+        last_id = 0
+        copied = 0
+        while True:
+            rows = list(source.filter(id__gt=last_id).values('id', *self.COPY_FIELDS)[:self.CHUNK_SIZE])
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+
+            with transaction.atomic():
+                new_ids = self._bulk_create_questions(target_library, rows)
+                id_map = {row['id']: new_id for row, new_id in zip(rows, new_ids)}
+
+                tag_links = through.objects.filter(
+                    quizquestion_id__in=list(id_map)
+                ).values_list('quizquestion_id', 'quiztag_id')
+                through.objects.bulk_create(
+                    [through(quizquestion_id=id_map[qid], quiztag_id=tag_id) for qid, tag_id in tag_links],
+                    batch_size=self.CHUNK_SIZE,
+                )
+
+            copied += len(rows)
+            LibraryCopy.objects.filter(id=copy_record.id).update(copied_questions=copied, updated_at=timezone.now())
+
+        # 题目通过bulk_create插入不会触发save()，最后统一更新题目数量
+        target_library.update_question_count()
+
+        copy_record.copied_questions = copied
+        copy_record.status = 'completed'
+        copy_record.save(update_fields=['copied_questions', 'status', 'updated_at'])
+        logger.info(f"Copied {copied} questions into library {target_library.id}")
+
+    def _bulk_create_questions(self, library: QuizLibrary, rows: List[Dict]) -> List[int]:
+        """批量插入题目，返回与rows顺序一致的新题目ID"""
+        questions = [
+            QuizQuestion(library=library, **{field: row[field] for field in self.COPY_FIELDS})
+            for row in rows
+        ]
+        if connection.features.can_return_rows_from_bulk_insert:
+            QuizQuestion.objects.bulk_create(questions)
+        else:
+            # 数据库不支持返回批量插入的主键（如MySQL）时逐条插入，每道题都能拿到自己的ID，
+            # 不依赖自增顺序推测（并发写入同一题库时会错位）；
+            # 直接调用Model.save跳过QuizQuestion.save中的题目数量更新，复制完成后统一更新
+            for question in questions:
+                models.Model.save(question)
+        return [q.pk for q in questions]
+
+    def get_progress(self, copy_id: int, user) -> Optional[Dict]:
+        """获取复制进度"""
+        copy_record = LibraryCopy.objects.filter(id=copy_id, copied_by=user).first()
+        if not copy_record:
+            return None
+        return {
+            'copy_id': copy_record.id,
+            'library_id': copy_record.copied_library_id,
+            'status': copy_record.status,
+            'total_questions': copy_record.total_questions,
+            'copied_questions': copy_record.copied_questions,
+            'progress': copy_record.progress_rate,
+            'error': copy_record.error_message,
+        }
+
+
+# 全局实例
+library_copy_service = LibraryCopyService()
@@ -0,0 +1,293 @@
+"""
+大模型API共享传输层
+所有AI服务（每日名词、智能问答、练习生成、错题分析）共用一组长连接池：
+按服务商限制并发，失败时带抖动的指数退避重试，服务商持续不可用时熔断快速失败，
+避免每次调用重新握手以及工作线程被失效的服务商长时间阻塞
+"""
+
+import asyncio
+import importlib.util
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+try:
+    import httpx
+    # httpx的HTTP/2支持依赖h2，这里只检查是否已安装
+    HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 可重试的HTTP状态码：限流与服务端错误
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+DEFAULT_PROVIDER_CONFIG = {
+    'max_concurrency': 8,      # 同时进行的请求数上限
+    'pool_size': 8,            # 每个服务商保持的长连接数
+    'acquire_timeout': 30,     # 等待并发名额的最长时间（秒）
+    'max_retries': 3,
+    'backoff_base': 1.0,
+    'backoff_max': 8.0,
+    'failure_threshold': 5,    # 连续失败多少次后熔断
+    'recovery_timeout': 30,    # 熔断后多久允许试探请求（秒）
+}
+
+
+class CircuitBreaker:
+    """熔断器：连续失败达到阈值后打开，冷却后放行一个试探请求"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """是否允许发起请求"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                # 冷却结束，只放行一个试探请求
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """试探请求没有得到结论（未发出或被取消）时交还名额，下一个请求可以重新试探"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def settle(self, reachable: Optional[bool]):
+        """
+        根据请求结果结算熔断状态，每个被放行的请求都必须调用一次
+
+        reachable为True表示服务商可达（包括不可重试的4xx），False表示失败，
+        None表示请求未真正完成。
+        """
+        if reachable is None:
+            self.release_probe()
+        elif reachable:
+            self.record_success()
+        else:
+            self.record_failure()
+
+
+class ProviderTransport:
+    """单个服务商的连接池、并发限制与熔断状态"""
+
+    def __init__(self, name: str, **config):
+        self.name = name
+        self.config = {**DEFAULT_PROVIDER_CONFIG, **config}
+        self.breaker = CircuitBreaker(self.config['failure_threshold'], self.config['recovery_timeout'])
+        self._semaphore = threading.BoundedSemaphore(self.config['max_concurrency'])
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._async_sessions: Dict[Any, Any] = {}
+
+    @property
+    def client(self):
+        """延迟创建长连接客户端，HTTP/2可用时优先使用"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._build_client()
+        return self._client
+
+    def _build_client(self):
+        pool_size = self.config['pool_size']
+        if HTTP2_AVAILABLE:
+            return httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            )
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def async_session(self):
+        """
+        当前事件循环的长连接会话（aiohttp）
+
+        aiohttp会话绑定创建它的事件循环，因此按事件循环缓存；已关闭事件循环的会话会被清理。
+        """
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        for stale_loop in [l for l in self._async_sessions if l.is_closed()]:
+            self._async_sessions.pop(stale_loop)
+
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.config['pool_size'])
+            session = aiohttp.ClientSession(connector=connector)
+            self._async_sessions[loop] = session
+        return session
+
+    async def close_async_session(self):
+        """关闭当前事件循环的会话"""
+        session = self._async_sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    async def acquire_async(self) -> bool:
+        """
+        在事件循环中等待并发名额
+
+        与同步请求共用同一个信号量，用非阻塞获取加短暂休眠轮询，避免阻塞事件循环；
+        被取消时不会占用名额。
+        """
+        deadline = time.monotonic() + self.config['acquire_timeout']
+        while not self._semaphore.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    def release(self):
+        self._semaphore.release()
+
+    def _post(self, url: str, headers: Dict, payload: Dict, timeout: float) -> Tuple[int, Any]:
+        """发送一次POST请求，返回(状态码, 响应体)"""
+        response = self.client.post(url, headers=headers, json=payload, timeout=timeout)
+        if response.status_code == 200:
+            return response.status_code, response.json()
+        return response.status_code, response.text
+
+    def _backoff(self, attempt: int) -> float:
+        """带抖动的指数退避：在[delay/2, delay]之间随机，避免多个工作线程同时重试"""
+        delay = min(self.config['backoff_max'], self.config['backoff_base'] * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def post_json(self, url: str, headers: Dict, payload: Dict, timeout: float = 30,
+                  max_retries: Optional[int] = None) -> Optional[Dict]:
+        """
+        发送JSON请求并返回解析后的响应
+
+        限流和服务端错误会重试；熔断打开或等待并发名额超时时直接返回None。
+        """
+        if max_retries is None:
+            max_retries = self.config['max_retries']
+        network_errors = (requests.exceptions.RequestException, ValueError)
+        if HTTP2_AVAILABLE:
+            network_errors += (httpx.HTTPError,)
+
+        for attempt in range(max_retries):
+            if not self.breaker.allow_request():
+                logger.warning(f"{self.name} circuit open, skipping request")
+                return None
+
+            # 半开状态下只有这一个试探请求被放行，因此每条退出路径都要结算熔断状态
+            reachable = None
+            retryable = True
+            try:
+                if not self._semaphore.acquire(timeout=self.config['acquire_timeout']):
+                    logger.warning(f"{self.name} concurrency limit reached, request dropped")
+                    return None
+
+                try:
+                    reachable = False
+                    status, body = self._post(url, headers, payload, timeout)
+                    if status == 200:
+                        reachable = True
+                        return body
+
+                    logger.warning(f"{self.name} API request failed with status {status}: {str(body)[:200]}")
+                    retryable = status in RETRYABLE_STATUS
+                    # 不可重试的状态码（如400）说明服务商可达，问题在请求本身
+                    reachable = not retryable
+                except network_errors as e:
+                    logger.error(f"{self.name} API request error (attempt {attempt + 1}): {e}")
+                finally:
+                    self._semaphore.release()
+            finally:
+                self.breaker.settle(reachable)
+
+            if not retryable:
+                return None
+            if attempt < max_retries - 1:
+                time.sleep(self._backoff(attempt))
+
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'provider': self.name,
+            'http2': HTTP2_AVAILABLE,
+            'circuit_state': self.breaker.state,
+            'consecutive_failures': self.breaker.failures,
+            'max_concurrency': self.config['max_concurrency'],
+        }
+
+
+class LLMTransport:
+    """按服务商管理共享传输，配置可通过settings.LLM_TRANSPORT覆盖"""
+
+    def __init__(self):
+        self._providers: Dict[str, ProviderTransport] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> ProviderTransport:
+        transport = self._providers.get(provider)
+        if transport is None:
+            with self._lock:
+                transport = self._providers.get(provider)
+                if transport is None:
+                    overrides = getattr(settings, 'LLM_TRANSPORT', {}).get(provider, {})
+                    transport = ProviderTransport(provider, **overrides)
+                    self._providers[provider] = transport
+        return transport
+
+    def chat_completion(self, provider: str, url: str, api_key: str, payload: Dict,
+                        timeout: float = 30, max_retries: Optional[int] = None) -> Optional[str]:
+        """调用OpenAI兼容的chat/completions接口，返回回复文本"""
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {api_key}'
+        }
+        result = self.get(provider).post_json(url, headers, payload, timeout=timeout, max_retries=max_retries)
+        if result is None:
+            return None
+
+        try:
+            return result['choices'][0]['message']['content'].strip()
+        except (KeyError, IndexError, TypeError, AttributeError):
+            logger.warning(f"Unexpected {provider} response format: {result}")
+            return None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [transport.stats() for transport in self._providers.values()]
+
+
+# 全局实例
+llm_transport = LLMTransport()
@@ -0,0 +1,296 @@
+"""
+题库/错题集PDF导出服务
+PDF在后台线程中直接渲染到 MEDIA_ROOT 下的文件，文件名包含内容版本（题库及题目的更新时间、
+错题集内容摘要），内容未变化时重复导出直接返回已生成的文件；响应支持Range请求，
+配置 PDF_EXPORT_ACCEL_REDIRECT 后交给Nginx发送文件
+"""
+
+import hashlib
+import hmac
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count, Max
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+
+from ..personal_quiz_models import QuizLibrary, WrongAnswer
+from .pdf_toolkit import pdf_toolkit
+
+logger = logging.getLogger(__name__)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class PDFExportService:
+    """PDF导出服务"""
+
+    EXPORT_DIR = 'pdf_exports'
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self):
+        self.max_workers = getattr(settings, 'PDF_EXPORT_WORKERS', 2)
+        self.wait_seconds = getattr(settings, 'PDF_EXPORT_WAIT_SECONDS', 8)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    @property
+    def export_root(self) -> Path:
+        return Path(settings.MEDIA_ROOT) / self.EXPORT_DIR
+
+    def _version(self, *parts) -> str:
+        """内容版本摘要；混入SECRET_KEY，文件名无法被猜到"""
+        message = '|'.join(str(part) for part in parts).encode('utf-8')
+        return hmac.new(settings.SECRET_KEY.encode('utf-8'), message, hashlib.sha1).hexdigest()[:20]
+
+    # ---------- 导出入口 ----------
+
+    def export_library(self, library: QuizLibrary, wait: float = None) -> Optional[Path]:
+        """
+        导出题库PDF
+
+        题目保存时只更新题库的题目数量（不会刷新题库的updated_at），
+        所以版本同时包含题目的最新更新时间和数量。
+
+        Returns:
+            已生成的文件路径；在等待时间内未生成完成时返回None（后台继续生成）
+        """
+        stats = library.questions.aggregate(latest=Max('updated_at'), count=Count('id'))
+        version = self._version(library.id, library.updated_at.isoformat(), stats['latest'], stats['count'])
+        artifact = self.export_root / f'library_{library.id}_{version}.pdf'
+        return self._export(artifact, lambda path: self._render_library(library.id, path), wait)
+
+    def export_wrong_answers(self, user, wait: float = None) -> Optional[Path]:
+        """导出错题集PDF，版本为错题内容的摘要"""
+        rows = WrongAnswer.objects.filter(user=user).order_by('-last_wrong_at').values_list(
+            'question_id', 'wrong_answer', 'wrong_count', 'last_wrong_at', 'question__updated_at'
+        )
+        version = self._version(user.username, *rows)
+        artifact = self.export_root / f'wrong_answers_{user.id}_{version}.pdf'
+        return self._export(artifact, lambda path: self._render_wrong_answers(user.id, path), wait)
+
+    def _export(self, artifact: Path, render: Callable[[Path], None], wait: float = None) -> Optional[Path]:
+        if artifact.exists():
+            logger.info(f"PDF export cache hit: {artifact.name}")
+            return artifact
+
+        future = self._submit(artifact, render)
+        try:
+            future.result(timeout=self.wait_seconds if wait is None else wait)
+        except FutureTimeoutError:
+            return None
+        return artifact
+
+    def _submit(self, artifact: Path, render: Callable[[Path], None]) -> Future:
+        """提交后台渲染任务，同一文件正在生成时复用该任务"""
+        key = str(artifact)
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pdf-export')
+                future = self._executor.submit(self._render_to_artifact, artifact, render)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return future
+
+    def _render_to_artifact(self, artifact: Path, render: Callable[[Path], None]):
+        """渲染到临时文件后原子替换，并清理同一导出对象的旧版本"""
+        close_old_connections()
+        artifact.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = artifact.with_name(f'{artifact.stem}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            render(tmp_path)
+            os.replace(tmp_path, artifact)
+            logger.info(f"PDF export rendered: {artifact.name} ({artifact.stat().st_size} bytes)")
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            close_old_connections()
+
+        prefix = artifact.name.rsplit('_', 1)[0] + '_'
+        for old in artifact.parent.glob(f'{prefix}*.pdf'):
+            if old != artifact:
+                old.unlink(missing_ok=True)
+
+    # ---------- 内容渲染 ----------
+
+    def _append_image(self, story, image_path: str, max_width_cm: float, max_height_cm: float, label: str):
+        from reportlab.platypus import Spacer
+
+        logger.info(f"尝试添加{label}: {image_path}")
+        try:
+            if os.path.exists(image_path):
+                img = pdf_toolkit.scaled_image(image_path, max_width_cm, max_height_cm)
+                story.append(img)
+                story.append(Spacer(1, 6 if max_width_cm > 6 else 3))
+            else:
+                logger.warning(f"{label}文件不存在: {image_path}")
+        except Exception as e:
+            logger.error(f"无法添加{label}: {e}", exc_info=True)
+
+    def _append_question(self, story, index: int, question, sheet: Dict, answer_lines):
+        """题目、图片、选项及答案信息"""
+        from reportlab.platypus import Paragraph, Spacer
+
+        story.append(Paragraph(f"{index}. {question.title}", sheet['heading']))
+        story.append(Paragraph(question.content, sheet['normal']))
+        story.append(Spacer(1, 6))
+
+        if question.question_image:
+            if hasattr(question.question_image, 'path'):
+                image_path = question.question_image.path
+            else:
+                image_path = os.path.join(settings.MEDIA_ROOT, str(question.question_image))
+            self._append_image(story, image_path, 12, 8, '题目图片')
+
+        if question.question_type in ['single_choice', 'multiple_choice'] and question.options:
+            for key, value in question.options.items():
+                story.append(Paragraph(f"{key}. {value}", sheet['normal']))
+                if question.option_images and key in question.option_images:
+                    option_image_path = os.path.join(settings.MEDIA_ROOT, question.option_images[key])
+                    self._append_image(story, option_image_path, 6, 4, f'选项{key}图片')
+
+        story.append(Spacer(1, 6))
+        for line in answer_lines:
+            story.append(Paragraph(line, sheet['normal']))
+
+        if question.explanation:
+            story.append(Paragraph(f"解析: {question.explanation}", sheet['normal']))
+
+        story.append(Spacer(1, 15))
+
+    def _render_library(self, library_id: int, path: Path):
+        from reportlab.platypus import Paragraph, Spacer
+
+        library = QuizLibrary.objects.get(id=library_id)
+        questions = list(library.questions.all().order_by('created_at'))
+        sheet = pdf_toolkit.stylesheet('quiz_export')
+
+        story = [
+            Paragraph(f"{library.name} - 题库", sheet['title']),
+            Spacer(1, 12),
+            Paragraph(f"题库名称: {library.name}", sheet['normal']),
+            Paragraph(f"创建时间: {library.created_at.strftime('%Y-%m-%d %H:%M')}", sheet['normal']),
+            Paragraph(f"题目数量: {len(questions)} 道", sheet['normal']),
+            Paragraph(f"生成时间: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}", sheet['normal']),
+            Spacer(1, 20),
+        ]
+        for i, question in enumerate(questions, 1):
+            self._append_question(story, i, question, sheet, [f"答案: {question.correct_answer}"])
+
+        pdf_toolkit.render_to_file(story, path)
+
+    def _render_wrong_answers(self, user_id: int, path: Path):
+        from django.contrib.auth import get_user_model
+        from reportlab.platypus import Paragraph, Spacer
+
+        user = get_user_model().objects.get(id=user_id)
+        wrong_answers = list(
+            WrongAnswer.objects.filter(user=user).select_related('question').order_by('-last_wrong_at')
+        )
+        sheet = pdf_toolkit.stylesheet('quiz_export')
+
+        story = [
+            Paragraph(f"{user.username} - 错题集", sheet['title']),
+            Spacer(1, 12),
+            Paragraph(f"用户名: {user.username}", sheet['normal']),
+            Paragraph(f"错题数量: {len(wrong_answers)} 道", sheet['normal']),
+            Paragraph(f"生成时间: {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}", sheet['normal']),
+            Spacer(1, 20),
+        ]
+        for i, wrong_answer in enumerate(wrong_answers, 1):
+            question = wrong_answer.question
+            self._append_question(story, i, question, sheet, [
+                f"正确答案: {question.correct_answer}",
+                f"您的答案: {wrong_answer.wrong_answer}",
+                f"错误次数: {wrong_answer.wrong_count}",
+            ])
+
+        pdf_toolkit.render_to_file(story, path)
+
+    # ---------- 文件响应 ----------
+
+    def file_response(self, request, path: Path, filename: str, as_attachment: bool = False) -> HttpResponse:
+        """
+        发送已生成的PDF文件
+
+        配置 PDF_EXPORT_ACCEL_REDIRECT（Nginx internal location前缀）时由Nginx直接发送；
+        否则使用FileResponse（WSGI服务器支持时走sendfile），并处理单段Range请求。
+        """
+        disposition = content_disposition_header(as_attachment, filename)
+        accel_prefix = getattr(settings, 'PDF_EXPORT_ACCEL_REDIRECT', '')
+        if accel_prefix:
+            response = HttpResponse(content_type='application/pdf')
+            response['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{path.name}"
+            response['Content-Disposition'] = disposition
+            return response
+
+        size = path.stat().st_size
+        byte_range = self._parse_range(request.META.get('HTTP_RANGE', ''), size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+        if byte_range is None:
+            response = FileResponse(open(path, 'rb'), content_type='application/pdf')
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                self._iter_range(path, start, end - start + 1),
+                status=206,
+                content_type='application/pdf',
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = str(end - start + 1)
+
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = disposition
+        return response
+
+    @staticmethod
+    def _parse_range(header: str, size: int):
+        """解析单段Range，返回(start, end)；无Range或格式不支持时返回None，无法满足时返回False"""
+        match = RANGE_RE.match(header.strip())
+        if not match or size == 0:
+            return None
+
+        start, end = match.groups()
+        if start:
+            start = int(start)
+            end = min(int(end), size - 1) if end else size - 1
+        elif end:
+            # bytes=-N 表示最后N个字节
+            start = max(size - int(end), 0)
+            end = size - 1
+        else:
+            return None
+
+        if start >= size or start > end:
+            return False
+        return start, end
+
+    def _iter_range(self, path: Path, offset: int, length: int):
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            while length > 0:
+                chunk = f.read(min(self.CHUNK_SIZE, length))
+                if not chunk:
+                    break
+                length -= len(chunk)
+                yield chunk
+
+
+# 全局实例
+pdf_export_service = PDFExportService()
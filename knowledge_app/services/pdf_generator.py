@@ -3,22 +3,19 @@
 支持题库和错题集的PDF导出
 """
 
-import os
-import io
 from datetime import datetime
 from django.http import HttpResponse
 from django.conf import settings
-from reportlab.lib.pagesizes import A4, letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import inch, cm
-from reportlab.lib.colors import black, blue, red, green
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.lib.colors import black, blue, red
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.platypus.flowables import HRFlowable
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 import logging
 
+from .pdf_toolkit import pdf_toolkit
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,129 +27,21 @@ class QuizPDFGenerator:
         self.setup_styles()
     
     def setup_fonts(self):
-        """设置中文字体"""
-        try:
-            # 尝试使用系统中文字体
-            import platform
-            system = platform.system()
-
-            if system == "Windows":
-                # Windows系统字体路径
-                font_paths = [
-                    "C:/Windows/Fonts/simhei.ttf",  # 黑体
-                    "C:/Windows/Fonts/simsun.ttc",  # 宋体
-                    "C:/Windows/Fonts/msyh.ttc",    # 微软雅黑
-                ]
-            elif system == "Darwin":  # macOS
-                font_paths = [
-                    "/System/Library/Fonts/PingFang.ttc",
-                    "/System/Library/Fonts/STHeiti Light.ttc",
-                ]
-            else:  # Linux
-                font_paths = [
-                    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-                    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-                ]
-
-            # 尝试注册中文字体
-            font_registered = False
-            for font_path in font_paths:
-                if os.path.exists(font_path):
-                    try:
-                        pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-                        self.chinese_font = 'ChineseFont'
-                        font_registered = True
-                        logger.info(f"Successfully registered font: {font_path}")
-                        break
-                    except Exception as e:
-                        logger.warning(f"Failed to register font {font_path}: {e}")
-                        continue
-
-            if not font_registered:
-                # 如果没有找到中文字体，使用Helvetica并记录警告
-                self.chinese_font = 'Helvetica'
-                logger.warning("No Chinese font found, using Helvetica")
-
-        except Exception as e:
-            logger.error(f"Font setup failed: {e}")
-            self.chinese_font = 'Helvetica'
+        """设置中文字体（字体在进程内只注册一次）"""
+        self.chinese_font = pdf_toolkit.font_name
     
     def setup_styles(self):
-        """设置样式"""
-        self.styles = getSampleStyleSheet()
-        
-        # 标题样式
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Title'],
-            fontName=self.chinese_font,
-            fontSize=18,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            textColor=black
-        )
-        
-        # 副标题样式
-        self.subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=self.styles['Heading2'],
-            fontName=self.chinese_font,
-            fontSize=14,
-            spaceAfter=12,
-            textColor=blue
-        )
-        
-        # 正文样式
-        self.body_style = ParagraphStyle(
-            'CustomBody',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=10,
-            spaceAfter=8,
-            alignment=TA_JUSTIFY
-        )
+        """设置样式（共享PDF组件中预先构建的样式）"""
+        self.styles = pdf_toolkit.base_styles
+        sheet = pdf_toolkit.stylesheet('quiz')
         
-        # 题目样式
-        self.question_style = ParagraphStyle(
-            'QuestionStyle',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=11,
-            spaceAfter=6,
-            leftIndent=0,
-            fontWeight='bold'
-        )
-        
-        # 选项样式
-        self.option_style = ParagraphStyle(
-            'OptionStyle',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=10,
-            spaceAfter=3,
-            leftIndent=20
-        )
-        
-        # 答案样式
-        self.answer_style = ParagraphStyle(
-            'AnswerStyle',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=10,
-            spaceAfter=6,
-            textColor=green
-        )
-        
-        # 解析样式
-        self.explanation_style = ParagraphStyle(
-            'ExplanationStyle',
-            parent=self.styles['Normal'],
-            fontName=self.chinese_font,
-            fontSize=9,
-            spaceAfter=10,
-            leftIndent=10,
-            textColor=black
-        )
+        self.title_style = sheet['title']
+        self.subtitle_style = sheet['subtitle']
+        self.body_style = sheet['body']
+        self.question_style = sheet['question']
+        self.option_style = sheet['option']
+        self.answer_style = sheet['answer']
+        self.explanation_style = sheet['explanation']
 
     def safe_text(self, text):
         """安全处理文本，确保中文显示正常"""
@@ -203,18 +92,6 @@ class QuizPDFGenerator:
     
     def generate_library_pdf(self, library, questions=None):
         """生成题库PDF"""
-        buffer = io.BytesIO()
-        
-        # 创建PDF文档
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-        
         # 构建内容
         story = []
         
@@ -284,26 +161,10 @@ class QuizPDFGenerator:
                 story.append(Spacer(1, 10))
         
         # 生成PDF
-        doc.build(story)
-        
-        # 返回PDF内容
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_toolkit.render(story)
     
     def generate_wrong_answers_pdf(self, user, wrong_answers=None):
         """生成错题集PDF"""
-        buffer = io.BytesIO()
-        
-        # 创建PDF文档
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-        
         # 构建内容
         story = []
         
@@ -406,11 +267,7 @@ class QuizPDFGenerator:
                 story.append(Spacer(1, 10))
         
         # 生成PDF
-        doc.build(story)
-        
-        # 返回PDF内容
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_toolkit.render(story)
     
     def create_pdf_response(self, pdf_content, filename):
         """创建PDF响应"""
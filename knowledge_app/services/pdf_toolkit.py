@@ -0,0 +1,224 @@
+"""
+PDF导出公共组件
+中文字体在进程内只注册一次，段落样式表只构建一次，各导出功能共享页面模板和样式，
+避免每次导出都重新导入reportlab、探测字体路径和创建样式
+"""
+
+import io
+import logging
+import os
+import platform
+import threading
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+# 中文字体候选路径（按优先级）
+FONT_CANDIDATES = {
+    'Windows': [
+        'C:/Windows/Fonts/msyh.ttc',      # 微软雅黑
+        'C:/Windows/Fonts/simhei.ttf',    # 黑体
+        'C:/Windows/Fonts/simsun.ttc',    # 宋体
+        'C:/Windows/Fonts/simkai.ttf',    # 楷体
+    ],
+    'Darwin': [
+        '/System/Library/Fonts/PingFang.ttc',
+        '/System/Library/Fonts/STHeiti Light.ttc',
+    ],
+    'Linux': [
+        '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+        '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+    ],
+}
+
+CHINESE_FONT_NAME = 'ChineseFont'
+FALLBACK_FONT_NAME = 'Helvetica'
+
+
+class PDFToolkit:
+    """PDF字体、样式与页面模板注册表（进程级单例，首次使用时初始化）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._font_name = None
+        self._base_styles = None
+        self._stylesheets = None
+
+    def warm_up(self):
+        """预先注册字体并构建样式，服务启动时调用"""
+        try:
+            self._ensure_ready()
+            logger.info(f"PDF toolkit ready, font: {self._font_name}")
+        except ImportError:
+            logger.warning("reportlab not installed, PDF export unavailable")
+
+    def _ensure_ready(self):
+        if self._stylesheets is not None:
+            return
+        with self._lock:
+            if self._stylesheets is not None:
+                return
+            from reportlab.lib.styles import getSampleStyleSheet
+
+            self._font_name = self._register_chinese_font()
+            self._base_styles = getSampleStyleSheet()
+            self._stylesheets = self._build_stylesheets(self._base_styles, self._font_name)
+
+    def _register_chinese_font(self) -> str:
+        """注册第一个可用的中文字体，失败时使用Helvetica"""
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        if CHINESE_FONT_NAME in pdfmetrics.getRegisteredFontNames():
+            return CHINESE_FONT_NAME
+
+        font_paths = FONT_CANDIDATES.get(platform.system(), FONT_CANDIDATES['Linux'])
+        for font_path in font_paths:
+            if not os.path.exists(font_path):
+                continue
+            try:
+                pdfmetrics.registerFont(TTFont(CHINESE_FONT_NAME, font_path))
+                logger.info(f"Successfully registered Chinese font: {font_path}")
+                return CHINESE_FONT_NAME
+            except Exception as e:
+                logger.warning(f"Failed to register font {font_path}: {e}")
+
+        logger.warning("No Chinese font found, using Helvetica")
+        return FALLBACK_FONT_NAME
+
+    @staticmethod
+    def _build_stylesheets(styles, font: str) -> Dict[str, Dict]:
+        """构建各导出功能使用的段落样式"""
+        from reportlab.lib import colors
+        from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+        from reportlab.lib.styles import ParagraphStyle
+
+        def style(name, parent, font_name=font, **kwargs):
+            return ParagraphStyle(name, parent=styles[parent], fontName=font_name, **kwargs)
+
+        return {
+            # 每日名词卡片
+            'daily_term': {
+                'title': style('DailyTermTitle', 'Title', fontSize=24, spaceAfter=20,
+                               textColor=colors.HexColor('#2c3e50'), alignment=TA_CENTER),
+                'heading': style('DailyTermHeading', 'Heading2', fontSize=16, spaceAfter=12, spaceBefore=16,
+                                 textColor=colors.HexColor('#34495e')),
+                'normal': style('DailyTermNormal', 'Normal', fontSize=12, spaceAfter=8, leading=18,
+                                textColor=colors.HexColor('#2c3e50')),
+                'meta': style('DailyTermMeta', 'Normal', fontSize=10, spaceAfter=6,
+                              textColor=colors.HexColor('#7f8c8d')),
+            },
+            # 个人题库/错题集导出
+            'quiz_export': {
+                'title': style('QuizExportTitle', 'Title', fontSize=18, spaceAfter=12),
+                'normal': style('QuizExportNormal', 'Normal', fontSize=12, spaceAfter=6),
+                'heading': style('QuizExportHeading', 'Heading2', fontSize=14, spaceAfter=6),
+            },
+            # QuizPDFGenerator
+            'quiz': {
+                'title': style('CustomTitle', 'Title', fontSize=18, spaceAfter=20, alignment=TA_CENTER,
+                               textColor=colors.black),
+                'subtitle': style('CustomSubtitle', 'Heading2', fontSize=14, spaceAfter=12, textColor=colors.blue),
+                'body': style('CustomBody', 'Normal', fontSize=10, spaceAfter=8, alignment=TA_JUSTIFY),
+                'question': style('QuestionStyle', 'Normal', fontSize=11, spaceAfter=6, leftIndent=0),
+                'option': style('OptionStyle', 'Normal', fontSize=10, spaceAfter=3, leftIndent=20),
+                'answer': style('AnswerStyle', 'Normal', fontSize=10, spaceAfter=6, textColor=colors.green),
+                'explanation': style('ExplanationStyle', 'Normal', fontSize=9, spaceAfter=10, leftIndent=10,
+                                     textColor=colors.black),
+            },
+            # ChinesePDFGenerator
+            'chinese': {
+                'title': style('ChineseTitle', 'Title', fontSize=18, spaceAfter=20, alignment=TA_CENTER,
+                               textColor=colors.black),
+                'subtitle': style('ChineseSubtitle', 'Heading2', fontSize=14, spaceAfter=12, textColor=colors.blue),
+                'body': style('ChineseBody', 'Normal', fontSize=11, spaceAfter=8, alignment=TA_LEFT, leading=16),
+                'question': style('ChineseQuestion', 'Normal', fontSize=12, spaceAfter=6, leftIndent=0,
+                                  textColor=colors.black, leading=18),
+                'option': style('ChineseOption', 'Normal', fontSize=11, spaceAfter=3, leftIndent=20, leading=16),
+                'answer': style('ChineseAnswer', 'Normal', fontSize=11, spaceAfter=6, textColor=colors.green,
+                                leading=16),
+                'wrong_answer': style('ChineseWrongAnswer', 'Normal', fontSize=11, spaceAfter=6,
+                                      textColor=colors.red, leading=16),
+                'explanation': style('ChineseExplanation', 'Normal', fontSize=10, spaceAfter=10, leftIndent=10,
+                                     textColor=colors.black, leading=14),
+            },
+            # SimplePDFGenerator（只使用Helvetica，确保兼容性）
+            'simple': {
+                'title': style('SimpleTitle', 'Title', FALLBACK_FONT_NAME, fontSize=18, spaceAfter=20,
+                               alignment=TA_CENTER, textColor=colors.black),
+                'subtitle': style('SimpleSubtitle', 'Heading2', FALLBACK_FONT_NAME, fontSize=14, spaceAfter=12,
+                                  textColor=colors.blue),
+                'body': style('SimpleBody', 'Normal', FALLBACK_FONT_NAME, fontSize=10, spaceAfter=8,
+                              alignment=TA_LEFT),
+                'question': style('SimpleQuestion', 'Normal', FALLBACK_FONT_NAME, fontSize=11, spaceAfter=6,
+                                  leftIndent=0),
+                'option': style('SimpleOption', 'Normal', FALLBACK_FONT_NAME, fontSize=10, spaceAfter=3,
+                                leftIndent=20),
+                'answer': style('SimpleAnswer', 'Normal', FALLBACK_FONT_NAME, fontSize=10, spaceAfter=6,
+                                textColor=colors.green),
+            },
+        }
+
+    @property
+    def font_name(self) -> str:
+        """已注册的中文字体名称（没有可用字体时为Helvetica）"""
+        self._ensure_ready()
+        return self._font_name
+
+    @property
+    def base_styles(self):
+        """reportlab默认样式表（只读共享，不要修改其中的样式）"""
+        self._ensure_ready()
+        return self._base_styles
+
+    def stylesheet(self, name: str) -> Dict:
+        """获取指定导出功能的段落样式"""
+        self._ensure_ready()
+        return self._stylesheets[name]
+
+    def render(self, story: List, **doc_kwargs) -> bytes:
+        """使用统一的A4页面模板（2cm页边距）生成PDF"""
+        buffer = io.BytesIO()
+        self._document(buffer, **doc_kwargs).build(story)
+        return buffer.getvalue()
+
+    def render_to_file(self, story: List, path, **doc_kwargs):
+        """直接写入文件，不在内存中保留整份PDF"""
+        self._document(str(path), **doc_kwargs).build(story)
+
+    @staticmethod
+    def _document(target, **doc_kwargs):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import cm
+        from reportlab.platypus import SimpleDocTemplate
+
+        layout = {
+            'pagesize': A4,
+            'rightMargin': 2 * cm,
+            'leftMargin': 2 * cm,
+            'topMargin': 2 * cm,
+            'bottomMargin': 2 * cm,
+        }
+        layout.update(doc_kwargs)
+        return SimpleDocTemplate(target, **layout)
+
+    @staticmethod
+    def scaled_image(image_path: str, max_width_cm: float, max_height_cm: float):
+        """按最大尺寸等比缩小图片（不放大）"""
+        from reportlab.lib.units import cm
+        from reportlab.platypus import Image
+
+        img = Image(image_path)
+        scale_ratio = min(
+            max_width_cm * cm / img.imageWidth,
+            max_height_cm * cm / img.imageHeight,
+            1.0,
+        )
+        img.drawWidth = img.imageWidth * scale_ratio
+        img.drawHeight = img.imageHeight * scale_ratio
+        return img
+
+
+# 全局实例
+pdf_toolkit = PDFToolkit()
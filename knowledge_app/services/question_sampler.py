@@ -0,0 +1,99 @@
+"""
+题目抽样服务
+只读取题目ID（及分层字段）完成随机抽样，避免为抽取N道题而加载整个题库的模型实例
+"""
+
+import random
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionSampler:
+    """题目抽样器"""
+
+    STRATEGIES = [
+        ('random', '完全随机'),
+        ('difficulty', '按难度分层'),
+        ('tag', '按标签分层'),
+    ]
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+
+    def sample_ids(self, queryset, count: int, strategy: str = 'random') -> List[int]:
+        """
+        从查询集中抽取题目ID
+
+        Args:
+            queryset: 已完成筛选的题目查询集
+            count: 抽取数量，小于等于0表示全部题目
+            strategy: 抽样策略（random / difficulty / tag）
+
+        Returns:
+            打乱顺序后的题目ID列表
+        """
+        if strategy == 'difficulty':
+            groups = self._group_by_difficulty(queryset)
+        elif strategy == 'tag':
+            groups = self._group_by_tag(queryset)
+        else:
+            groups = {None: list(queryset.values_list('id', flat=True))}
+
+        total = sum(len(ids) for ids in groups.values())
+        if count <= 0 or count >= total:
+            selected = [qid for ids in groups.values() for qid in ids]
+        elif len(groups) == 1:
+            selected = self.rng.sample(next(iter(groups.values())), count)
+        else:
+            selected = self._stratified_sample(groups, count, total)
+
+        self.rng.shuffle(selected)
+        return selected
+
+    def _group_by_difficulty(self, queryset) -> Dict[int, List[int]]:
+        """按难度分组，只查询 (id, difficulty) 两列"""
+        groups = defaultdict(list)
+        for qid, difficulty in queryset.values_list('id', 'difficulty'):
+            groups[difficulty].append(qid)
+        return groups
+
+    def _group_by_tag(self, queryset) -> Dict[Optional[int], List[int]]:
+        """按标签分组，多标签题目只归入第一个标签，无标签题目单独成组"""
+        groups = defaultdict(list)
+        seen = set()
+        for qid, tag_id in queryset.values_list('id', 'tags__id').order_by('id', 'tags__id'):
+            if qid in seen:
+                continue
+            seen.add(qid)
+            groups[tag_id].append(qid)
+        return groups
+
+    def _stratified_sample(self, groups: Dict, count: int, total: int) -> List[int]:
+        """按各组占比分配名额（最大余数法），组内随机抽取"""
+        quotas = {}
+        remainders = []
+        for key, ids in groups.items():
+            exact = count * len(ids) / total
+            quotas[key] = int(exact)
+            remainders.append((exact - int(exact), self.rng.random(), key))
+
+        # 余下的名额按余数从大到小分配
+        leftover = count - sum(quotas.values())
+        for _, _, key in sorted(remainders, reverse=True):
+            if leftover <= 0:
+                break
+            if quotas[key] < len(groups[key]):
+                quotas[key] += 1
+                leftover -= 1
+
+        selected = []
+        for key, ids in groups.items():
+            selected.extend(self.rng.sample(ids, quotas[key]))
+        return selected
+
+
+# 全局实例
+question_sampler = QuestionSampler()
@@ -8,6 +8,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from django.utils import timezone
 from .glm_chatbot_service import GLMChatbotClient
+from .ai_response_cache import ai_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,17 @@ class QuizAIAnalyzer:
             user_answer = wrong_answer_data['user_answer']
             correct_answer = wrong_answer_data['correct_answer']
             question_type = wrong_answer_data.get('question_type', '')
+
+            # 同一道题的相同错误答案复用已有分析
+            cache_key = ai_response_cache.make_key(
+                'wrong_answer',
+                wrong_answer_data.get('question_id') or ai_response_cache.fingerprint(question),
+                ai_response_cache.fingerprint(correct_answer),
+                ai_response_cache.fingerprint(user_answer),
+            )
+            cached = ai_response_cache.get(cache_key)
+            if cached:
+                return {'success': True, **cached, 'cached': True}
             
             # 构建分析提示
             prompt = self._build_wrong_answer_prompt(
@@ -44,12 +56,13 @@ class QuizAIAnalyzer:
             if response:
                 # 解析AI回复
                 analysis_result = self._parse_analysis_response(response)
-                return {
-                    'success': True,
+                result = {
                     'analysis': analysis_result.get('analysis', ''),
                     'suggestion': analysis_result.get('suggestion', ''),
                     'raw_response': response
                 }
+                ai_response_cache.set(cache_key, result)
+                return {'success': True, **result}
             else:
                 return {
                     'success': False,
@@ -0,0 +1,235 @@
+"""
+个人题库练习会话服务
+开始练习时一次性加载整套题目（含标签、选项），以紧凑结构缓存，
+后续出题与判分直接读取缓存中的题目，避免每道题的重复数据库查询。
+缓存只保存题目内容，答题进度和作答记录始终以数据库为准：
+进程内缓存不在工作进程间共享，且可能在会话进行中被淘汰
+"""
+
+import logging
+from typing import Dict, List, Optional, Any
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from ..personal_quiz_models import QuizSession, QuizQuestion, QuizAnswer, WrongAnswer
+from .answer_grader import answer_grader
+
+logger = logging.getLogger(__name__)
+
+
+class QuizSessionRunner:
+    """练习会话运行器"""
+
+    CACHE_PREFIX = 'quiz_session_snapshot'
+    CACHE_TIMEOUT = 60 * 60 * 6  # 6小时
+
+    def _cache_key(self, session_id: int) -> str:
+        return f'{self.CACHE_PREFIX}_{session_id}'
+
+    def _serialize_question(self, question: QuizQuestion) -> Dict[str, Any]:
+        """将题目转换为紧凑的字典结构"""
+        return {
+            'id': question.id,
+            'title': question.title,
+            'content': question.content,
+            'question_type': question.question_type,
+            'type_display': question.get_question_type_display(),
+            'difficulty': question.difficulty,
+            'difficulty_display': question.get_difficulty_display(),
+            'options': question.options or {},
+            'option_images': question.option_images or {},
+            'image_url': question.question_image.url if question.question_image else '',
+            'correct_answer': question.correct_answer,
+            'normalized_answer': answer_grader.normalize_correct(question.question_type, question.correct_answer),
+            'explanation': question.explanation,
+            'tags': [{'name': tag.name, 'color': tag.color} for tag in question.tags.all()],
+        }
+
+    def _build_snapshot(self, session: QuizSession) -> Dict[str, Any]:
+        """从数据库构建题目快照（一次题目查询 + 一次标签预取）"""
+        question_ids = list(session.question_ids or [])
+        questions = QuizQuestion.objects.filter(id__in=question_ids).prefetch_related('tags')
+        question_map = {str(q.id): self._serialize_question(q) for q in questions}
+
+        return {
+            # 过滤掉已被删除的题目，保持原有顺序
+            'question_ids': [qid for qid in question_ids if str(qid) in question_map],
+            'questions': question_map,
+        }
+
+    def start(self, session: QuizSession, question_ids: List[int]) -> Dict[str, Any]:
+        """开始会话：持久化题目顺序并预加载题目"""
+        session.question_ids = list(question_ids)
+        session.current_index = 0
+        session.save(update_fields=['question_ids', 'current_index'])
+
+        snapshot = self._build_snapshot(session)
+        cache.set(self._cache_key(session.id), snapshot, self.CACHE_TIMEOUT)
+        return snapshot
+
+    def get_snapshot(self, session: QuizSession) -> Dict[str, Any]:
+        """获取题目快照，缓存失效时从数据库恢复（支持断点续练）"""
+        snapshot = cache.get(self._cache_key(session.id))
+        if snapshot is None:
+            logger.info(f"Rebuilding quiz snapshot for session {session.id}")
+            snapshot = self._build_snapshot(session)
+            cache.set(self._cache_key(session.id), snapshot, self.CACHE_TIMEOUT)
+        return snapshot
+
+    def get_current_question(self, session: QuizSession) -> Optional[Dict[str, Any]]:
+        """获取当前题目（进度取自会话记录），全部答完时返回None"""
+        snapshot = self.get_snapshot(session)
+        index = session.current_index
+        if index >= len(snapshot['question_ids']):
+            return None
+        return snapshot['questions'][str(snapshot['question_ids'][index])]
+
+    def get_question(self, session: QuizSession, question_id) -> Optional[Dict[str, Any]]:
+        """从快照中获取指定题目"""
+        return self.get_snapshot(session)['questions'].get(str(question_id))
+
+    def get_answer(self, session: QuizSession, question_id) -> Optional[Dict[str, Any]]:
+        """获取本次会话中该题已记录的作答"""
+        return QuizAnswer.objects.filter(session=session, question_id=question_id).values(
+            'user_answer', 'is_correct'
+        ).first()
+
+    def advance(self, session: QuizSession):
+        """作答后前进到下一题"""
+        QuizSession.objects.filter(pk=session.pk).update(current_index=F('current_index') + 1)
+        session.refresh_from_db(fields=['current_index'])
+
+    def submit_batch(self, session: QuizSession, answers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        批量提交答案（离线/考试模式）
+
+        所有答案在一个事务内完成：答题记录批量插入，题目和会话统计各用
+        F()表达式一次性更新，错题本批量插入或累加，不触发逐条save()。
+
+        Args:
+            session: 练习会话
+            answers: [{'question_id': 1, 'answer': 'A', 'time_spent': 10}, ...]
+
+        Returns:
+            每道题的判分结果及会话统计
+        """
+        snapshot = self.get_snapshot(session)
+        now = timezone.now()
+
+        # 同一批次中同一题只取第一次作答，会话外的题目忽略
+        graded = {}
+        skipped = []
+        for item in answers:
+            question = snapshot['questions'].get(str(item.get('question_id')))
+            if question is None or question['id'] in graded:
+                skipped.append(item.get('question_id'))
+                continue
+            graded[question['id']] = {
+                'question': question,
+                'user_answer': str(item.get('answer', '')).strip(),
+                'time_spent': max(int(item.get('time_spent', 0) or 0), 0),
+            }
+
+        # 与单题提交相同，使用快照中预先规范化的正确答案判分
+        for g in graded.values():
+            g['is_correct'] = answer_grader.grade_question(g['question'], g['user_answer'])
+
+        with transaction.atomic():
+            # 已作答的题目保持原记录不变（与单题提交的get_or_create一致）
+            answered = set(QuizAnswer.objects.filter(session=session).values_list('question_id', flat=True))
+            existing = answered & set(graded)
+            new_items = {qid: g for qid, g in graded.items() if qid not in existing}
+
+            QuizAnswer.objects.bulk_create([
+                QuizAnswer(
+                    session=session,
+                    question_id=qid,
+                    user_answer=g['user_answer'],
+                    is_correct=g['is_correct'],
+                    time_spent=g['time_spent'],
+                )
+                for qid, g in new_items.items()
+            ])
+
+            correct_ids = [qid for qid, g in new_items.items() if g['is_correct']]
+            wrong_ids = [qid for qid, g in new_items.items() if not g['is_correct']]
+
+            # 题目统计
+            if correct_ids:
+                QuizQuestion.objects.filter(id__in=correct_ids).update(
+                    total_attempts=F('total_attempts') + 1,
+                    correct_attempts=F('correct_attempts') + 1,
+                )
+            if wrong_ids:
+                QuizQuestion.objects.filter(id__in=wrong_ids).update(
+                    total_attempts=F('total_attempts') + 1,
+                )
+
+            # 错题本：已有记录累加次数，其余批量插入
+            wrong_answer_ids = [qid for qid, g in graded.items() if not g['is_correct']]
+            if wrong_answer_ids:
+                known = set(WrongAnswer.objects.filter(
+                    user=session.user, question_id__in=wrong_answer_ids
+                ).values_list('question_id', flat=True))
+                if known:
+                    WrongAnswer.objects.filter(user=session.user, question_id__in=known).update(
+                        wrong_count=F('wrong_count') + 1,
+                        last_wrong_at=now,
+                    )
+                WrongAnswer.objects.bulk_create([
+                    WrongAnswer(
+                        user=session.user,
+                        question_id=qid,
+                        wrong_answer=graded[qid]['user_answer'],
+                        correct_answer=graded[qid]['question']['correct_answer'],
+                    )
+                    for qid in wrong_answer_ids if qid not in known
+                ])
+
+            # 会话统计与进度：进度前移到第一道未作答的题目，不会后退
+            answered.update(new_items)
+            first_unanswered = len(snapshot['question_ids'])
+            for position, qid in enumerate(snapshot['question_ids']):
+                if qid not in answered:
+                    first_unanswered = position
+                    break
+
+            QuizSession.objects.filter(pk=session.pk).update(
+                answered_questions=F('answered_questions') + len(new_items),
+                correct_answers=F('correct_answers') + len(correct_ids),
+                current_index=Greatest(F('current_index'), Value(first_unanswered)),
+            )
+
+        session.refresh_from_db(fields=['answered_questions', 'correct_answers', 'current_index'])
+
+        return {
+            'results': [
+                {
+                    'question_id': qid,
+                    'is_correct': g['is_correct'],
+                    'correct_answer': g['question']['correct_answer'],
+                    'explanation': g['question']['explanation'],
+                    'already_answered': qid in existing,
+                }
+                for qid, g in graded.items()
+            ],
+            'skipped': skipped,
+            'answered_questions': session.answered_questions,
+            'correct_answers': session.correct_answers,
+            'total_questions': len(snapshot['question_ids']),
+            'is_finished': session.current_index >= len(snapshot['question_ids']),
+        }
+
+    def finish(self, session: QuizSession):
+        """结束会话并清理缓存"""
+        session.status = 'completed'
+        session.completed_at = timezone.now()
+        session.save(update_fields=['status', 'completed_at'])
+        cache.delete(self._cache_key(session.id))
+
+
+# 全局实例
+quiz_session_runner = QuizSessionRunner()
@@ -3,18 +3,17 @@
 使用纯英文标签和ASCII字符，确保兼容性
 """
 
-import io
 from datetime import datetime
 from django.http import HttpResponse
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.lib.colors import black, blue, red, green
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.colors import black, blue, red
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.platypus.flowables import HRFlowable
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import logging
 
+from .pdf_toolkit import pdf_toolkit
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,72 +24,19 @@ class SimplePDFGenerator:
         self.setup_styles()
     
     def setup_styles(self):
-        """设置样式"""
-        self.styles = getSampleStyleSheet()
+        """设置样式（共享PDF组件中预先构建的样式）"""
+        self.styles = pdf_toolkit.base_styles
+        sheet = pdf_toolkit.stylesheet('simple')
         
         # 使用Helvetica字体，确保兼容性
         self.font_name = 'Helvetica'
         
-        # 标题样式
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Title'],
-            fontName=self.font_name,
-            fontSize=18,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            textColor=black
-        )
-        
-        # 副标题样式
-        self.subtitle_style = ParagraphStyle(
-            'CustomSubtitle',
-            parent=self.styles['Heading2'],
-            fontName=self.font_name,
-            fontSize=14,
-            spaceAfter=12,
-            textColor=blue
-        )
-        
-        # 正文样式
-        self.body_style = ParagraphStyle(
-            'CustomBody',
-            parent=self.styles['Normal'],
-            fontName=self.font_name,
-            fontSize=10,
-            spaceAfter=8,
-            alignment=TA_LEFT
-        )
-        
-        # 题目样式
-        self.question_style = ParagraphStyle(
-            'QuestionStyle',
-            parent=self.styles['Normal'],
-            fontName=self.font_name,
-            fontSize=11,
-            spaceAfter=6,
-            leftIndent=0
-        )
-        
-        # 选项样式
-        self.option_style = ParagraphStyle(
-            'OptionStyle',
-            parent=self.styles['Normal'],
-            fontName=self.font_name,
-            fontSize=10,
-            spaceAfter=3,
-            leftIndent=20
-        )
-        
-        # 答案样式
-        self.answer_style = ParagraphStyle(
-            'AnswerStyle',
-            parent=self.styles['Normal'],
-            fontName=self.font_name,
-            fontSize=10,
-            spaceAfter=6,
-            textColor=green
-        )
+        self.title_style = sheet['title']
+        self.subtitle_style = sheet['subtitle']
+        self.body_style = sheet['body']
+        self.question_style = sheet['question']
+        self.option_style = sheet['option']
+        self.answer_style = sheet['answer']
     
     def safe_text(self, text):
         """安全处理文本，保留中文但使用拼音标注"""
@@ -212,17 +158,6 @@ class SimplePDFGenerator:
     
     def generate_library_pdf(self, library, questions=None):
         """生成题库PDF"""
-        buffer = io.BytesIO()
-        
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-        
         story = []
         
         # 标题
@@ -290,23 +225,10 @@ class SimplePDFGenerator:
                 story.append(HRFlowable(width="100%", thickness=0.5, color=black))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_toolkit.render(story)
     
     def generate_wrong_answers_pdf(self, user, wrong_answers=None):
         """生成错题集PDF"""
-        buffer = io.BytesIO()
-        
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-        
         story = []
         
         # 标题
@@ -388,9 +310,7 @@ class SimplePDFGenerator:
                 story.append(HRFlowable(width="100%", thickness=0.5, color=black))
                 story.append(Spacer(1, 10))
         
-        doc.build(story)
-        buffer.seek(0)
-        return buffer.getvalue()
+        return pdf_toolkit.render(story)
     
     def create_pdf_response(self, pdf_content, filename):
         """创建PDF响应"""
@@ -0,0 +1,153 @@
+"""
+会话数据结构存储
+交互式可视化（如单链表）的状态按会话保存为紧凑快照（节点值列表），
+快照写入 SESSION_STRUCTURE_CACHE_ALIAS 指定的缓存，空闲超时后自动过期；
+进程内只保留少量已重建的对象（LRU，按条数、估算内存和空闲时间淘汰），
+并用快照版本号判断是否已被其他进程修改。
+多进程部署时该别名必须配置为共享后端（数据库缓存或Redis），
+使用进程内缓存（LocMemCache）时各工作进程看到的是各自的状态
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from ..algorithms.single_linklist import SingleLinkedList
+
+logger = logging.getLogger(__name__)
+
+# 支持的数据结构类型（需实现 to_snapshot() 和 from_snapshot(data)）
+STRUCTURE_TYPES = {
+    'single_linklist': SingleLinkedList,
+}
+
+
+class SessionStructureStore:
+    """按会话保存的数据结构"""
+
+    CACHE_PREFIX = 'session_structure'
+
+    # 进程内对象的内存估算（字节）
+    ENTRY_OVERHEAD_BYTES = 512
+    ITEM_BYTES = 160
+
+    def __init__(self):
+        self._local = OrderedDict()  # (session_key, kind) -> (过期时间, 版本号, 估算字节数, 对象)
+        self._local_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """保存快照的缓存（需为各进程共享的后端）"""
+        return caches[getattr(settings, 'SESSION_STRUCTURE_CACHE_ALIAS', 'default')]
+
+    @property
+    def idle_ttl(self) -> int:
+        """空闲多久后过期（秒）"""
+        return getattr(settings, 'SESSION_STRUCTURE_IDLE_TTL', 60 * 60)
+
+    @property
+    def local_max_entries(self) -> int:
+        return getattr(settings, 'SESSION_STRUCTURE_LOCAL_MAX_ENTRIES', 256)
+
+    @property
+    def local_max_bytes(self) -> int:
+        return getattr(settings, 'SESSION_STRUCTURE_LOCAL_MAX_BYTES', 4 * 1024 * 1024)
+
+    def _cache_key(self, session_key: str, kind: str) -> str:
+        return f'{self.CACHE_PREFIX}:{kind}:{session_key}'
+
+    def _estimate_bytes(self, snapshot) -> int:
+        return self.ENTRY_OVERHEAD_BYTES + self.ITEM_BYTES * len(snapshot)
+
+    # ---------- 进程内LRU ----------
+
+    def _local_get(self, key: Tuple[str, str], version: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, local_version, size, structure = entry
+            if local_version != version or expires_at < time.monotonic():
+                self._local_pop(key)
+                return None
+            self._local[key] = (time.monotonic() + self.idle_ttl, local_version, size, structure)
+            self._local.move_to_end(key)
+            return structure
+
+    def _local_set(self, key: Tuple[str, str], version: str, size: int, structure: Any):
+        with self._lock:
+            self._local_pop(key)
+            self._local[key] = (time.monotonic() + self.idle_ttl, version, size, structure)
+            self._local_bytes += size
+            self._evict()
+
+    def _local_pop(self, key: Tuple[str, str]):
+        entry = self._local.pop(key, None)
+        if entry is not None:
+            self._local_bytes -= entry[2]
+
+    def _evict(self):
+        """淘汰空闲超时的对象，再按LRU淘汰到条数和内存上限以内"""
+        now = time.monotonic()
+        for key in [key for key, entry in self._local.items() if entry[0] < now]:
+            self._local_pop(key)
+        while self._local and (len(self._local) > self.local_max_entries
+                               or self._local_bytes > self.local_max_bytes):
+            _, entry = self._local.popitem(last=False)
+            self._local_bytes -= entry[2]
+
+    # ---------- 对外接口 ----------
+
+    def load(self, session_key: str, kind: str = 'single_linklist') -> Any:
+        """获取会话的数据结构，不存在或已过期时返回新的空结构"""
+        structure_class = STRUCTURE_TYPES[kind]
+        key = (session_key, kind)
+        cache_key = self._cache_key(session_key, kind)
+
+        payload = self.cache.get(cache_key)
+        if payload is None:
+            with self._lock:
+                self._local_pop(key)
+            return structure_class()
+
+        # 读取即视为活跃，延长空闲过期时间
+        self.cache.touch(cache_key, self.idle_ttl)
+
+        structure = self._local_get(key, payload['version'])
+        if structure is None:
+            structure = structure_class.from_snapshot(payload['data'])
+            self._local_set(key, payload['version'], self._estimate_bytes(payload['data']), structure)
+        return structure
+
+    def save(self, session_key: str, structure: Any, kind: str = 'single_linklist'):
+        """保存修改后的数据结构"""
+        key = (session_key, kind)
+        cache_key = self._cache_key(session_key, kind)
+        snapshot = structure.to_snapshot()
+
+        # 随机版本号，其他进程据此判断本地对象是否过时
+        version = uuid.uuid4().hex
+        self.cache.set(cache_key, {'version': version, 'data': snapshot}, self.idle_ttl)
+        self._local_set(key, version, self._estimate_bytes(snapshot), structure)
+
+    def delete(self, session_key: str, kind: str = 'single_linklist'):
+        """删除会话的数据结构"""
+        self.cache.delete(self._cache_key(session_key, kind))
+        with self._lock:
+            self._local_pop((session_key, kind))
+
+    def get_stats(self) -> Dict[str, int]:
+        """进程内对象的数量与估算内存"""
+        with self._lock:
+            return {'local_entries': len(self._local), 'local_bytes': self._local_bytes}
+
+
+# 全局实例
+structure_store = SessionStructureStore()
@@ -12,7 +12,8 @@ from django.db import transaction
 from django.utils import timezone
 from django.core.paginator import Paginator
 from django.urls import reverse
-from .personal_quiz_models import QuizLibrary, LibraryShare, LibraryCopy, QuizQuestion
+from .personal_quiz_models import QuizLibrary, LibraryShare
+from .services.library_copy_service import library_copy_service
 import json
 from datetime import datetime, timedelta
 
@@ -216,53 +217,32 @@ def copy_shared_library(request, share_id):
         return JsonResponse({'success': False, 'error': '无权复制此题库'})
     
     try:
-        with transaction.atomic():
-            original_library = share.library
-            
-            # 创建新题库
-            new_library = QuizLibrary.objects.create(
-                owner=request.user,
-                name=f"{original_library.name} (副本)",
-                description=f"复制自 {share.shared_by.username} 的题库：{original_library.description}",
-            )
-            
-            # 复制题目
-            questions = original_library.questions.filter(is_active=True)
-            for question in questions:
-                new_question = QuizQuestion.objects.create(
-                    library=new_library,
-                    title=question.title,
-                    content=question.content,
-                    question_type=question.question_type,
-                    options=question.options,
-                    correct_answer=question.correct_answer,
-                    explanation=question.explanation,
-                    difficulty=question.difficulty,
-                )
-                # 复制标签
-                new_question.tags.set(question.tags.all())
-            
-            # 更新题目数量
-            new_library.update_question_count()
-            
-            # 记录复制
-            LibraryCopy.objects.create(
-                original_library=original_library,
-                copied_library=new_library,
-                copied_by=request.user,
-                share=share
-            )
-            
-            return JsonResponse({
-                'success': True,
-                'message': '题库复制成功',
-                'library_id': new_library.id,
-                'redirect_url': reverse('knowledge_app:quiz_library_detail', args=[new_library.id])
-            })
-            
+        copy_record = library_copy_service.copy_shared_library(share, request.user)
     except Exception as e:
         return JsonResponse({'success': False, 'error': f'复制失败：{str(e)}'})
 
+    in_background = copy_record.status == 'running'
+    return JsonResponse({
+        'success': True,
+        'message': '题库正在后台复制，题目会陆续出现在新题库中' if in_background else '题库复制成功',
+        'library_id': copy_record.copied_library_id,
+        'copy_id': copy_record.id,
+        'status': copy_record.status,
+        'progress_url': reverse('knowledge_app:library_copy_progress', args=[copy_record.id]),
+        'redirect_url': reverse('knowledge_app:quiz_library_detail', args=[copy_record.copied_library_id])
+    })
+
+
+@login_required
+@require_http_methods(["GET"])
+def library_copy_progress(request, copy_id):
+    """查询题库复制进度"""
+    progress = library_copy_service.get_progress(copy_id, request.user)
+    if progress is None:
+        return JsonResponse({'success': False, 'error': '复制记录不存在'}, status=404)
+
+    return JsonResponse({'success': True, **progress})
+
 
 @login_required
 @require_http_methods(["POST"])
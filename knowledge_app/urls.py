@@ -122,12 +122,15 @@ urlpatterns = [
 
     # 练习生成器相关
     path('api/exercises/generate/', views.generate_exercises, name='generate_exercises'),
+    path('api/exercises/jobs/<int:job_id>/', views.exercise_job_status, name='exercise_job_status'),
+    path('api/exercises/jobs/<int:job_id>/stream/', views.exercise_job_stream, name='exercise_job_stream'),
     path('api/exercises/submit/', views.submit_exercise_answers, name='submit_exercise_answers'),
     path('api/exercises/report/<int:session_id>/', views.get_exercise_report, name='get_exercise_report'),
     path('test-exercise/', views.test_exercise, name='test_exercise'),
 
     # GLM聊天机器人相关
     path('api/chatbot/ask/', views.chat_about_term, name='chat_about_term'),
+    path('api/chatbot/ask/stream/', views.chat_about_term_stream, name='chat_about_term_stream'),
     path('api/chatbot/questions/', views.get_suggested_questions, name='get_suggested_questions'),
     path('api/chatbot/status/', views.chatbot_status, name='chatbot_status'),
     path('test-chatbot/', views.test_chatbot, name='test_chatbot'),
@@ -170,6 +173,7 @@ urlpatterns = [
     # 练习功能
     path('quiz/session/<int:session_id>/', personal_quiz_views.quiz_session, name='quiz_session'),
     path('quiz/session/<int:session_id>/submit/', personal_quiz_views.submit_answer, name='quiz_submit_answer'),
+    path('quiz/session/<int:session_id>/submit-batch/', personal_quiz_views.submit_answers_batch, name='quiz_submit_answers_batch'),
     path('quiz/session/<int:session_id>/result/', personal_quiz_views.quiz_result, name='quiz_result'),
 
     # 错题功能
@@ -199,6 +203,7 @@ urlpatterns = [
     path('quiz/shares/public/', share_views.public_libraries, name='public_libraries'),
     path('quiz/shared/<str:share_code>/', share_views.shared_library_detail, name='shared_library_detail'),
     path('quiz/shares/<int:share_id>/copy/', share_views.copy_shared_library, name='copy_shared_library'),
+    path('quiz/copies/<int:copy_id>/progress/', share_views.library_copy_progress, name='library_copy_progress'),
     path('quiz/shares/<int:share_id>/toggle/', share_views.toggle_share_status, name='toggle_share_status'),
     path('quiz/shares/<int:share_id>/delete/', share_views.delete_share, name='delete_share'),
 ]
\ No newline at end of file
@@ -1,19 +1,23 @@
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse, Http404
+from django.http import JsonResponse, Http404, HttpResponseNotAllowed, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.core.paginator import Paginator
 from django.utils import timezone
+from django.urls import reverse
 from django.db import models
+import asyncio
 import json
 import logging
+import time
+from asgiref.sync import sync_to_async
 
-from .algorithms.single_linklist import SingleLinkedList
 from .models import KnowledgePoint, DailyTerm
 from .search_service import SearchService
 from .algorithms.hamming_code import HammingCode
-from .algorithms.crc_check import CRCChecker
+from .algorithms.crc_check import CRCChecker, is_binary_string
 from .services.daily_term_service import DailyTermService
+from .services.structure_store import structure_store
 
 logger = logging.getLogger(__name__)
 
@@ -602,15 +606,90 @@ def clear_search_history(request):
     return JsonResponse({'success': False, 'error': '用户未登录'})
 
 
+# 布尔参数接受JSON布尔值，或表单/查询串风格的字符串
+FLAG_VALUES = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def _parse_flag(data, name, default):
+    """
+    严格解析布尔参数
+
+    Returns:
+        tuple: (取值, 错误信息或None)
+    """
+    value = data.get(name, default)
+    if isinstance(value, bool):
+        return value, None
+    flag = FLAG_VALUES.get(str(value).strip().lower()) if isinstance(value, (str, int)) else None
+    if flag is None:
+        return default, f'{name}只能是true或false'
+    return flag, None
+
+
 # ========== 海明码相关API ==========
 
+# 记录计算步骤时的长度限制
+HAMMING_STEP_MAX_DATA_BITS = 16
+HAMMING_STEP_MAX_CODE_BITS = 32
+# 不记录步骤（快速计算/批量）时的长度限制
+HAMMING_MAX_CODE_BITS = 4096
+HAMMING_BATCH_MAX_ITEMS = 10000
+HAMMING_BATCH_MAX_TOTAL_BITS = 1 << 20
+
+
+def _parse_hamming_options(data):
+    """
+    解析海明码接口的公共参数
+
+    Returns:
+        tuple: (是否记录步骤, 批量数据列表或None, 错误信息或None)
+    """
+    items = data.get('items')
+    record_steps, error = _parse_flag(data, 'record_steps', True)
+    if error:
+        return record_steps, items, error
+    record_steps = record_steps and items is None
+
+    if items is not None:
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            return record_steps, items, 'items必须是字符串列表'
+        if len(items) > HAMMING_BATCH_MAX_ITEMS:
+            return record_steps, items, f'一次最多处理{HAMMING_BATCH_MAX_ITEMS}条数据'
+        if any(len(item) > HAMMING_MAX_CODE_BITS for item in items):
+            return record_steps, items, f'单条数据长度不能超过{HAMMING_MAX_CODE_BITS}位'
+        if sum(len(item) for item in items) > HAMMING_BATCH_MAX_TOTAL_BITS:
+            return record_steps, items, f'数据总长度不能超过{HAMMING_BATCH_MAX_TOTAL_BITS}位'
+
+    return record_steps, items, None
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def hamming_encode_api(request):
-    """海明码编码API"""
+    """海明码编码API（record_steps=false时快速计算，传入items时批量编码）"""
     try:
         data = json.loads(request.body)
+        record_steps, items, error = _parse_hamming_options(data)
+
+        if error:
+            return JsonResponse({
+                'success': False,
+                'error': error
+            }, status=400)
+
+        hc = HammingCode()
+
+        # 批量编码
+        if items is not None:
+            results = hc.encode_batch([item.strip() for item in items])
+            logger.info(f"海明码批量编码完成: {len(results)}条")
+            return JsonResponse({
+                'success': True,
+                'results': results
+            })
+
         data_bits = data.get('data_bits', '').strip()
+        max_data_bits = HAMMING_STEP_MAX_DATA_BITS if record_steps else HAMMING_MAX_CODE_BITS
 
         # 输入验证
         if not data_bits:
@@ -619,21 +698,20 @@ def hamming_encode_api(request):
                 'error': '请输入要编码的数据'
             })
 
-        if not all(bit in '01' for bit in data_bits):
+        if not is_binary_string(data_bits):
             return JsonResponse({
                 'success': False,
                 'error': '数据只能包含0和1'
             })
 
-        if len(data_bits) > 16:
+        if len(data_bits) > max_data_bits:
             return JsonResponse({
                 'success': False,
-                'error': '数据长度不能超过16位'
+                'error': f'数据长度不能超过{max_data_bits}位'
             })
 
         # 执行编码
-        hc = HammingCode()
-        result, steps = hc.encode(data_bits)
+        result, steps = hc.encode(data_bits, record_steps=record_steps)
 
         if result is None:
             return JsonResponse({
@@ -641,7 +719,7 @@ def hamming_encode_api(request):
                 'error': '编码失败，请检查输入数据'
             })
 
-        logger.info(f"海明码编码成功: {data_bits} -> {result}")
+        logger.info(f"海明码编码成功: {len(data_bits)}位数据 -> {len(result)}位")
 
         return JsonResponse({
             'success': True,
@@ -667,10 +745,30 @@ def hamming_encode_api(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def hamming_decode_api(request):
-    """海明码解码API"""
+    """海明码解码API（record_steps=false时快速计算，传入items时批量解码）"""
     try:
         data = json.loads(request.body)
+        record_steps, items, error = _parse_hamming_options(data)
+
+        if error:
+            return JsonResponse({
+                'success': False,
+                'error': error
+            }, status=400)
+
+        hc = HammingCode()
+
+        # 批量解码
+        if items is not None:
+            results = hc.decode_batch([item.strip() for item in items])
+            logger.info(f"海明码批量解码完成: {len(results)}条")
+            return JsonResponse({
+                'success': True,
+                'results': results
+            })
+
         hamming_bits = data.get('hamming_bits', '').strip()
+        max_code_bits = HAMMING_STEP_MAX_CODE_BITS if record_steps else HAMMING_MAX_CODE_BITS
 
         # 输入验证
         if not hamming_bits:
@@ -679,29 +777,29 @@ def hamming_decode_api(request):
                 'error': '请输入要解码的海明码'
             })
 
-        if not all(bit in '01' for bit in hamming_bits):
+        if not is_binary_string(hamming_bits):
             return JsonResponse({
                 'success': False,
                 'error': '海明码只能包含0和1'
             })
 
-        if len(hamming_bits) > 32:
+        if len(hamming_bits) > max_code_bits:
             return JsonResponse({
                 'success': False,
-                'error': '海明码长度不能超过32位'
+                'error': f'海明码长度不能超过{max_code_bits}位'
             })
 
         # 执行解码
-        hc = HammingCode()
-        result, has_error, steps = hc.decode(hamming_bits)
+        result, has_error, steps = hc.decode(hamming_bits, record_steps=record_steps)
 
         if result is None:
             return JsonResponse({
                 'success': False,
-                'error': '解码失败，请检查输入的海明码格式'
+                'error': '解码失败，请检查输入的海明码格式',
+                'steps': steps
             })
 
-        logger.info(f"海明码解码成功: {hamming_bits} -> {result}, 有错误: {has_error}")
+        logger.info(f"海明码解码成功: {len(hamming_bits)}位 -> {len(result)}位, 有错误: {has_error}")
 
         return JsonResponse({
             'success': True,
@@ -727,55 +825,103 @@ def hamming_decode_api(request):
 
 # ========== CRC相关API ==========
 
+# 记录除法步骤时的长度限制（步骤随数据位数线性增长）
+CRC_STEP_MAX_DATA_BITS = 20
+CRC_STEP_MAX_POLYNOMIAL_BITS = 10
+# 不记录步骤（快速计算/批量）时的长度限制，多项式最长到CRC-32
+CRC_MAX_DATA_BITS = 1 << 20
+CRC_MAX_POLYNOMIAL_BITS = 33
+CRC_BATCH_MAX_ITEMS = 500
+
+
+def _parse_crc_options(data):
+    """
+    解析CRC接口的公共参数
+
+    Returns:
+        tuple: (生成多项式, 是否记录步骤, 批量数据列表或None, 错误信息或None)
+    """
+    polynomial = CRCChecker.resolve_polynomial(str(data.get('polynomial', '1011')).strip())
+    items = data.get('items')
+    record_steps, error = _parse_flag(data, 'record_steps', True)
+    if error:
+        return polynomial, record_steps, items, error
+    record_steps = record_steps and items is None
+    max_polynomial_bits = CRC_STEP_MAX_POLYNOMIAL_BITS if record_steps else CRC_MAX_POLYNOMIAL_BITS
+
+    if not polynomial:
+        return polynomial, record_steps, items, '请输入生成多项式'
+
+    if not all(bit in '01' for bit in polynomial):
+        return polynomial, record_steps, items, '生成多项式只能包含0和1'
+
+    if len(polynomial) < 2 or len(polynomial) > max_polynomial_bits:
+        return polynomial, record_steps, items, f'生成多项式长度应在2-{max_polynomial_bits}位之间'
+
+    if not record_steps and polynomial[0] != '1':
+        return polynomial, record_steps, items, '生成多项式最高位必须为1'
+
+    if items is not None:
+        if not isinstance(items, list) or not all(isinstance(item, str) for item in items):
+            return polynomial, record_steps, items, 'items必须是字符串列表'
+        if len(items) > CRC_BATCH_MAX_ITEMS:
+            return polynomial, record_steps, items, f'一次最多处理{CRC_BATCH_MAX_ITEMS}条数据'
+        if sum(len(item) for item in items) > CRC_MAX_DATA_BITS:
+            return polynomial, record_steps, items, f'数据总长度不能超过{CRC_MAX_DATA_BITS}位'
+
+    return polynomial, record_steps, items, None
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def crc_calculate_api(request):
-    """CRC计算API"""
+    """CRC计算API（record_steps=false时快速计算，传入items时批量计算）"""
     try:
         data = json.loads(request.body)
-        data_bits = data.get('data_bits', '').strip()
-        polynomial = data.get('polynomial', '1011').strip()
+        polynomial, record_steps, items, error = _parse_crc_options(data)
 
-        # 输入验证
-        if not data_bits:
+        if error:
             return JsonResponse({
                 'success': False,
-                'error': '请输入要计算CRC的数据'
-            })
+                'error': error
+            }, status=400)
 
-        if not polynomial:
-            return JsonResponse({
-                'success': False,
-                'error': '请输入生成多项式'
-            })
+        crc = CRCChecker(polynomial)
 
-        if not all(bit in '01' for bit in data_bits):
+        # 批量计算
+        if items is not None:
+            results = crc.calculate_batch([item.strip() for item in items])
+            logger.info(f"CRC批量计算完成: {len(results)}条, 多项式 {polynomial}")
             return JsonResponse({
-                'success': False,
-                'error': '数据只能包含0和1'
+                'success': True,
+                'results': results,
+                'crc_length': crc.crc_length
             })
 
-        if not all(bit in '01' for bit in polynomial):
+        data_bits = data.get('data_bits', '').strip()
+        max_data_bits = CRC_STEP_MAX_DATA_BITS if record_steps else CRC_MAX_DATA_BITS
+
+        # 输入验证
+        if not data_bits:
             return JsonResponse({
                 'success': False,
-                'error': '生成多项式只能包含0和1'
+                'error': '请输入要计算CRC的数据'
             })
 
-        if len(data_bits) > 20:
+        if not is_binary_string(data_bits):
             return JsonResponse({
                 'success': False,
-                'error': '数据长度不能超过20位'
+                'error': '数据只能包含0和1'
             })
 
-        if len(polynomial) < 2 or len(polynomial) > 10:
+        if len(data_bits) > max_data_bits:
             return JsonResponse({
                 'success': False,
-                'error': '生成多项式长度应在2-10位之间'
+                'error': f'数据长度不能超过{max_data_bits}位'
             })
 
         # 执行CRC计算
-        crc = CRCChecker(polynomial)
-        result, steps = crc.calculate_crc(data_bits)
+        result, steps = crc.calculate_crc(data_bits, record_steps=record_steps)
 
         if result is None:
             return JsonResponse({
@@ -783,7 +929,7 @@ def crc_calculate_api(request):
                 'error': 'CRC计算失败'
             })
 
-        logger.info(f"CRC计算成功: {data_bits} + {polynomial} -> {result}")
+        logger.info(f"CRC计算成功: {len(data_bits)}位数据 + {polynomial} -> {result}")
 
         return JsonResponse({
             'success': True,
@@ -809,49 +955,61 @@ def crc_calculate_api(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 def crc_verify_api(request):
-    """CRC验证API"""
+    """CRC验证API（record_steps=false时快速验证，传入items时批量验证）"""
     try:
         data = json.loads(request.body)
-        data_with_crc = data.get('data_with_crc', '').strip()
-        polynomial = data.get('polynomial', '1011').strip()
+        polynomial, record_steps, items, error = _parse_crc_options(data)
 
-        # 输入验证
-        if not data_with_crc:
+        if error:
             return JsonResponse({
                 'success': False,
-                'error': '请输入要验证的数据（含CRC）'
+                'error': error
+            }, status=400)
+
+        crc = CRCChecker(polynomial)
+        crc_length = crc.crc_length
+
+        # 批量验证
+        if items is not None:
+            results = crc.verify_batch([item.strip() for item in items])
+            logger.info(f"CRC批量验证完成: {len(results)}条, 多项式 {polynomial}")
+            return JsonResponse({
+                'success': True,
+                'results': results,
+                'crc_length': crc_length
             })
 
-        if not polynomial:
+        data_with_crc = data.get('data_with_crc', '').strip()
+
+        # 输入验证
+        if not data_with_crc:
             return JsonResponse({
                 'success': False,
-                'error': '请输入生成多项式'
+                'error': '请输入要验证的数据（含CRC）'
             })
 
-        if not all(bit in '01' for bit in data_with_crc):
+        if not is_binary_string(data_with_crc):
             return JsonResponse({
                 'success': False,
                 'error': '数据只能包含0和1'
             })
 
-        if not all(bit in '01' for bit in polynomial):
+        if len(data_with_crc) <= crc_length:
             return JsonResponse({
                 'success': False,
-                'error': '生成多项式只能包含0和1'
+                'error': f'数据长度必须大于{crc_length}位'
             })
 
-        crc_length = len(polynomial) - 1
-        if len(data_with_crc) <= crc_length:
+        if not record_steps and len(data_with_crc) > CRC_MAX_DATA_BITS + crc_length:
             return JsonResponse({
                 'success': False,
-                'error': f'数据长度必须大于{crc_length}位'
+                'error': f'数据长度不能超过{CRC_MAX_DATA_BITS + crc_length}位'
             })
 
         # 执行CRC验证
-        crc = CRCChecker(polynomial)
-        is_valid, steps = crc.verify_crc(data_with_crc)
+        is_valid, steps = crc.verify_crc(data_with_crc, record_steps=record_steps)
 
-        logger.info(f"CRC验证完成: {data_with_crc} + {polynomial} -> {'有效' if is_valid else '无效'}")
+        logger.info(f"CRC验证完成: {len(data_with_crc)}位数据 + {polynomial} -> {'有效' if is_valid else '无效'}")
 
         return JsonResponse({
             'success': True,
@@ -876,15 +1034,18 @@ def crc_verify_api(request):
 
 # ========== 单链表相关API ==========
 
-# 全局变量存储用户的链表状态（实际项目中应该使用session或数据库）
-user_lists = {}
+# 单链表最大节点数（限制每个会话保存的状态大小）
+LINKED_LIST_MAX_NODES = 100
 
 
 def get_user_list(session_key):
-    """获取用户的链表实例"""
-    if session_key not in user_lists:
-        user_lists[session_key] = SingleLinkedList()
-    return user_lists[session_key]
+    """获取用户的链表实例（按会话保存在共享缓存中）"""
+    return structure_store.load(session_key, 'single_linklist')
+
+
+def save_user_list(session_key, linked_list):
+    """保存修改后的链表"""
+    structure_store.save(session_key, linked_list, 'single_linklist')
 
 
 # 修复后的视图API函数
@@ -935,6 +1096,12 @@ def linked_list_add_api(request):
 
         linked_list = get_user_list(session_key)
 
+        if LINKED_LIST_MAX_NODES <= linked_list.get_size():
+            return JsonResponse({
+                'success': False,
+                'error': f'链表节点数不能超过{LINKED_LIST_MAX_NODES}个'
+            })
+
         # 执行添加操作
         if add_type == 'head':
             success, steps = linked_list.add_head(value)
@@ -969,6 +1136,8 @@ def linked_list_add_api(request):
                 'steps': steps
             })
 
+        save_user_list(session_key, linked_list)
+
         logger.info(f"单链表添加成功: {add_type} 添加 {value}")
 
         # 获取步骤的动画数据
@@ -1085,6 +1254,8 @@ def linked_list_delete_api(request):
                 'steps': steps
             })
 
+        save_user_list(session_key, linked_list)
+
         logger.info(f"单链表删除成功: {delete_type} 删除 {deleted_value}")
 
         # 获取步骤的动画数据
@@ -1171,6 +1342,12 @@ def linked_list_insert_api(request):
 
         linked_list = get_user_list(session_key)
 
+        if LINKED_LIST_MAX_NODES <= linked_list.get_size():
+            return JsonResponse({
+                'success': False,
+                'error': f'链表节点数不能超过{LINKED_LIST_MAX_NODES}个'
+            })
+
         # 执行插入操作
         if insert_type == 'before':
             success, steps = linked_list.insert_before_value(target_value, new_value)
@@ -1184,6 +1361,8 @@ def linked_list_insert_api(request):
                 'steps': steps
             })
 
+        save_user_list(session_key, linked_list)
+
         logger.info(f"单链表插入成功: 在 {target_value} {insert_type} 插入 {new_value}")
 
         # 获取步骤的动画数据
@@ -1297,8 +1476,8 @@ def linked_list_clear_api(request):
             request.session.create()
             session_key = request.session.session_key
 
-        # 重新创建一个空链表
-        user_lists[session_key] = SingleLinkedList()
+        # 删除保存的链表，下次访问时为空链表
+        structure_store.delete(session_key, 'single_linklist')
 
         logger.info(f"单链表清空成功")
 
@@ -1610,6 +1789,7 @@ def daily_term(request):
         'today_term': today_term,
         'history_terms': history_terms,
         'current_date': timezone.now().date(),
+        'chat_content': today_term.get_chat_content() if today_term else None,
     }
 
     return render(request, 'knowledge_app/daily_term.html', context)
@@ -1617,7 +1797,8 @@ def daily_term(request):
 
 def daily_term_detail(request, term_id):
     """名词详情页面"""
-    term = get_object_or_404(DailyTerm, id=term_id)
+    # 草稿和预生成的名词在发布之前不可访问
+    term = get_object_or_404(DailyTerm.objects.filter(status__in=DailyTerm.PUBLISHED_STATUSES), id=term_id)
 
     # 增加浏览次数
     term.increment_view_count()
@@ -1644,114 +1825,28 @@ def daily_term_detail(request, term_id):
 @require_http_methods(["GET"])
 def export_daily_term_pdf(request, term_id):
     """导出每日名词PDF"""
-    term = get_object_or_404(DailyTerm, id=term_id)
+    term = get_object_or_404(DailyTerm.objects.filter(status__in=DailyTerm.PUBLISHED_STATUSES), id=term_id)
 
     import logging
     logger = logging.getLogger(__name__)
 
     try:
-        import io
         from django.http import HttpResponse
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
         from reportlab.lib.units import cm
-        from reportlab.pdfbase import pdfmetrics
-        from reportlab.pdfbase.ttfonts import TTFont
         from reportlab.lib import colors
-        from django.conf import settings
         from django.utils import timezone
+        from .services.pdf_toolkit import pdf_toolkit
 
         logger.info(f"开始导出每日名词PDF: {term.term} (ID: {term_id})")
 
-        # 注册中文字体
-        try:
-            import platform
-            if platform.system() == 'Windows':
-                font_paths = [
-                    'C:/Windows/Fonts/msyh.ttc',  # 微软雅黑
-                    'C:/Windows/Fonts/simhei.ttf',  # 黑体
-                    'C:/Windows/Fonts/simsun.ttc',  # 宋体
-                ]
-            else:
-                font_paths = [
-                    '/System/Library/Fonts/PingFang.ttc',  # Mac
-                    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',  # Linux
-                ]
-
-            chinese_font_registered = False
-            for font_path in font_paths:
-                try:
-                    import os
-                    if os.path.exists(font_path):
-                        pdfmetrics.registerFont(TTFont('ChineseFont', font_path))
-                        chinese_font_registered = True
-                        break
-                except:
-                    continue
-
-            if not chinese_font_registered:
-                chinese_font_name = 'Helvetica'
-            else:
-                chinese_font_name = 'ChineseFont'
-
-        except Exception as e:
-            logger.warning(f"字体注册失败，使用默认字体: {e}")
-            chinese_font_name = 'Helvetica'
-
-        # 创建PDF
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            rightMargin=2*cm,
-            leftMargin=2*cm,
-            topMargin=2*cm,
-            bottomMargin=2*cm
-        )
-
-        # 获取样式并创建中文样式
-        styles = getSampleStyleSheet()
-
-        # 创建支持中文的样式
-        title_style = ParagraphStyle(
-            'ChineseTitle',
-            parent=styles['Title'],
-            fontName=chinese_font_name,
-            fontSize=24,
-            spaceAfter=20,
-            textColor=colors.HexColor('#2c3e50'),
-            alignment=1,  # 居中
-        )
-
-        heading_style = ParagraphStyle(
-            'ChineseHeading',
-            parent=styles['Heading2'],
-            fontName=chinese_font_name,
-            fontSize=16,
-            spaceAfter=12,
-            spaceBefore=16,
-            textColor=colors.HexColor('#34495e'),
-        )
-
-        normal_style = ParagraphStyle(
-            'ChineseNormal',
-            parent=styles['Normal'],
-            fontName=chinese_font_name,
-            fontSize=12,
-            spaceAfter=8,
-            leading=18,
-            textColor=colors.HexColor('#2c3e50'),
-        )
-
-        meta_style = ParagraphStyle(
-            'ChineseMeta',
-            parent=styles['Normal'],
-            fontName=chinese_font_name,
-            fontSize=10,
-            spaceAfter=6,
-            textColor=colors.HexColor('#7f8c8d'),
-        )
+        # 字体和样式在进程内只初始化一次
+        chinese_font_name = pdf_toolkit.font_name
+        sheet = pdf_toolkit.stylesheet('daily_term')
+        title_style = sheet['title']
+        heading_style = sheet['heading']
+        normal_style = sheet['normal']
+        meta_style = sheet['meta']
 
         story = []
 
@@ -1821,10 +1916,7 @@ def export_daily_term_pdf(request, term_id):
         story.append(Paragraph(footer_text, meta_style))
 
         # 构建PDF
-        doc.build(story)
-        buffer.seek(0)
-        pdf_content = buffer.getvalue()
-        buffer.close()
+        pdf_content = pdf_toolkit.render(story)
 
         logger.info("每日名词PDF内容生成成功")
 
@@ -1908,7 +2000,7 @@ def daily_term_history(request):
 def daily_term_like(request, term_id):
     """点赞名词"""
     try:
-        term = get_object_or_404(DailyTerm, id=term_id)
+        term = get_object_or_404(DailyTerm.objects.filter(status__in=DailyTerm.PUBLISHED_STATUSES), id=term_id)
         term.increment_like_count()
 
         return JsonResponse({
@@ -1968,6 +2060,19 @@ def generate_exercises(request):
                 'message': '缺少知识点参数'
             })
 
+        # 只接受内置的知识点和难度，任意字符串会进入任务队列和题池补充，消耗AI额度
+        from .services.exercise_generator_service import ExerciseGeneratorClient
+        if not isinstance(knowledge_point, str) or knowledge_point not in ExerciseGeneratorClient.KNOWLEDGE_PROMPTS:
+            return JsonResponse({
+                'success': False,
+                'message': '不支持的知识点'
+            })
+        if difficulty not in ExerciseGeneratorClient.DIFFICULTIES:
+            return JsonResponse({
+                'success': False,
+                'message': '难度参数错误'
+            })
+
         # 检查用户是否登录
         if not request.user.is_authenticated:
             return JsonResponse({
@@ -1975,18 +2080,14 @@ def generate_exercises(request):
                 'message': '请先登录'
             })
 
-        from .services.exercise_generator_service import ExerciseGeneratorService
-        service = ExerciseGeneratorService()
-
-        # 生成练习会话
-        session = service.generate_exercise_session(
-            user=request.user,
-            knowledge_point=knowledge_point,
-            difficulty=difficulty,
-            count=count
-        )
+        from .services.exercise_job_queue import exercise_job_queue
+        from .services.exercise_pool import exercise_pool
 
-        if session:
+        # 优先从预生成题池取题，直接创建练习会话
+        count = min(max(int(count), 1), exercise_job_queue.MAX_COUNT)
+        exercises = exercise_pool.draw(knowledge_point, difficulty, count)
+        if exercises:
+            session = exercise_job_queue.service.create_session(request.user, knowledge_point, difficulty, exercises)
             return JsonResponse({
                 'success': True,
                 'data': {
@@ -1997,12 +2098,28 @@ def generate_exercises(request):
                     'started_at': session.started_at.isoformat()
                 }
             })
-        else:
-            return JsonResponse({
-                'success': False,
-                'message': '生成练习题失败，请稍后重试'
-            })
 
+        # 题池不足时写入任务队列后立即返回，由工作进程调用AI生成
+        job = exercise_job_queue.enqueue(
+            user=request.user,
+            knowledge_point=knowledge_point,
+            difficulty=difficulty,
+            count=count
+        )
+
+        return JsonResponse({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': reverse('knowledge_app:exercise_job_status', args=[job.id]),
+            'stream_url': reverse('knowledge_app:exercise_job_stream', args=[job.id])
+        }, status=202)
+
+    except (TypeError, ValueError):
+        return JsonResponse({
+            'success': False,
+            'message': '题目数量参数错误'
+        })
     except json.JSONDecodeError:
         return JsonResponse({
             'success': False,
@@ -2016,6 +2133,57 @@ def generate_exercises(request):
         })
 
 
+@require_http_methods(["GET"])
+def exercise_job_status(request, job_id):
+    """查询练习生成任务状态（轮询）"""
+    if not request.user.is_authenticated:
+        return JsonResponse({'success': False, 'message': '请先登录'}, status=401)
+
+    from .services.exercise_job_queue import exercise_job_queue
+
+    result = exercise_job_queue.get_status(job_id, request.user)
+    if result is None:
+        return JsonResponse({'success': False, 'message': '任务不存在'}, status=404)
+
+    return JsonResponse({'success': True, **result})
+
+
+async def exercise_job_stream(request, job_id):
+    """推送练习生成任务状态（SSE），任务结束后关闭连接"""
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    from .services.exercise_job_queue import exercise_job_queue
+
+    user = await sync_to_async(lambda: request.user if request.user.is_authenticated else None)()
+    if user is None:
+        return JsonResponse({'success': False, 'message': '请先登录'}, status=401)
+
+    get_status = sync_to_async(exercise_job_queue.get_status)
+    if await get_status(job_id, user) is None:
+        return JsonResponse({'success': False, 'message': '任务不存在'}, status=404)
+
+    async def event_stream():
+        last_status = None
+        deadline = time.monotonic() + 300
+        while time.monotonic() < deadline:
+            result = await get_status(job_id, user)
+            if result['status'] != last_status:
+                last_status = result['status']
+                event = result['status'] if last_status in ('completed', 'failed') else 'status'
+                yield f"event: {event}\ndata: {json.dumps(result, ensure_ascii=False)}\n\n"
+                if event != 'status':
+                    return
+            else:
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(1)
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def submit_exercise_answers(request):
@@ -2496,26 +2664,95 @@ def chat_about_term(request):
         })
 
 
+async def chat_about_term_stream(request):
+    """与GLM聊天机器人讨论名词（SSE流式返回）"""
+    # Django 4.2 的 require_http_methods / csrf_exempt 装饰器不支持异步视图，这里手动处理
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'success': False,
+            'error': '请求数据格式错误'
+        })
+
+    term = data.get('term')
+    term_explanation = data.get('explanation')
+    user_question = data.get('question')
+    theme = data.get('theme', 'friendly')
+
+    if not all([term, term_explanation, user_question]):
+        return JsonResponse({
+            'success': False,
+            'error': '缺少必要参数'
+        })
+
+    from .services.glm_chatbot_service import GLMChatbotService
+    service = GLMChatbotService()
+
+    if not service.is_available():
+        return JsonResponse({
+            'success': False,
+            'error': 'GLM聊天服务暂时不可用，请检查API配置'
+        })
+
+    user_id = await sync_to_async(
+        lambda: request.user.id if request.user.is_authenticated else None
+    )()
+
+    async def event_stream():
+        async for event, payload in service.stream_about_term(term, term_explanation, user_question, user_id, theme):
+            yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # 禁止Nginx缓冲，保证token实时到达浏览器
+    return response
+
+
+chat_about_term_stream.csrf_exempt = True
+
+
 @require_http_methods(["GET"])
 def get_suggested_questions(request):
-    """获取推荐问题"""
+    """获取推荐问题（读取名词生成时预先保存的内容，不实时调用AI）"""
     try:
+        term_id = request.GET.get('term_id')
         term = request.GET.get('term')
-        term_explanation = request.GET.get('explanation')
 
-        if not all([term, term_explanation]):
+        if not (term_id or term):
             return JsonResponse({
                 'success': False,
                 'error': '缺少必要参数'
             })
 
+        terms = DailyTerm.objects.filter(status='active')
+        if term_id:
+            daily_term = terms.filter(id=term_id).first()
+        else:
+            daily_term = terms.filter(term=term).order_by('-display_date').first()
+
         from .services.glm_chatbot_service import GLMChatbotService
-        service = GLMChatbotService()
 
-        # 获取推荐问题
-        result = service.get_suggested_questions(term, term_explanation)
+        chat_content = daily_term.get_chat_content() if daily_term else None
+        if chat_content and chat_content['suggested_questions']:
+            questions = chat_content['suggested_questions']
+            return JsonResponse({
+                'success': True,
+                'questions': questions,
+                'count': len(questions),
+                'quick_start': chat_content['quick_start']
+            })
 
-        return JsonResponse(result)
+        questions = GLMChatbotService.get_default_questions(daily_term.term if daily_term else term)
+        return JsonResponse({
+            'success': True,
+            'questions': questions,
+            'count': len(questions),
+            'is_default': True
+        })
 
     except Exception as e:
         logger.error(f"Get suggested questions error: {e}")
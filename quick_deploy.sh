@@ -104,7 +104,7 @@ pip install --upgrade pip -q
 if [ -f "requirements.txt" ]; then
     pip install -r requirements.txt -q
 else
-    pip install django mysqlclient gunicorn redis python-dotenv -q
+    pip install django mysqlclient gunicorn uvicorn aiohttp redis python-dotenv numpy -q
 fi
 
 # 步骤7：创建配置文件
@@ -125,6 +125,7 @@ EOF
 echo -e "${BLUE}🔄 步骤8/10: 初始化数据库...${NC}"
 python manage.py makemigrations --settings=cs_learning_platform.settings_production
 python manage.py migrate --settings=cs_learning_platform.settings_production
+python manage.py createcachetable --settings=cs_learning_platform.settings_production
 python manage.py collectstatic --noinput --settings=cs_learning_platform.settings_production
 
 # 步骤9：配置系统服务
@@ -141,13 +142,37 @@ User=www-data
 Group=www-data
 WorkingDirectory=$PROJECT_DIR
 Environment="PATH=$PROJECT_DIR/venv/bin"
-ExecStart=$PROJECT_DIR/venv/bin/gunicorn --workers 3 --bind unix:$PROJECT_DIR/cs_learning_platform.sock cs_learning_platform.wsgi:application
+ExecStart=$PROJECT_DIR/venv/bin/gunicorn --workers 3 --worker-class uvicorn.workers.UvicornWorker --bind unix:$PROJECT_DIR/cs_learning_platform.sock cs_learning_platform.asgi:application
 Restart=always
 
 [Install]
 WantedBy=multi-user.target
 EOF
 
+# 创建AI练习生成工作进程服务：练习池未命中时生成任务进入队列，由它领取执行
+cat > /etc/systemd/system/cs_learning_platform_worker.service << EOF
+[Unit]
+Description=CS Learning Platform AI Exercise Worker
+After=network.target
+
+[Service]
+User=www-data
+Group=www-data
+WorkingDirectory=$PROJECT_DIR
+Environment="PATH=$PROJECT_DIR/venv/bin"
+Environment="DJANGO_SETTINGS_MODULE=cs_learning_platform.settings_production"
+ExecStart=$PROJECT_DIR/venv/bin/python manage.py run_exercise_worker --processes 2
+# 主进程收到SIGINT后通知子进程做完当前任务再退出
+KillSignal=SIGINT
+KillMode=mixed
+TimeoutStopSec=300
+Restart=always
+RestartSec=10
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
 # 配置Nginx
 NGINX_CONFIG="/etc/nginx/sites-available/cs_learning_platform"
 if [ -n "$DOMAIN" ]; then
@@ -206,12 +231,14 @@ chmod -R 755 $PROJECT_DIR
 systemctl daemon-reload
 systemctl enable cs_learning_platform
 systemctl start cs_learning_platform
+systemctl enable cs_learning_platform_worker
+systemctl start cs_learning_platform_worker
 systemctl enable nginx
 systemctl restart nginx
 
 # 检查服务状态
 sleep 3
-if systemctl is-active --quiet cs_learning_platform && systemctl is-active --quiet nginx; then
+if systemctl is-active --quiet cs_learning_platform && systemctl is-active --quiet cs_learning_platform_worker && systemctl is-active --quiet nginx; then
     echo ""
     echo -e "${GREEN}🎉 部署成功！${NC}"
     echo ""
@@ -240,9 +267,11 @@ if systemctl is-active --quiet cs_learning_platform && systemctl is-active --qui
 else
     echo -e "${RED}❌ 部署失败，请检查错误日志：${NC}"
     echo "Django服务状态: $(systemctl is-active cs_learning_platform)"
+    echo "练习生成工作进程状态: $(systemctl is-active cs_learning_platform_worker)"
     echo "Nginx服务状态: $(systemctl is-active nginx)"
     echo ""
     echo "查看详细日志："
     echo "sudo journalctl -u cs_learning_platform -f"
+    echo "sudo journalctl -u cs_learning_platform_worker -f"
     echo "sudo tail -f /var/log/nginx/error.log"
 fi
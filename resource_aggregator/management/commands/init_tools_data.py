@@ -4,6 +4,7 @@
 """
 
 from django.core.management.base import BaseCommand
+from django.db.models import Q
 from resource_aggregator.models import ResourceCategory, ResourceSource, LearningResource
 from resource_aggregator.config import DEFAULT_CATEGORIES, DEFAULT_RESOURCES
 from resource_aggregator.extended_resources import EXTENDED_RESOURCES
@@ -122,9 +123,9 @@ class Command(BaseCommand):
                     )
                     continue
                 
-                # 检查是否已存在
+                # 检查是否已存在（URL唯一，不同名称的同一工具只创建一次）
                 existing = LearningResource.objects.filter(
-                    title=resource_data['title']
+                    Q(title=resource_data['title']) | Q(url=resource_data['url'])
                 ).first()
                 
                 if not existing:
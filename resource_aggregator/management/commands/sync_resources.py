@@ -98,9 +98,9 @@ class Command(BaseCommand):
             # 保存到数据库
             if save_to_db and not dry_run:
                 self.stdout.write('正在保存到数据库...')
-                aggregator_service.save_resources_to_db(results, category_slug)
+                saved = aggregator_service.save_resources_to_db(results, category_slug)
                 self.stdout.write(
-                    self.style.SUCCESS('资源已保存到数据库')
+                    self.style.SUCCESS(f"资源已保存到数据库（新增 {saved['created']} 个，更新 {saved['updated']} 个）")
                 )
             elif dry_run:
                 self.stdout.write(
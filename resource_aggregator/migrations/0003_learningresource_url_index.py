@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resource_aggregator', '0002_alter_resourcecategory_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='learningresource',
+            index=models.Index(fields=['url'], name='resource_ag_url_3cf898_idx'),
+        ),
+    ]
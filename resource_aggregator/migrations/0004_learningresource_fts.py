@@ -0,0 +1,91 @@
+"""
+为学习资源建立SQLite FTS5全文索引（trigram分词），由触发器与资源表保持同步。
+非SQLite数据库或SQLite不支持FTS5 trigram时跳过，搜索退回icontains。
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+import resource_aggregator.models
+
+FTS_TABLE = 'resource_aggregator_learningresource_fts'
+CONTENT_TABLE = 'resource_aggregator_learningresource'
+
+CREATE_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, author,
+        content='{CONTENT_TABLE}', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, author)
+        VALUES (new.id, new.title, new.description, new.author);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, author)
+        VALUES ('delete', old.id, old.title, old.description, old.author);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description, author ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, author)
+        VALUES ('delete', old.id, old.title, old.description, old.author);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, author)
+        VALUES (new.id, new.title, new.description, new.author);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def fts5_supported(schema_editor) -> bool:
+    if schema_editor.connection.vendor != 'sqlite':
+        return False
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x, tokenize='trigram')")
+            cursor.execute("DROP TABLE temp.fts5_probe")
+            return True
+        except Exception:
+            return False
+
+
+def create_index(apps, schema_editor):
+    if not fts5_supported(schema_editor):
+        return
+    for sql in CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resource_aggregator', '0003_learningresource_url_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LearningResourceSearchDocument',
+            fields=[
+                ('resource', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='resource_aggregator.learningresource')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('author', models.TextField()),
+                ('document', resource_aggregator.models.FullTextField(db_column='resource_aggregator_learningresource_fts')),
+            ],
+            options={
+                'db_table': 'resource_aggregator_learningresource_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
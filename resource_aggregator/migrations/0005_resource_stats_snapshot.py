@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_achievement_knowledgepoint_studysession_and_more'),
+        ('resource_aggregator', '0004_learningresource_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceStatsSnapshot',
+            fields=[
+                ('key', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='快照键')),
+                ('payload', models.JSONField(default=dict, verbose_name='统计数据')),
+                ('computed_at', models.DateTimeField(verbose_name='计算时间')),
+                ('is_dirty', models.BooleanField(default=False, verbose_name='待刷新')),
+            ],
+            options={
+                'verbose_name': '资源统计快照',
+                'verbose_name_plural': '资源统计快照',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserResourceStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resource_stats', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+                ('viewed_count', models.IntegerField(default=0, verbose_name='查看数')),
+                ('liked_count', models.IntegerField(default=0, verbose_name='点赞数')),
+                ('bookmarked_count', models.IntegerField(default=0, verbose_name='收藏数')),
+                ('computed_at', models.DateTimeField(verbose_name='全量计算时间')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '用户资源统计',
+                'verbose_name_plural': '用户资源统计',
+            },
+        ),
+    ]
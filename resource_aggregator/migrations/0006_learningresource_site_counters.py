@@ -0,0 +1,59 @@
+# Generated by Django 4.2.7 on 2026-10-18 23:06
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+fts = import_module('resource_aggregator.migrations.0004_learningresource_fts')
+
+COUNTER_FIELDS = {
+    'view': 'site_view_count',
+    'like': 'site_like_count',
+    'bookmark': 'site_bookmark_count',
+}
+
+
+def backfill_counters(apps, schema_editor):
+    """按已有交互记录回填资源的站内计数"""
+    LearningResource = apps.get_model('resource_aggregator', 'LearningResource')
+    UserResourceInteraction = apps.get_model('resource_aggregator', 'UserResourceInteraction')
+
+    updates = {}
+    for action, field in COUNTER_FIELDS.items():
+        counts = UserResourceInteraction.objects.filter(
+            resource=OuterRef('pk'), action=action
+        ).order_by().values('resource').annotate(total=Count('id')).values('total')
+        updates[field] = Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+    LearningResource.objects.filter(
+        id__in=UserResourceInteraction.objects.values('resource')
+    ).update(**updates)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resource_aggregator', '0005_resource_stats_snapshot'),
+    ]
+
+    operations = [
+        # 回滚时删除字段会重建资源表并丢失FTS5触发器，最后（即本操作的反向）重新创建
+        migrations.RunPython(migrations.RunPython.noop, fts.create_index),
+        migrations.AddField(
+            model_name='learningresource',
+            name='site_bookmark_count',
+            field=models.IntegerField(default=0, verbose_name='站内收藏数'),
+        ),
+        migrations.AddField(
+            model_name='learningresource',
+            name='site_like_count',
+            field=models.IntegerField(default=0, verbose_name='站内点赞数'),
+        ),
+        migrations.AddField(
+            model_name='learningresource',
+            name='site_view_count',
+            field=models.IntegerField(default=0, verbose_name='站内查看数'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+"""
+0006 在SQLite上为新增字段重建了资源表，重建会删除表上的触发器，
+导致FTS5索引不再同步。这里重新创建0004的触发器并重建索引。
+以后再修改资源表结构时，也需要在迁移后执行 restore_search_index。
+"""
+
+from importlib import import_module
+
+from django.db import migrations
+
+fts = import_module('resource_aggregator.migrations.0004_learningresource_fts')
+
+
+def restore_search_index(apps, schema_editor):
+    """重新创建FTS5触发器并重建索引（非SQLite或不支持FTS5时跳过）"""
+    fts.create_index(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resource_aggregator', '0006_learningresource_site_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+"""
+资源URL改为唯一约束，批量同步改用 bulk_create(update_conflicts=True) 插入或更新，
+并发同步不会再插入重复URL。
+已有的重复URL只保留最早的一条，其余资源的交互记录合并过去后删除。
+SQLite上修改字段会重建资源表并删除FTS5触发器，最后重新创建（见0007）。
+"""
+
+from importlib import import_module
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+fts = import_module('resource_aggregator.migrations.0004_learningresource_fts')
+counters = import_module('resource_aggregator.migrations.0006_learningresource_site_counters')
+
+
+def merge_duplicate_urls(apps, schema_editor):
+    """同一URL只保留id最小的资源，其他资源的交互记录（用户和操作不重复的）转移到保留的资源"""
+    LearningResource = apps.get_model('resource_aggregator', 'LearningResource')
+    UserResourceInteraction = apps.get_model('resource_aggregator', 'UserResourceInteraction')
+
+    duplicates = (
+        LearningResource.objects.order_by().values('url')
+        .annotate(total=Count('id'), keep=Min('id')).filter(total__gt=1)
+    )
+    merged = False
+    for row in duplicates:
+        keep = row['keep']
+        others = list(
+            LearningResource.objects.filter(url=row['url']).exclude(id=keep).values_list('id', flat=True)
+        )
+        seen = set(UserResourceInteraction.objects.filter(resource_id=keep).values_list('user_id', 'action'))
+        for interaction in UserResourceInteraction.objects.filter(resource_id__in=others).order_by('created_at'):
+            if (interaction.user_id, interaction.action) in seen:
+                continue
+            seen.add((interaction.user_id, interaction.action))
+            interaction.resource_id = keep
+            interaction.save(update_fields=['resource'])
+
+        LearningResource.objects.filter(id__in=others).delete()
+        merged = True
+
+    if merged:
+        counters.backfill_counters(apps, schema_editor)
+
+
+def restore_search_index(apps, schema_editor):
+    """重新创建FTS5触发器并重建索引（非SQLite或不支持FTS5时跳过）"""
+    fts.create_index(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resource_aggregator', '0007_restore_fts_triggers'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_urls, migrations.RunPython.noop),
+        # 回滚时修改字段同样会重建资源表，最后（即本操作的反向）重新创建触发器
+        migrations.RunPython(migrations.RunPython.noop, restore_search_index),
+        migrations.RemoveIndex(
+            model_name='learningresource',
+            name='resource_ag_url_3cf898_idx',
+        ),
+        migrations.AlterField(
+            model_name='learningresource',
+            name='url',
+            field=models.URLField(unique=True, verbose_name='官方链接'),
+        ),
+        migrations.RunPython(restore_search_index, migrations.RunPython.noop),
+    ]
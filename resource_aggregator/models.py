@@ -87,7 +87,7 @@ class LearningResource(models.Model):
     title = models.CharField(max_length=300, verbose_name="工具/资源名称")
     description = models.TextField(verbose_name="详细描述")
     short_description = models.CharField(max_length=200, blank=True, verbose_name="简短描述")
-    url = models.URLField(verbose_name="官方链接")
+    url = models.URLField(unique=True, verbose_name="官方链接")
     thumbnail = models.URLField(blank=True, verbose_name="图标/截图")
 
     # 工具特性
@@ -111,6 +111,11 @@ class LearningResource(models.Model):
     view_count = models.IntegerField(default=0, verbose_name="观看数")
     like_count = models.IntegerField(default=0, verbose_name="点赞数")
     
+    # 站内互动计数（随交互记录增删原子更新，view_count/like_count为来源平台的数据）
+    site_view_count = models.IntegerField(default=0, verbose_name="站内查看数")
+    site_like_count = models.IntegerField(default=0, verbose_name="站内点赞数")
+    site_bookmark_count = models.IntegerField(default=0, verbose_name="站内收藏数")
+    
     # 元数据
     author = models.CharField(max_length=200, blank=True, verbose_name="作者")
     duration = models.CharField(max_length=50, blank=True, verbose_name="时长")
@@ -156,6 +161,36 @@ class LearningResource(models.Model):
             self.save()
 
 
+class FullTextField(models.TextField):
+    """FTS5虚拟表中与表同名的隐藏列，支持 __match 全文查询"""
+
+
+@FullTextField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+class LearningResourceSearchDocument(models.Model):
+    """学习资源全文索引（SQLite FTS5虚拟表，由迁移创建、触发器同步，只读）"""
+    resource = models.OneToOneField(
+        LearningResource, on_delete=models.DO_NOTHING, primary_key=True,
+        db_column='rowid', related_name='search_document'
+    )
+    title = models.TextField()
+    description = models.TextField()
+    author = models.TextField()
+    document = FullTextField(db_column='resource_aggregator_learningresource_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'resource_aggregator_learningresource_fts'
+
+
 class UserResourceInteraction(models.Model):
     """用户资源交互记录"""
     ACTION_CHOICES = [
@@ -218,6 +253,41 @@ class ResourceCache(models.Model):
         )
     
     @classmethod
-    def clear_expired(cls):
-        """清理过期缓存"""
-        cls.objects.filter(expires_at__lt=timezone.now()).delete()
+    def clear_expired(cls) -> int:
+        """清理过期缓存，返回删除的记录数"""
+        return cls.objects.filter(expires_at__lt=timezone.now()).delete()[0]
+
+
+class ResourceStatsSnapshot(models.Model):
+    """资源统计快照（物化的统计结果，按主键读取）"""
+    key = models.CharField(max_length=50, primary_key=True, verbose_name="快照键")
+    payload = models.JSONField(default=dict, verbose_name="统计数据")
+    computed_at = models.DateTimeField(verbose_name="计算时间")
+    is_dirty = models.BooleanField(default=False, verbose_name="待刷新")
+
+    class Meta:
+        verbose_name = "资源统计快照"
+        verbose_name_plural = "资源统计快照"
+
+    def __str__(self):
+        return f"{self.key} ({self.computed_at:%Y-%m-%d %H:%M})"
+
+
+class UserResourceStats(models.Model):
+    """用户资源交互计数（随交互记录增量更新）"""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True,
+        related_name='resource_stats', verbose_name="用户"
+    )
+    viewed_count = models.IntegerField(default=0, verbose_name="查看数")
+    liked_count = models.IntegerField(default=0, verbose_name="点赞数")
+    bookmarked_count = models.IntegerField(default=0, verbose_name="收藏数")
+    computed_at = models.DateTimeField(verbose_name="全量计算时间")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        verbose_name = "用户资源统计"
+        verbose_name_plural = "用户资源统计"
+
+    def __str__(self):
+        return f"{self.user} 资源统计"
@@ -0,0 +1,116 @@
+"""
+学习资源聚合器 - 游标分页
+按排序字段的取值定位下一页（WHERE (a, id) < (...)），不使用OFFSET，翻页代价与页码无关；
+总数只统计到上限并缓存，避免每次请求都对大表做COUNT(*)
+"""
+
+import base64
+import hashlib
+import json
+import logging
+from typing import List, Optional, Tuple
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+
+logger = logging.getLogger(__name__)
+
+COUNT_CACHE_PREFIX = 'resource_count'
+
+
+class KeysetPage:
+    """一页结果"""
+
+    def __init__(self, object_list: List, cursor: Optional[str], next_cursor: Optional[str]):
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def is_first(self) -> bool:
+        return not self.cursor
+
+
+def _encode_cursor(values: List) -> str:
+    raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, model, ordering: List[str]) -> Optional[List]:
+    """解析游标，格式不正确时返回None（视为第一页）"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            return None
+
+        decoded = []
+        for field, value in zip(ordering, values):
+            try:
+                decoded.append(model._meta.get_field(field.lstrip('-')).to_python(value))
+            except FieldDoesNotExist:
+                # 注解字段（如相关度）
+                decoded.append(value)
+        return decoded
+    except Exception:
+        return None
+
+
+def keyset_paginate(queryset: QuerySet, ordering: List[str], cursor: str = None,
+                    per_page: int = 20) -> KeysetPage:
+    """
+    游标分页
+
+    Args:
+        ordering: 排序字段，最后一个字段必须唯一（通常为id/-id），字段值不能为NULL
+        cursor: 上一页返回的next_cursor
+    """
+    queryset = queryset.order_by(*ordering)
+
+    values = _decode_cursor(cursor, queryset.model, ordering) if cursor else None
+    if values is not None:
+        # (a, b, id) 按字典序位于游标之后
+        after = Q()
+        for i, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition = Q(**{f"{field.lstrip('-')}__{lookup}": values[i]})
+            for j in range(i):
+                condition &= Q(**{ordering[j].lstrip('-'): values[j]})
+            after |= condition
+        queryset = queryset.filter(after)
+    else:
+        cursor = None
+
+    rows = list(queryset[:per_page + 1])
+    object_list = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = object_list[-1]
+        next_cursor = _encode_cursor([getattr(last, field.lstrip('-')) for field in ordering])
+    return KeysetPage(object_list, cursor, next_cursor)
+
+
+def approximate_count(queryset: QuerySet, cap: int = 1000, timeout: int = 300) -> Tuple[int, bool]:
+    """
+    统计结果数量，最多数到cap，结果按查询语句缓存
+
+    Returns:
+        (数量, 是否超过上限)
+    """
+    try:
+        key = f"{COUNT_CACHE_PREFIX}:{hashlib.md5(str(queryset.query).encode('utf-8')).hexdigest()}"
+    except Exception:
+        key = None
+
+    count = cache.get(key) if key else None
+    if count is None:
+        count = queryset.order_by()[:cap + 1].count()
+        if key:
+            cache.set(key, count, timeout)
+    return min(count, cap), count > cap
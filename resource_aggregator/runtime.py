@@ -0,0 +1,130 @@
+"""
+学习资源聚合器 - 异步运行时
+进程内只运行一个事件循环线程，每个平台复用一个带连接池的 aiohttp.ClientSession，
+并按平台限制并发与超时；同步代码通过 submit()/run() 把协程交给该循环执行
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, Optional
+
+import aiohttp
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# 平台默认参数，可通过 settings.RESOURCE_AGGREGATOR_PLATFORMS 按平台覆盖
+DEFAULT_PLATFORM_CONFIG = {
+    'timeout': 8.0,           # 单次请求总超时（秒）
+    'connect_timeout': 3.0,   # 建立连接超时（秒）
+    'max_concurrency': 4,     # 同一平台同时进行的请求数
+    'pool_size': 8,           # 连接池大小
+}
+
+
+class AggregatorRuntime:
+    """资源聚合异步运行时（进程级单例）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def platform_config(self, platform: str) -> Dict[str, Any]:
+        overrides = getattr(settings, 'RESOURCE_AGGREGATOR_PLATFORMS', {})
+        config = dict(DEFAULT_PLATFORM_CONFIG)
+        config.update(overrides.get('default', {}))
+        config.update(overrides.get(platform, {}))
+        return config
+
+    # ---------- 事件循环 ----------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None and self._thread.is_alive():
+            return self._loop
+        with self._lock:
+            if self._loop is None or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._run_loop, args=(loop,), name='resource-aggregator-loop', daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+                self._sessions.clear()
+                self._semaphores.clear()
+                logger.info("Resource aggregator runtime started")
+        return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """在运行时的事件循环中执行协程，返回concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro: Coroutine, timeout: float = None) -> Any:
+        """同步等待协程结果，超时时取消该协程并抛出TimeoutError"""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            future.cancel()
+            raise
+
+    # ---------- 连接池与并发限制（只能在事件循环线程中调用） ----------
+
+    def session(self, platform: str) -> aiohttp.ClientSession:
+        """获取平台共享的ClientSession"""
+        session = self._sessions.get(platform)
+        if session is None or session.closed:
+            config = self.platform_config(platform)
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=config['pool_size'], ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=config['timeout'], connect=config['connect_timeout']),
+            )
+            self._sessions[platform] = session
+        return session
+
+    def semaphore(self, platform: str) -> asyncio.Semaphore:
+        """获取平台的并发限制信号量"""
+        semaphore = self._semaphores.get(platform)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.platform_config(platform)['max_concurrency'])
+            self._semaphores[platform] = semaphore
+        return semaphore
+
+    # ---------- 关闭 ----------
+
+    async def _close_sessions(self):
+        for session in list(self._sessions.values()):
+            await session.close()
+        self._sessions.clear()
+
+    def shutdown(self, timeout: float = 5.0):
+        """关闭所有连接并停止事件循环"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._close_sessions(), loop).result(timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Failed to close aggregator sessions: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=timeout)
+            loop.close()
+            self._loop = self._thread = None
+            self._semaphores.clear()
+
+
+# 全局实例
+aggregator_runtime = AggregatorRuntime()
+atexit.register(aggregator_runtime.shutdown)
@@ -0,0 +1,138 @@
+"""
+学习资源聚合器 - 搜索结果缓存
+两级缓存：进程内LRU在前，数据库 ResourceCache 在后。
+结果过了新鲜期但仍在过期宽限期内时直接返回旧结果并在后台刷新；
+同一缓存键的并发未命中合并为一次抓取；过期记录由定时任务清理
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .models import ResourceCache
+
+logger = logging.getLogger(__name__)
+
+
+class SearchResultCache:
+    """搜索结果两级缓存（进程级单例）"""
+
+    LOCAL_MAX_ENTRIES = 256
+
+    def __init__(self):
+        # 新鲜期内直接返回；新鲜期后的宽限期内返回旧结果并后台刷新
+        self.fresh_ttl = getattr(settings, 'RESOURCE_SEARCH_CACHE_TTL', 3600)
+        self.stale_ttl = getattr(settings, 'RESOURCE_SEARCH_CACHE_STALE_TTL', 6 * 3600)
+        self.max_workers = getattr(settings, 'RESOURCE_SEARCH_CACHE_WORKERS', 4)
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._executor = None
+
+    # ---------- 查询 ----------
+
+    def lookup(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """查询缓存，返回(结果, 是否新鲜)；未命中或已超过宽限期返回None"""
+        entry = self._local_get(key)
+        if entry is None:
+            entry = self._db_get(key)
+            if entry is None:
+                return None
+            self._local_set(key, *entry)
+
+        fresh_until, _, payload = entry
+        return payload, fresh_until > time.time()
+
+    def _local_get(self, key: str):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return entry
+
+    def _local_set(self, key: str, fresh_until: float, expires_at: float, payload: Any):
+        with self._lock:
+            self._local[key] = (fresh_until, expires_at, payload)
+            self._local.move_to_end(key)
+            while len(self._local) > self.LOCAL_MAX_ENTRIES:
+                self._local.popitem(last=False)
+
+    def _db_get(self, key: str):
+        """数据库中的expires_at是宽限期结束时间，新鲜期结束时间由此推算"""
+        try:
+            row = ResourceCache.objects.filter(cache_key=key).values_list('data', 'expires_at').first()
+        except Exception as e:
+            logger.warning(f"Failed to read resource cache {key}: {e}")
+            return None
+
+        if row is None:
+            return None
+        data, expires_at = row
+        expires_at = expires_at.timestamp()
+        if expires_at <= time.time():
+            return None
+        return expires_at - self.stale_ttl, expires_at, data
+
+    # ---------- 写入 ----------
+
+    def store(self, key: str, payload: Any):
+        now = time.time()
+        self._local_set(key, now + self.fresh_ttl, now + self.fresh_ttl + self.stale_ttl, payload)
+        try:
+            ResourceCache.set_cached_data(key, payload, timeout=self.fresh_ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"Failed to persist resource cache {key}: {e}")
+
+    # ---------- 抓取 ----------
+
+    def load(self, key: str, loader: Callable[[], Any]) -> Future:
+        """
+        在后台线程中执行loader并写入缓存；同一缓存键已在抓取时返回同一个Future
+
+        loader返回空结果或None时不写入缓存（避免平台临时故障的空结果被缓存）。
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix='resource-search'
+                    )
+                future = self._executor.submit(self._run_loader, key, loader)
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return future
+
+    def _run_loader(self, key: str, loader: Callable[[], Any]) -> Any:
+        close_old_connections()
+        try:
+            payload = loader()
+            if payload:
+                self.store(key, payload)
+            return payload
+        finally:
+            close_old_connections()
+
+    # ---------- 清理 ----------
+
+    def clear_expired(self) -> int:
+        """清理本地和数据库中超过宽限期的缓存，返回删除的数据库记录数"""
+        now = time.time()
+        with self._lock:
+            for key in [key for key, entry in self._local.items() if entry[1] <= now]:
+                del self._local[key]
+        return ResourceCache.clear_expired()
+
+
+# 全局实例
+search_cache = SearchResultCache()
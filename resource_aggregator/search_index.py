@@ -0,0 +1,91 @@
+"""
+学习资源聚合器 - 全文搜索索引
+SQLite下使用FTS5（trigram分词，支持中文子串匹配）索引资源的标题、描述和作者，
+索引由数据库触发器同步（bulk_create/update也能覆盖），结果按bm25相关度排序；
+其他数据库或FTS5不可用时退回icontains查询
+"""
+
+import logging
+from typing import List, Tuple
+
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from .models import LearningResourceSearchDocument
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = LearningResourceSearchDocument._meta.db_table
+
+# trigram分词器只能匹配不少于3个字符的词，更短的词用icontains过滤
+MIN_TERM_LENGTH = 3
+
+# bm25列权重：标题、描述、作者
+BM25_WEIGHTS = (10.0, 1.0, 5.0)
+
+
+class ResourceSearchIndex:
+    """资源全文索引"""
+
+    def __init__(self):
+        self._available = None
+
+    @property
+    def available(self) -> bool:
+        """当前数据库是否已建立FTS5索引（由迁移创建）"""
+        if self._available is None:
+            self._available = self._detect()
+        return self._available
+
+    @staticmethod
+    def _detect() -> bool:
+        if connection.vendor != 'sqlite':
+            return False
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+                return cursor.fetchone() is not None
+        except Exception as e:
+            logger.warning(f"Failed to detect resource search index: {e}")
+            return False
+
+    @staticmethod
+    def split_terms(query: str) -> Tuple[List[str], List[str]]:
+        """拆分搜索词，返回(可走全文索引的词, 过短需要icontains的词)"""
+        terms = list(dict.fromkeys(query.split()))
+        long_terms = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+        short_terms = [term for term in terms if len(term) < MIN_TERM_LENGTH]
+        return long_terms, short_terms
+
+    def search(self, queryset: QuerySet, query: str) -> Tuple[QuerySet, bool]:
+        """
+        按搜索词过滤资源，多个词之间为AND关系
+
+        Returns:
+            (过滤后的查询集, 是否带有相关度search_rank注解，值越小越相关)
+        """
+        long_terms, short_terms = self.split_terms(query)
+        ranked = bool(long_terms) and self.available
+
+        if ranked:
+            match = ' AND '.join('"{}"'.format(term.replace('"', '""')) for term in long_terms)
+            weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+            # 过滤条件产生到索引表的JOIN，bm25在同一查询中计算相关度
+            queryset = queryset.filter(search_document__document__match=match).annotate(
+                search_rank=RawSQL(f'bm25("{FTS_TABLE}", {weights})', [])
+            )
+        else:
+            short_terms = long_terms + short_terms
+
+        for term in short_terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) |
+                Q(description__icontains=term) |
+                Q(author__icontains=term)
+            )
+        return queryset, ranked
+
+
+# 全局实例
+resource_search_index = ResourceSearchIndex()
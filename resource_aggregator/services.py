@@ -4,28 +4,46 @@
 """
 
 import asyncio
-import aiohttp
-import requests
-from typing import Dict, List, Optional, Any
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import AsyncIterator, Dict, List, Optional, Any, Set, Tuple
 from abc import ABC, abstractmethod
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.utils import timezone
-from django.core.cache import cache
+from django.db import connection, transaction
 import logging
 import hashlib
-import json
 
-from .models import LearningResource, ResourceSource, ResourceCategory, ResourceCache
+from .models import LearningResource, ResourceSource, ResourceCategory
+from .runtime import aggregator_runtime
+from .search_cache import search_cache
+from .stats import resource_stats
 
 logger = logging.getLogger(__name__)
 
 
 class ResourceFetcher(ABC):
     """资源获取器基类"""
-    
+
+    API_URL = ''
+
     def __init__(self, source: ResourceSource):
         self.source = source
-        self.session = None
+
+    @property
+    def api_url(self) -> str:
+        """接口地址，资源来源配置了api_endpoint时优先使用"""
+        return self.source.api_endpoint or self.API_URL
+
+    async def _get_json(self, params: Dict, headers: Dict = None) -> Optional[Dict]:
+        """通过平台共享的连接池请求接口，受平台并发数和超时限制"""
+        platform = self.source.platform
+        async with aggregator_runtime.semaphore(platform):
+            session = aggregator_runtime.session(platform)
+            async with session.get(self.api_url, params=params, headers=headers) as response:
+                if response.status != 200:
+                    logger.error(f"{self.source.name} API error: {response.status}")
+                    return None
+                return await response.json(content_type=None)
     
     @abstractmethod
     async def fetch_resources(self, query: str, category: str = None, limit: int = 10) -> List[Dict]:
@@ -45,7 +63,9 @@ class ResourceFetcher(ABC):
 
 class YouTubeFetcher(ResourceFetcher):
     """YouTube资源获取器"""
-    
+
+    API_URL = "https://www.googleapis.com/youtube/v3/search"
+
     async def fetch_resources(self, query: str, category: str = None, limit: int = 10) -> List[Dict]:
         """从YouTube获取资源"""
         if not self.source.api_key:
@@ -53,7 +73,6 @@ class YouTubeFetcher(ResourceFetcher):
             return []
         
         try:
-            url = "https://www.googleapis.com/youtube/v3/search"
             params = {
                 'part': 'snippet',
                 'q': f"{query} programming tutorial",
@@ -63,14 +82,13 @@ class YouTubeFetcher(ResourceFetcher):
                 'order': 'relevance'
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [self.parse_resource(item) for item in data.get('items', [])]
-                    else:
-                        logger.error(f"YouTube API error: {response.status}")
-                        return []
+            data = await self._get_json(params)
+            if data is None:
+                return []
+            return [self.parse_resource(item) for item in data.get('items', [])]
+        except asyncio.TimeoutError:
+            logger.warning("YouTube API timeout")
+            return []
         except Exception as e:
             logger.error(f"Error fetching YouTube resources: {e}")
             return []
@@ -95,11 +113,12 @@ class YouTubeFetcher(ResourceFetcher):
 
 class GitHubFetcher(ResourceFetcher):
     """GitHub资源获取器"""
-    
+
+    API_URL = "https://api.github.com/search/repositories"
+
     async def fetch_resources(self, query: str, category: str = None, limit: int = 10) -> List[Dict]:
         """从GitHub获取资源"""
         try:
-            url = "https://api.github.com/search/repositories"
             params = {
                 'q': f"{query} language:python OR language:javascript OR language:java",
                 'sort': 'stars',
@@ -111,14 +130,13 @@ class GitHubFetcher(ResourceFetcher):
             if self.source.api_key:
                 headers['Authorization'] = f"token {self.source.api_key}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return [self.parse_resource(item) for item in data.get('items', [])]
-                    else:
-                        logger.error(f"GitHub API error: {response.status}")
-                        return []
+            data = await self._get_json(params, headers)
+            if data is None:
+                return []
+            return [self.parse_resource(item) for item in data.get('items', [])]
+        except asyncio.TimeoutError:
+            logger.warning("GitHub API timeout")
+            return []
         except Exception as e:
             logger.error(f"Error fetching GitHub resources: {e}")
             return []
@@ -143,27 +161,27 @@ class GitHubFetcher(ResourceFetcher):
 
 class BilibiliFetcher(ResourceFetcher):
     """Bilibili资源获取器"""
-    
+
+    # 注意：这里使用的是公开API，实际使用时可能需要申请官方API
+    API_URL = "https://api.bilibili.com/x/web-interface/search/all/v2"
+
     async def fetch_resources(self, query: str, category: str = None, limit: int = 10) -> List[Dict]:
         """从Bilibili获取资源"""
         try:
-            # 注意：这里使用的是公开API，实际使用时可能需要申请官方API
-            url = "https://api.bilibili.com/x/web-interface/search/all/v2"
             params = {
                 'keyword': f"{query} 编程 教程",
                 'page': 1,
                 'pagesize': limit
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        videos = data.get('data', {}).get('result', {}).get('video', [])
-                        return [self.parse_resource(item) for item in videos]
-                    else:
-                        logger.error(f"Bilibili API error: {response.status}")
-                        return []
+            data = await self._get_json(params)
+            if data is None:
+                return []
+            videos = data.get('data', {}).get('result', {}).get('video', [])
+            return [self.parse_resource(item) for item in videos]
+        except asyncio.TimeoutError:
+            logger.warning("Bilibili API timeout")
+            return []
         except Exception as e:
             logger.error(f"Error fetching Bilibili resources: {e}")
             return []
@@ -191,6 +209,10 @@ class ResourceAggregatorService:
     def __init__(self):
         self.fetchers = {}
         self._initialized = False
+        # 整个搜索（所有平台）的最长等待时间，单个平台的超时见 RESOURCE_AGGREGATOR_PLATFORMS
+        self.search_timeout = getattr(settings, 'RESOURCE_AGGREGATOR_SEARCH_TIMEOUT', 15)
+        # 流式搜索的截止时间，超时未返回的平台被放弃
+        self.stream_deadline = getattr(settings, 'RESOURCE_AGGREGATOR_STREAM_DEADLINE', 6)
 
     def _initialize_fetchers(self) -> Dict[str, ResourceFetcher]:
         """初始化资源获取器"""
@@ -216,63 +238,169 @@ class ResourceAggregatorService:
             # 在迁移过程中可能会出错，返回空字典
             return {}
     
-    async def search_resources(self, query: str, category: str = None,
-                             platforms: List[str] = None, limit: int = 30) -> List[Dict]:
-        """搜索学习资源"""
+    def _prepare_search(self, query: str, category: str,
+                        platforms: Optional[List[str]]) -> Tuple[Dict[str, ResourceFetcher], str]:
+        """确定参与搜索的获取器并生成缓存键"""
         # 确保fetchers已初始化
         if not self._initialized:
             self._initialize_fetchers()
 
-        if platforms is None:
+        if not platforms:
             platforms = list(self.fetchers.keys())
 
-        # 检查缓存
-        cache_key = self._generate_search_cache_key(query, category, platforms)
+        fetchers = {platform: self.fetchers[platform] for platform in platforms if platform in self.fetchers}
+        return fetchers, self._generate_search_cache_key(query, category, platforms)
+
+    async def _fan_out(self, fetchers: Dict[str, ResourceFetcher], query: str,
+                       category: str, limit: int) -> List[Dict]:
+        """并发请求各平台（在聚合运行时的事件循环中执行）"""
+        per_platform = max(1, limit // len(fetchers))
+        results = await asyncio.gather(
+            *(fetcher.fetch_resources(query, category, per_platform) for fetcher in fetchers.values()),
+            return_exceptions=True
+        )
+
+        all_resources = []
+        for result in results:
+            if isinstance(result, list):
+                all_resources.extend(result)
+            elif isinstance(result, Exception):
+                logger.error(f"Fetcher error: {result}")
+
+        return self._merge(all_resources, limit)
+
+    def _merge(self, resources: List[Dict], limit: int) -> List[Dict]:
+        """去重并排序"""
+        return self._sort_resources(self._deduplicate_resources(resources))[:limit]
+
+    def _load(self, fetchers: Dict[str, ResourceFetcher], query: str,
+              category: str, limit: int) -> List[Dict]:
+        """抓取各平台结果（在搜索缓存的后台线程中执行）"""
+        return aggregator_runtime.run(self._fan_out(fetchers, query, category, limit), timeout=self.search_timeout)
+
+    def _lookup_cached(self, query: str, category: str, platforms: Optional[List[str]],
+                       limit: int) -> Tuple[Dict[str, ResourceFetcher], str, Optional[List[Dict]]]:
+        """查询两级缓存，返回(获取器, 缓存键, 缓存结果)；过期命中时在后台刷新"""
+        fetchers, cache_key = self._prepare_search(query, category, platforms)
+
+        hit = search_cache.lookup(cache_key)
+        if hit is None:
+            return fetchers, cache_key, None
+
+        resources, fresh = hit
+        if not fresh and fetchers:
+            search_cache.load(cache_key, lambda: self._load(fetchers, query, category, limit))
+        return fetchers, cache_key, resources
+
+    def _lookup(self, query: str, category: str, platforms: Optional[List[str]],
+                limit: int) -> Tuple[Optional[List[Dict]], Optional[Future]]:
+        """
+        查询两级缓存，返回(缓存结果, 抓取任务)
+
+        命中时只返回结果；未命中返回抓取任务，同一搜索的并发未命中共用一个任务。
+        """
+        fetchers, cache_key, resources = self._lookup_cached(query, category, platforms, limit)
+        if resources is not None:
+            return resources, None
+        if not fetchers:
+            return [], None
+
+        return None, search_cache.load(cache_key, lambda: self._load(fetchers, query, category, limit))
+
+    def search(self, query: str, category: str = None,
+               platforms: List[str] = None, limit: int = 30) -> List[Dict]:
+        """搜索学习资源（同步调用，等待抓取结果）"""
+        resources, future = self._lookup(query, category, platforms, limit)
+        if future is None:
+            return resources
+
         try:
-            from .models import ResourceCache
-            cached_data = ResourceCache.get_cached_data(cache_key)
-            if cached_data:
-                return cached_data
-        except Exception:
-            # 如果缓存不可用，继续执行
-            pass
-
-        # 并发获取资源
-        tasks = []
-        for platform in platforms:
-            if platform in self.fetchers:
-                fetcher = self.fetchers[platform]
-                task = fetcher.fetch_resources(query, category, limit // len(platforms))
-                tasks.append(task)
-        
+            return future.result(timeout=self.search_timeout) or []
+        except FutureTimeoutError:
+            logger.warning(f"Resource search timed out: {query}")
+        except Exception as e:
+            logger.error(f"Error in search_resources: {e}")
+        return []
+
+    async def search_resources(self, query: str, category: str = None,
+                             platforms: List[str] = None, limit: int = 30) -> List[Dict]:
+        """搜索学习资源（异步视图中使用）"""
+        resources, future = await sync_to_async(self._lookup)(query, category, platforms, limit)
+        if future is None:
+            return resources
+
         try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            all_resources = []
-            
-            for result in results:
-                if isinstance(result, list):
-                    all_resources.extend(result)
-                elif isinstance(result, Exception):
-                    logger.error(f"Fetcher error: {result}")
-            
-            # 排序和去重
-            unique_resources = self._deduplicate_resources(all_resources)
-            sorted_resources = self._sort_resources(unique_resources)
-            
-            # 缓存结果
-            try:
-                from .models import ResourceCache
-                ResourceCache.set_cached_data(cache_key, sorted_resources[:limit])
-            except Exception:
-                # 如果缓存不可用，忽略
-                pass
-            
-            return sorted_resources[:limit]
-            
+            # shield：调用方超时后抓取继续进行，结果仍会写入缓存
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), timeout=self.search_timeout
+            ) or []
+        except asyncio.TimeoutError:
+            logger.warning(f"Resource search timed out: {query}")
         except Exception as e:
             logger.error(f"Error in search_resources: {e}")
-            return []
-    
+        return []
+
+    async def stream_search(self, query: str, category: str = None, platforms: List[str] = None,
+                            limit: int = 30, deadline: float = None) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        流式搜索：每个平台返回后立即产出合并、去重、重新排序后的结果
+
+        产出 (事件, 数据)：'results' 为截至目前的完整排序结果，'done' 为结束事件。
+        超过截止时间仍未返回的平台会被放弃；所有平台都返回时结果写入缓存。
+        """
+        deadline = self.stream_deadline if deadline is None else deadline
+        fetchers, cache_key, cached = await sync_to_async(self._lookup_cached)(query, category, platforms, limit)
+
+        if cached is not None or not fetchers:
+            resources = cached or []
+            yield 'results', {'platform': None, 'results': resources, 'total': len(resources), 'cached': True}
+            yield 'done', {'total': len(resources), 'dropped': [], 'cached': True}
+            return
+
+        per_platform = max(1, limit // len(fetchers))
+        runtime_futures = {}
+        pending = set()
+        for platform, fetcher in fetchers.items():
+            future = aggregator_runtime.submit(fetcher.fetch_resources(query, category, per_platform))
+            task = asyncio.wrap_future(future)
+            runtime_futures[task] = (platform, future)
+            pending.add(task)
+
+        loop = asyncio.get_running_loop()
+        stop_at = loop.time() + deadline
+        all_resources, resources = [], []
+        try:
+            while pending:
+                remaining = stop_at - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    platform = runtime_futures[task][0]
+                    try:
+                        all_resources.extend(task.result())
+                    except Exception as e:
+                        logger.error(f"Fetcher error: {e}")
+                    resources = self._merge(all_resources, limit)
+                    yield 'results', {
+                        'platform': platform,
+                        'results': resources,
+                        'total': len(resources),
+                        'pending': [runtime_futures[t][0] for t in pending],
+                    }
+        finally:
+            # 超过截止时间或客户端断开时取消尚未返回的平台请求
+            for task in pending:
+                runtime_futures[task][1].cancel()
+
+        dropped = [runtime_futures[task][0] for task in pending]
+        if dropped:
+            logger.warning(f"Resource stream search dropped slow platforms: {', '.join(dropped)}")
+        elif resources:
+            await sync_to_async(search_cache.store)(cache_key, resources)
+
+        yield 'done', {'total': len(resources), 'dropped': dropped, 'cached': False}
+
     def _generate_search_cache_key(self, query: str, category: str, platforms: List[str]) -> str:
         """生成搜索缓存键"""
         key_data = f"search:{query}:{category or 'all'}:{':'.join(sorted(platforms))}"
@@ -307,62 +435,115 @@ class ResourceAggregatorService:
         
         return sorted(resources, key=sort_key, reverse=True)
     
-    def save_resources_to_db(self, resources: List[Dict], category_slug: str = None):
-        """保存资源到数据库"""
+    # 已存在的资源同步时只刷新这些热度指标，不覆盖人工维护的内容
+    REFRESH_FIELDS = ['rating', 'view_count', 'like_count']
+    BULK_BATCH_SIZE = 500
+
+    def save_resources_to_db(self, resources: List[Dict], category_slug: str = None) -> Dict[str, int]:
+        """
+        批量保存资源到数据库
+
+        url有唯一约束，所有资源用 bulk_create(update_conflicts=True) 插入或更新热度指标，
+        并发同步同一URL时不会产生重复记录；来源一次性解析，同步数千条资源只需少量查询。
+        写入前按URL查出已有资源，用于统计新增/更新数量，以及在结果缺少热度字段时保留原值
+        （并发同步时数量可能不精确，但数据本身不会重复）。
+
+        Returns:
+            {'created': 新增数量, 'updated': 更新数量}
+        """
+        result = {'created': 0, 'updated': 0}
         try:
-            category = None
-            if category_slug:
-                category = ResourceCategory.objects.get(slug=category_slug)
-            
+            if not category_slug:
+                logger.warning("Cannot save resources without a category")
+                return result
+            category = ResourceCategory.objects.get(slug=category_slug)
+
+            # 同一批结果中重复的URL只保留第一条（结果已按质量排序）
+            unique_resources = {}
             for resource_data in resources:
-                # 检查是否已存在
-                existing = LearningResource.objects.filter(
-                    url=resource_data['url']
-                ).first()
-                
-                if not existing:
-                    # 获取或创建资源来源
-                    source, _ = ResourceSource.objects.get_or_create(
-                        platform=resource_data.get('resource_type', 'custom'),
-                        defaults={'name': resource_data.get('resource_type', 'Custom').title()}
-                    )
-                    
-                    # 创建资源
-                    LearningResource.objects.create(
-                        title=resource_data.get('title', ''),
-                        description=resource_data.get('description', ''),
-                        url=resource_data.get('url', ''),
-                        thumbnail=resource_data.get('thumbnail', ''),
-                        category=category,
-                        resource_type=resource_data.get('resource_type', 'article'),
-                        source=source,
-                        author=resource_data.get('author', ''),
-                        duration=resource_data.get('duration', ''),
-                        language=resource_data.get('language', 'zh-CN'),
-                        rating=resource_data.get('rating', 0.0),
-                        view_count=resource_data.get('view_count', 0),
-                        like_count=resource_data.get('like_count', 0),
-                        tags=resource_data.get('tags', []),
-                        external_id=resource_data.get('external_id', '')
-                    )
+                url = resource_data.get('url')
+                if url and url not in unique_resources:
+                    unique_resources[url] = resource_data
+            if not unique_resources:
+                return result
+
+            sources = self._resolve_sources(
+                {data.get('resource_type', 'custom') for data in unique_resources.values()}
+            )
+
+            urls = list(unique_resources)
+            existing = {}
+            for i in range(0, len(urls), self.BULK_BATCH_SIZE):
+                existing.update(
+                    (row[0], row[1:]) for row in LearningResource.objects.filter(
+                        url__in=urls[i:i + self.BULK_BATCH_SIZE]
+                    ).values_list('url', *self.REFRESH_FIELDS)
+                )
+
+            to_save = []
+            for url, resource_data in unique_resources.items():
+                rating, view_count, like_count = existing.get(url, (0.0, 0, 0))
+                to_save.append(LearningResource(
+                    title=resource_data.get('title', ''),
+                    description=resource_data.get('description', ''),
+                    url=url,
+                    thumbnail=resource_data.get('thumbnail', ''),
+                    category=category,
+                    resource_type=resource_data.get('resource_type', 'article'),
+                    source=sources[resource_data.get('resource_type', 'custom')],
+                    author=resource_data.get('author', ''),
+                    duration=resource_data.get('duration', ''),
+                    language=resource_data.get('language', 'zh-CN'),
+                    rating=resource_data.get('rating', rating),
+                    view_count=resource_data.get('view_count', view_count),
+                    like_count=resource_data.get('like_count', like_count),
+                    tags=resource_data.get('tags', []),
+                    external_id=resource_data.get('external_id', '')
+                ))
+
+            # MySQL的ON DUPLICATE KEY UPDATE不能指定冲突列，PostgreSQL/SQLite需要指定
+            unique_fields = ['url'] if connection.features.supports_update_conflicts_with_target else None
+            with transaction.atomic():
+                LearningResource.objects.bulk_create(
+                    to_save,
+                    batch_size=self.BULK_BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=self.REFRESH_FIELDS,
+                )
+
+            # bulk操作不触发信号，手动标记统计快照待刷新
+            resource_stats.mark_global_dirty()
+
+            updated = sum(1 for url in unique_resources if url in existing)
+            result = {'created': len(to_save) - updated, 'updated': updated}
+            logger.info(f"Saved resources: {result['created']} created, {result['updated']} updated")
         except Exception as e:
             logger.error(f"Error saving resources to DB: {e}")
+        return result
 
+    def _resolve_sources(self, platforms: Set[str]) -> Dict[str, ResourceSource]:
+        """一次查询解析所有来源，缺少的来源批量创建"""
+        sources = {}
+        for source in ResourceSource.objects.filter(platform__in=platforms):
+            sources.setdefault(source.platform, source)
 
-# 同步包装器，用于在Django视图中调用异步方法
-def sync_search_resources(query: str, category: str = None,
-                         platforms: List[str] = None, limit: int = 30) -> List[Dict]:
-    """同步搜索资源的包装器"""
-    service = ResourceAggregatorService()
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(
-            service.search_resources(query, category, platforms, limit)
-        )
-    finally:
-        loop.close()
+        missing = [
+            ResourceSource(platform=platform, name=platform.title())
+            for platform in platforms if platform not in sources
+        ]
+        if missing:
+            ResourceSource.objects.bulk_create(missing)
+            for source in ResourceSource.objects.filter(platform__in=[source.platform for source in missing]):
+                sources.setdefault(source.platform, source)
+        return sources
 
 
 # 全局服务实例
 aggregator_service = ResourceAggregatorService()
+
+
+def sync_search_resources(query: str, category: str = None,
+                         platforms: List[str] = None, limit: int = 30) -> List[Dict]:
+    """同步搜索资源（Django视图和管理命令中使用）"""
+    return aggregator_service.search(query, category, platforms, limit)
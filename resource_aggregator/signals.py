@@ -0,0 +1,37 @@
+"""
+学习资源聚合器 - 信号处理
+资源/分类/来源变化时标记全站统计快照待刷新，交互记录增删时增量更新用户统计和资源站内计数。
+
+bulk_create、bulk_update 和 QuerySet.update() 不会发送 post_save 信号，
+在信号之外批量写入资源、分类或来源的代码必须在写入后自行调用
+resource_stats.mark_global_dirty()（参见 ResourceAggregatorService.save_resources_to_db）
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LearningResource, ResourceCategory, ResourceSource, UserResourceInteraction
+from .stats import resource_stats
+
+
+@receiver(post_save, sender=LearningResource)
+@receiver(post_delete, sender=LearningResource)
+@receiver(post_save, sender=ResourceCategory)
+@receiver(post_delete, sender=ResourceCategory)
+@receiver(post_save, sender=ResourceSource)
+@receiver(post_delete, sender=ResourceSource)
+def mark_stats_dirty(sender, **kwargs):
+    resource_stats.mark_global_dirty()
+
+
+@receiver(post_save, sender=UserResourceInteraction)
+def interaction_created(sender, instance, created, **kwargs):
+    if created:
+        resource_stats.apply_interaction(instance.user_id, instance.action, 1)
+        resource_stats.apply_resource_counter(instance.resource_id, instance.action, 1)
+
+
+@receiver(post_delete, sender=UserResourceInteraction)
+def interaction_deleted(sender, instance, **kwargs):
+    resource_stats.apply_interaction(instance.user_id, instance.action, -1)
+    resource_stats.apply_resource_counter(instance.resource_id, instance.action, -1)
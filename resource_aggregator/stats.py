@@ -0,0 +1,153 @@
+"""
+学习资源聚合器 - 统计快照
+全站统计物化到 ResourceStatsSnapshot：资源、分类、来源变化时只标记待刷新，
+读取时按最小间隔重算（定时任务也会刷新）；用户统计和资源的站内计数在交互记录增删时用F()增量更新。
+统计接口和仪表板只需按主键读取一行
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, List
+
+from django.db import IntegrityError
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import (
+    LearningResource, ResourceCategory, ResourceSource, ResourceStatsSnapshot,
+    UserResourceInteraction, UserResourceStats,
+)
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_KEY = 'global'
+
+# 交互类型与用户统计字段的对应关系
+USER_STAT_FIELDS = {
+    'view': 'viewed_count',
+    'like': 'liked_count',
+    'bookmark': 'bookmarked_count',
+}
+
+# 交互类型与资源站内计数字段的对应关系
+RESOURCE_COUNTER_FIELDS = {
+    'view': 'site_view_count',
+    'like': 'site_like_count',
+    'bookmark': 'site_bookmark_count',
+}
+
+
+class ResourceStatsService:
+    """资源统计快照服务"""
+
+    # 标记待刷新后，两次重算之间的最小间隔
+    MIN_REFRESH_INTERVAL = timedelta(seconds=60)
+    # 快照最长有效期（防止漏标记导致长期不更新）
+    MAX_AGE = timedelta(hours=1)
+    # 用户统计的全量校准周期（修正并发增量可能产生的偏差）
+    USER_RECOMPUTE_AGE = timedelta(days=1)
+
+    # ---------- 全站统计 ----------
+
+    def get_global_stats(self) -> Dict:
+        """读取全站统计快照，附带计算时间"""
+        snapshot = ResourceStatsSnapshot.objects.filter(key=GLOBAL_KEY).first()
+        now = timezone.now()
+        if snapshot is None or now - snapshot.computed_at > self.MAX_AGE or (
+            snapshot.is_dirty and now - snapshot.computed_at > self.MIN_REFRESH_INTERVAL
+        ):
+            snapshot = self.refresh_global()
+
+        return {
+            **snapshot.payload,
+            'computed_at': snapshot.computed_at.isoformat(),
+            'is_stale': snapshot.is_dirty,
+        }
+
+    def refresh_global(self) -> ResourceStatsSnapshot:
+        """重新计算全站统计"""
+        active_resources = LearningResource.objects.filter(is_active=True)
+        payload = {
+            'total_resources': active_resources.count(),
+            'total_categories': ResourceCategory.objects.count(),
+            'total_sources': ResourceSource.objects.filter(is_active=True).count(),
+            'resource_types': list(
+                active_resources.values('resource_type').annotate(count=Count('id')).order_by('-count')
+            ),
+            'top_categories': list(
+                ResourceCategory.objects.annotate(
+                    resource_count=Count('learningresource')
+                ).order_by('-resource_count')[:5]
+                .values('name', 'resource_count')
+            ),
+        }
+        snapshot, _ = ResourceStatsSnapshot.objects.update_or_create(
+            key=GLOBAL_KEY,
+            defaults={'payload': payload, 'computed_at': timezone.now(), 'is_dirty': False}
+        )
+        return snapshot
+
+    def mark_global_dirty(self):
+        """
+        资源、分类或来源发生变化
+
+        逐条保存和删除由信号调用；批量写入（bulk_create/bulk_update/update()）不触发信号，
+        需由写入方在事务提交后调用
+        """
+        ResourceStatsSnapshot.objects.filter(key=GLOBAL_KEY, is_dirty=False).update(is_dirty=True)
+
+    # ---------- 用户统计 ----------
+
+    def get_user_stats(self, user) -> Dict[str, int]:
+        stats = UserResourceStats.objects.filter(user=user).first()
+        if stats is None or timezone.now() - stats.computed_at > self.USER_RECOMPUTE_AGE:
+            stats = self.recompute_user(user.id)
+        return {field: getattr(stats, field) for field in USER_STAT_FIELDS.values()}
+
+    def recompute_user(self, user_id: int) -> UserResourceStats:
+        """按交互记录全量计算用户统计"""
+        counts = dict(
+            UserResourceInteraction.objects.filter(user_id=user_id, action__in=USER_STAT_FIELDS)
+            .values_list('action').annotate(count=Count('id'))
+        )
+        values = {field: counts.get(action, 0) for action, field in USER_STAT_FIELDS.items()}
+        stats, _ = UserResourceStats.objects.update_or_create(
+            user_id=user_id, defaults={**values, 'computed_at': timezone.now()}
+        )
+        return stats
+
+    def apply_interaction(self, user_id: int, action: str, delta: int):
+        """交互记录增删时增量更新用户统计；还没有统计行时全量计算一次"""
+        field = USER_STAT_FIELDS.get(action)
+        if field is None:
+            return
+        updated = UserResourceStats.objects.filter(user_id=user_id).update(**{field: F(field) + delta})
+        if not updated:
+            try:
+                self.recompute_user(user_id)
+            except IntegrityError:
+                # 并发创建，另一方的全量计算已包含本次变化
+                pass
+
+
+    # ---------- 资源站内计数 ----------
+
+    def apply_resource_counter(self, resource_id: int, action: str, delta: int):
+        """交互记录增删时原子更新资源的站内计数"""
+        field = RESOURCE_COUNTER_FIELDS.get(action)
+        if field is not None:
+            LearningResource.objects.filter(id=resource_id).update(**{field: F(field) + delta})
+
+    def get_user_interactions(self, user, resource_ids: List[int]) -> Dict[int, List[str]]:
+        """一次查询获取用户对一批资源的交互类型"""
+        interactions = {}
+        rows = UserResourceInteraction.objects.filter(
+            user=user, resource_id__in=resource_ids
+        ).values_list('resource_id', 'action')
+        for resource_id, action in rows:
+            interactions.setdefault(resource_id, []).append(action)
+        return interactions
+
+
+# 全局实例
+resource_stats = ResourceStatsService()
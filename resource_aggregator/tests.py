@@ -0,0 +1,433 @@
+import asyncio
+import json
+import math
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from aiohttp import web
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import LearningResource, ResourceCache, ResourceCategory, ResourceSource, ResourceStatsSnapshot
+from .runtime import aggregator_runtime
+from .search_cache import SearchResultCache
+from .search_index import resource_search_index
+from .stats import GLOBAL_KEY, resource_stats
+from .services import BilibiliFetcher, GitHubFetcher, aggregator_service
+
+
+def create_resource(**kwargs):
+    """创建测试用资源（自动创建分类和来源）"""
+    category, _ = ResourceCategory.objects.get_or_create(name='测试分类', slug='test')
+    source, _ = ResourceSource.objects.get_or_create(
+        name='测试来源', platform='github', base_url='https://example.com'
+    )
+    fields = {
+        'title': '测试资源',
+        'description': '描述',
+        'url': 'https://example.com/resource',
+        'resource_type': 'tool',
+        'category': category,
+        'source': source,
+    }
+    fields.update(kwargs)
+    return LearningResource.objects.create(**fields)
+
+
+class StubServer:
+    """在独立线程的事件循环中运行的本地aiohttp服务，模拟各平台接口"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        app = web.Application()
+        app.router.add_get('/search', self.handler)
+        self.runner = web.AppRunner(app)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result(timeout=5)
+        return self
+
+    async def _start(self):
+        await self.runner.setup()
+        await web.TCPSite(self.runner, '127.0.0.1', 0).start()
+        self.url = f'http://127.0.0.1:{self.runner.addresses[0][1]}/search'
+
+    def __exit__(self, *exc_info):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+        self.loop.close()
+
+
+def github_payload(count=1):
+    return {'items': [
+        {'id': i, 'name': f'repo-{i}', 'html_url': f'https://github.com/example/repo-{i}', 'language': 'Python'}
+        for i in range(count)
+    ]}
+
+
+def bilibili_payload(count=1):
+    return {'data': {'result': {'video': [
+        {'aid': i, 'title': f'视频{i}', 'arcurl': f'https://www.bilibili.com/video/av{i}'}
+        for i in range(count)
+    ]}}}
+
+
+def make_fetcher(fetcher_class, platform, url):
+    """创建指向本地服务的获取器（api_endpoint覆盖默认接口地址）"""
+    source = ResourceSource(name=platform, platform=platform, base_url='https://example.com', api_endpoint=url)
+    return fetcher_class(source)
+
+
+class AggregatorRuntimeTests(SimpleTestCase):
+    """聚合运行时：按平台超时与并发限制、连接复用、关闭事件循环线程"""
+
+    def tearDown(self):
+        aggregator_runtime.shutdown()
+
+    @override_settings(RESOURCE_AGGREGATOR_PLATFORMS={'github': {'timeout': 0.3}})
+    def test_timeout_is_applied_per_platform(self):
+        async def slow(request):
+            await asyncio.sleep(0.8)
+            payload = github_payload() if 'per_page' in request.query else bilibili_payload()
+            return web.json_response(payload)
+
+        with StubServer(slow) as server:
+            github = make_fetcher(GitHubFetcher, 'github', server.url)
+            bilibili = make_fetcher(BilibiliFetcher, 'bilibili', server.url)
+            started = time.monotonic()
+            self.assertEqual(aggregator_runtime.run(github.fetch_resources('python'), timeout=5), [])
+            self.assertLess(time.monotonic() - started, 0.8)
+            self.assertEqual(len(aggregator_runtime.run(bilibili.fetch_resources('python'), timeout=5)), 1)
+
+    @override_settings(RESOURCE_AGGREGATOR_PLATFORMS={'github': {'max_concurrency': 2}})
+    def test_concurrent_requests_are_bounded_by_semaphore(self):
+        state = {'active': 0, 'peak': 0}
+
+        async def tracked(request):
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            await asyncio.sleep(0.1)
+            state['active'] -= 1
+            return web.json_response(github_payload())
+
+        with StubServer(tracked) as server:
+            fetcher = make_fetcher(GitHubFetcher, 'github', server.url)
+
+            async def fan_out():
+                return await asyncio.gather(*(fetcher.fetch_resources(f'q{i}') for i in range(6)))
+
+            results = aggregator_runtime.run(fan_out(), timeout=5)
+
+        self.assertEqual([len(result) for result in results], [1] * 6)
+        self.assertEqual(state['peak'], 2)
+
+    def test_session_connections_are_reused(self):
+        peers = []
+
+        async def record_peer(request):
+            peers.append(request.transport.get_extra_info('peername'))
+            return web.json_response(github_payload())
+
+        with StubServer(record_peer) as server:
+            fetcher = make_fetcher(GitHubFetcher, 'github', server.url)
+            for query in ('python', 'java', 'go'):
+                aggregator_runtime.run(fetcher.fetch_resources(query), timeout=5)
+
+        self.assertEqual(len(peers), 3)
+        self.assertEqual(len(set(peers)), 1)
+
+    def test_shutdown_closes_sessions_and_stops_loop_thread(self):
+        async def ok(request):
+            return web.json_response(github_payload())
+
+        with StubServer(ok) as server:
+            fetcher = make_fetcher(GitHubFetcher, 'github', server.url)
+            aggregator_runtime.run(fetcher.fetch_resources('python'), timeout=5)
+            thread = aggregator_runtime._thread
+            session = aggregator_runtime._sessions['github']
+
+            aggregator_runtime.shutdown()
+            self.assertFalse(thread.is_alive())
+            self.assertTrue(session.closed)
+            self.assertIsNone(aggregator_runtime._loop)
+
+            # 关闭后再次提交会启动新的事件循环线程
+            self.assertEqual(len(aggregator_runtime.run(fetcher.fetch_resources('python'), timeout=5)), 1)
+            self.assertIsNot(aggregator_runtime._thread, thread)
+
+
+class SearchStreamTests(TestCase):
+    """流式搜索在最快的平台返回后就推送结果，不等待慢平台"""
+
+    def setUp(self):
+        aggregator_service._initialized = False
+
+    def tearDown(self):
+        aggregator_runtime.shutdown()
+        aggregator_service._initialized = False
+
+    async def test_fast_platform_results_arrive_before_slow_platform(self):
+        async def handler(request):
+            if 'per_page' in request.query:
+                return web.json_response(github_payload())
+            await asyncio.sleep(1)
+            return web.json_response(bilibili_payload())
+
+        with StubServer(handler) as server:
+            for platform in ('github', 'bilibili'):
+                await ResourceSource.objects.acreate(
+                    name=platform, platform=platform, base_url='https://example.com', api_endpoint=server.url
+                )
+
+            started = time.monotonic()
+            response = await self.async_client.post(
+                reverse('resource_aggregator:search_stream'),
+                data=json.dumps({'query': f'stream-{started}'}),
+                content_type='application/json',
+            )
+            self.assertTrue(response.is_async)
+
+            events = []
+            async for chunk in response.streaming_content:
+                event, data = chunk.decode('utf-8').split('\n', 2)[:2]
+                events.append((event, json.loads(data[len('data: '):]), time.monotonic() - started))
+
+        (first, first_payload, first_at), (second, second_payload, second_at) = events[:2]
+        self.assertEqual((first, first_payload['platform']), ('event: results', 'github'))
+        self.assertEqual(first_payload['pending'], ['bilibili'])
+        self.assertLess(first_at, 0.8)
+        self.assertEqual((second, second_payload['total']), ('event: results', 2))
+        self.assertGreaterEqual(second_at, 1)
+        self.assertEqual(events[-1][0], 'event: done')
+
+
+class SearchIndexSyncTests(TestCase):
+    """全部迁移执行后，FTS5索引仍由触发器与资源表同步"""
+
+    def setUp(self):
+        if not resource_search_index.available:
+            self.skipTest('当前数据库不支持FTS5全文索引')
+
+    def search(self, query):
+        queryset, ranked = resource_search_index.search(LearningResource.objects.all(), query)
+        self.assertTrue(ranked)
+        return list(queryset)
+
+    def test_inserted_resource_is_searchable(self):
+        resource = create_resource(title='Kubernetes 入门教程')
+        self.assertEqual(self.search('Kubernetes'), [resource])
+
+    def test_updated_and_deleted_resources_are_reindexed(self):
+        resource = create_resource(title='Kubernetes 入门教程')
+        resource.title = 'Terraform 实战'
+        resource.save()
+        self.assertEqual(self.search('Kubernetes'), [])
+        self.assertEqual(self.search('Terraform'), [resource])
+
+        resource.delete()
+        self.assertEqual(self.search('Terraform'), [])
+
+
+class GlobalStatsDirtyTests(TestCase):
+    """逐条写入经信号、批量写入经显式调用，都会把全站统计快照标记为待刷新"""
+
+    def setUp(self):
+        self.resource = create_resource()
+        resource_stats.refresh_global()
+
+    def is_dirty(self):
+        return ResourceStatsSnapshot.objects.get(key=GLOBAL_KEY).is_dirty
+
+    def test_save_and_delete_mark_snapshot_dirty(self):
+        self.assertFalse(self.is_dirty())
+        create_resource(url='https://example.com/other')
+        self.assertTrue(self.is_dirty())
+
+        resource_stats.refresh_global()
+        self.resource.delete()
+        self.assertTrue(self.is_dirty())
+
+    def test_bulk_save_marks_snapshot_dirty(self):
+        resources = [
+            {'title': '新资源', 'url': 'https://example.com/new', 'resource_type': 'github'},
+            {'title': '已有资源', 'url': self.resource.url, 'resource_type': 'github', 'view_count': 10},
+        ]
+        result = aggregator_service.save_resources_to_db(resources, 'test')
+        self.assertEqual(result, {'created': 1, 'updated': 1})
+        self.assertTrue(self.is_dirty())
+        self.assertEqual(resource_stats.refresh_global().payload['total_resources'], 2)
+
+        resource_stats.refresh_global()
+        aggregator_service.save_resources_to_db(resources[1:], 'test')
+        self.assertTrue(self.is_dirty())
+
+
+class SaveResourcesTests(TestCase):
+    """批量保存按URL插入或更新，查询数与资源数量无关，并发同步不会产生重复URL"""
+
+    def setUp(self):
+        self.resource = create_resource(rating=4.5, view_count=5)
+
+    def batch(self, count):
+        return [
+            {'title': f'资源{i}', 'url': f'https://example.com/new/{i}', 'resource_type': 'github', 'view_count': i}
+            for i in range(count)
+        ] + [{'title': '已有资源', 'url': self.resource.url, 'resource_type': 'github', 'view_count': 50}]
+
+    def expected_queries(self, rows):
+        """分类、来源、已有URL、保存点两条和标记统计快照，加上每批一条INSERT ... ON CONFLICT"""
+        fields = [field for field in LearningResource._meta.concrete_fields if not field.primary_key]
+        batch_size = min(aggregator_service.BULK_BATCH_SIZE, connection.ops.bulk_batch_size(fields, []))
+        return 6 + math.ceil(rows / batch_size)
+
+    def test_upsert_query_count_and_split(self):
+        with self.assertNumQueries(self.expected_queries(4)):
+            result = aggregator_service.save_resources_to_db(self.batch(3), 'test')
+        self.assertEqual(result, {'created': 3, 'updated': 1})
+
+        with self.assertNumQueries(self.expected_queries(201)):
+            result = aggregator_service.save_resources_to_db(self.batch(200), 'test')
+        self.assertEqual(result, {'created': 197, 'updated': 4})
+
+        self.assertEqual(LearningResource.objects.count(), 201)
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.view_count, 50)
+        self.assertEqual(self.resource.rating, 4.5)
+
+    def test_concurrent_insert_is_updated_not_duplicated(self):
+        # 模拟另一次同步在查询已有URL之后插入了同一URL
+        with mock.patch.object(LearningResource.objects, 'filter', return_value=LearningResource.objects.none()):
+            aggregator_service.save_resources_to_db(self.batch(0), 'test')
+
+        self.assertEqual(LearningResource.objects.filter(url=self.resource.url).count(), 1)
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.view_count, 50)
+
+
+class ResourceInteractionTests(TestCase):
+    """交互接口返回的计数与数据库一致"""
+
+    def setUp(self):
+        self.resource = create_resource()
+        User = get_user_model()
+        self.user = User.objects.create_user(username='alice', email='alice@example.com', password='pass')
+        self.other = User.objects.create_user(username='bob', email='bob@example.com', password='pass')
+
+    def interact(self, user, action, resource_id=None):
+        self.client.force_login(user)
+        return self.client.post(
+            reverse('resource_aggregator:api_interaction'),
+            data=json.dumps({'resource_id': resource_id or self.resource.id, 'action': action}),
+            content_type='application/json',
+        )
+
+    def test_counts_reflect_other_users_changes(self):
+        self.interact(self.other, 'like')
+        response = self.interact(self.user, 'like')
+        self.assertEqual(response.json()['action'], 'like')
+        self.assertEqual(response.json()['counts']['like'], 2)
+
+        response = self.interact(self.user, 'like')
+        self.assertEqual(response.json()['action'], 'unlike')
+        self.assertEqual(response.json()['counts']['like'], 1)
+
+        self.resource.refresh_from_db()
+        self.assertEqual(self.resource.site_like_count, 1)
+
+    def test_repeated_view_is_counted_once(self):
+        self.interact(self.user, 'view')
+        response = self.interact(self.user, 'view')
+        self.assertEqual(response.json()['counts']['view'], 1)
+
+    def test_missing_resource_returns_404(self):
+        response = self.interact(self.user, 'like', resource_id=self.resource.id + 1000)
+        self.assertEqual(response.status_code, 404)
+
+
+class SearchResultCacheTests(TransactionTestCase):
+    """搜索缓存：新鲜/过期命中、并发未命中合并、空结果不缓存、清理超过宽限期的记录"""
+
+    def setUp(self):
+        self.cache = SearchResultCache()
+        self.cache.fresh_ttl = 60
+        self.cache.stale_ttl = 600
+        self.calls = 0
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def loader(self, payload):
+        def load():
+            self.calls += 1
+            self.release.wait(5)
+            return payload
+        return load
+
+    def test_fresh_and_stale_lookups(self):
+        self.cache.store('fresh', [{'title': 'a'}])
+        self.assertEqual(self.cache.lookup('fresh'), ([{'title': 'a'}], True))
+
+        self.cache.fresh_ttl = 0
+        self.cache.store('stale', [{'title': 'b'}])
+        self.assertEqual(self.cache.lookup('stale'), ([{'title': 'b'}], False))
+
+        # 进程内缓存丢失后从数据库读取，新鲜期由宽限期结束时间推算
+        self.cache._local.clear()
+        self.cache.fresh_ttl = 60
+        self.assertEqual(self.cache.lookup('fresh'), ([{'title': 'a'}], True))
+        self.assertEqual(self.cache.lookup('stale'), ([{'title': 'b'}], False))
+        self.assertIsNone(self.cache.lookup('missing'))
+
+    def test_concurrent_misses_share_one_loader_call(self):
+        first = self.cache.load('key', self.loader([{'title': 'a'}]))
+        second = self.cache.load('key', self.loader([{'title': 'other'}]))
+        self.assertIs(first, second)
+
+        self.release.set()
+        self.assertEqual(first.result(timeout=5), [{'title': 'a'}])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.lookup('key'), ([{'title': 'a'}], True))
+
+    def test_empty_results_are_not_cached(self):
+        self.release.set()
+        self.assertEqual(self.cache.load('empty', self.loader([])).result(timeout=5), [])
+        self.assertIsNone(self.cache.lookup('empty'))
+        self.assertFalse(ResourceCache.objects.filter(cache_key='empty').exists())
+
+    def test_stale_hit_triggers_one_background_refresh(self):
+        self.cache.fresh_ttl = 0
+        self.cache.store(aggregator_service._generate_search_cache_key('python', None, ['github']), [{'title': 'old'}])
+        self.cache.fresh_ttl = 60
+
+        with mock.patch('resource_aggregator.services.search_cache', self.cache), \
+                mock.patch.object(aggregator_service, '_load', lambda *args: self.loader([{'title': 'new'}])()), \
+                mock.patch.object(aggregator_service, 'fetchers', {'github': object()}), \
+                mock.patch.object(aggregator_service, '_initialized', True):
+            self.assertEqual(aggregator_service.search('python', platforms=['github']), [{'title': 'old'}])
+            self.assertEqual(aggregator_service.search('python', platforms=['github']), [{'title': 'old'}])
+
+            futures = list(self.cache._inflight.values())
+            self.assertEqual(len(futures), 1)
+            self.release.set()
+            futures[0].result(timeout=5)
+
+            self.assertEqual(aggregator_service.search('python', platforms=['github']), [{'title': 'new'}])
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_row_is_ignored_and_purged(self):
+        ResourceCache.objects.create(
+            cache_key='expired', data=[{'title': 'a'}], expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.cache.store('live', [{'title': 'b'}])
+
+        self.assertIsNone(self.cache.lookup('expired'))
+        self.assertEqual(self.cache.clear_expired(), 1)
+        self.assertEqual(list(ResourceCache.objects.values_list('cache_key', flat=True)), ['live'])
@@ -12,6 +12,7 @@ urlpatterns = [
     # 主要页面
     path('', views.resource_list, name='list'),
     path('search/', views.ResourceSearchView.as_view(), name='search'),
+    path('search/stream/', views.search_stream, name='search_stream'),
     path('resource/<int:resource_id>/', views.resource_detail, name='detail'),
     path('dashboard/', views.user_dashboard, name='dashboard'),
     
@@ -20,6 +21,7 @@ urlpatterns = [
     path('api/sources/', views.api_sources, name='api_sources'),
     path('api/stats/', views.api_stats, name='api_stats'),
     path('api/interaction/', views.resource_interaction, name='api_interaction'),
+    path('api/interactions/', views.api_interactions, name='api_interactions'),
     
     # 管理功能
     path('admin/sync/', views.admin_sync_resources, name='admin_sync'),
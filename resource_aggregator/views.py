@@ -4,19 +4,22 @@
 """
 
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponseNotAllowed, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.db.models import Q, Count, Avg
+from django.db import transaction
+from django.db.models import Avg
 from django.utils.decorators import method_decorator
 from django.views import View
 import json
 import logging
 
 from .models import LearningResource, ResourceCategory, ResourceSource, UserResourceInteraction
+from .pagination import approximate_count, keyset_paginate
+from .search_index import resource_search_index
 from .services import sync_search_resources, aggregator_service
+from .stats import RESOURCE_COUNTER_FIELDS, resource_stats
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +75,54 @@ class ResourceSearchView(View):
         pass
 
 
+async def search_stream(request):
+    """流式搜索（SSE）：各平台结果到达后立即推送合并排序后的结果"""
+    # Django 4.2 的 require_http_methods 装饰器不支持异步视图，这里手动处理
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+
+    try:
+        data = json.loads(request.body)
+        query = data.get('query', '').strip()
+        category = data.get('category')
+        platforms = data.get('platforms', [])
+        limit = min(int(data.get('limit', 20)), 50)  # 限制最大50个结果
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return JsonResponse({'error': '请求数据格式错误'}, status=400)
+
+    if not query:
+        return JsonResponse({'error': '搜索关键词不能为空'}, status=400)
+
+    async def event_stream():
+        try:
+            async for event, payload in aggregator_service.stream_search(query, category, platforms, limit):
+                yield f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error(f"Stream search error: {e}")
+            yield f"event: error\ndata: {json.dumps({'error': '搜索失败，请稍后重试'}, ensure_ascii=False)}\n\n"
+
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream; charset=utf-8')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# 资源列表的排序方式（最后一个字段保证唯一，用于游标分页）
+LIST_SORT_ORDERINGS = {
+    'relevance': ['search_rank', 'id'],
+    'newest': ['-created_at', '-id'],
+    'popular': ['-view_count', '-like_count', '-id'],
+    'name': ['title', 'id'],
+}
+
+# 交互接口允许的操作，其中点赞/收藏再次提交为取消
+INTERACTION_ACTIONS = {action for action, _ in UserResourceInteraction.ACTION_CHOICES}
+TOGGLE_ACTIONS = ('like', 'bookmark')
+
+# 批量交互状态接口一次最多查询的资源数
+MAX_INTERACTION_IDS = 100
+
+
 @require_http_methods(["GET"])
 def resource_list(request):
     """资源列表页面"""
@@ -102,26 +153,37 @@ def resource_list(request):
     if source_id:
         resources = resources.filter(source_id=source_id)
     
+    ranked = False
     if search_query:
-        resources = resources.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(author__icontains=search_query)
-        )
+        resources, ranked = resource_search_index.search(resources, search_query)
+    
+    # 排序（有搜索词时默认按相关度）
+    sort_by = request.GET.get('sort') or ('relevance' if ranked else 'newest')
+    if sort_by == 'relevance' and not ranked:
+        sort_by = 'newest'
+    ordering = LIST_SORT_ORDERINGS.get(sort_by, LIST_SORT_ORDERINGS['newest'])
     
-    # 排序
-    sort_by = request.GET.get('sort', 'newest')
-    if sort_by == 'newest':
-        resources = resources.order_by('-created_at')
-    elif sort_by == 'popular':
-        resources = resources.order_by('-view_count', '-like_count')
-    elif sort_by == 'name':
-        resources = resources.order_by('title')
+    # 游标分页（不使用OFFSET），总数只统计到上限并缓存
+    page_obj = keyset_paginate(resources, ordering, request.GET.get('cursor'), 20)
+    total_count, total_capped = approximate_count(resources)
     
-    # 分页
-    paginator = Paginator(resources, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    next_query = None
+    if page_obj.has_next:
+        params = request.GET.copy()
+        params.pop('page', None)
+        params['cursor'] = page_obj.next_cursor
+        next_query = params.urlencode()
+    first_params = request.GET.copy()
+    first_params.pop('page', None)
+    first_params.pop('cursor', None)
+    
+    # 当前用户对本页资源的交互状态（一次查询）
+    if request.user.is_authenticated and page_obj.object_list:
+        interactions = resource_stats.get_user_interactions(
+            request.user, [resource.id for resource in page_obj.object_list]
+        )
+        for resource in page_obj.object_list:
+            resource.user_actions = interactions.get(resource.id, [])
     
     # 获取筛选选项
     categories = ResourceCategory.objects.all()
@@ -138,6 +200,11 @@ def resource_list(request):
         'current_source': source_id,
         'search_query': search_query,
         'sort_by': sort_by,
+        'ranked': ranked,
+        'total_count': total_count,
+        'total_capped': total_capped,
+        'next_query': next_query,
+        'first_query': first_params.urlencode(),
         'page_title': '🧰 实用工具箱'
     }
     
@@ -175,7 +242,7 @@ def resource_detail(request, resource_id):
 @login_required
 @require_http_methods(["POST"])
 def resource_interaction(request):
-    """资源交互接口"""
+    """资源交互接口（点赞/收藏再次提交即取消），返回资源最新的站内计数"""
     try:
         data = json.loads(request.body)
         resource_id = data.get('resource_id')
@@ -184,27 +251,57 @@ def resource_interaction(request):
         if not resource_id or not action:
             return JsonResponse({'error': '参数不完整'}, status=400)
         
-        resource = get_object_or_404(LearningResource, id=resource_id)
+        if action not in INTERACTION_ACTIONS:
+            return JsonResponse({'error': '不支持的操作类型'}, status=400)
         
-        # 记录交互
-        interaction, created = UserResourceInteraction.objects.get_or_create(
-            user=request.user,
-            resource=resource,
-            action=action
-        )
+        if not LearningResource.objects.filter(id=resource_id).exists():
+            return JsonResponse({'error': '资源不存在'}, status=404)
         
-        if not created and action in ['like', 'bookmark']:
-            # 如果已存在，则删除（取消操作）
-            interaction.delete()
-            return JsonResponse({'success': True, 'action': f'un{action}'})
+        with transaction.atomic():
+            if action in TOGGLE_ACTIONS and UserResourceInteraction.objects.filter(
+                user=request.user, resource_id=resource_id, action=action
+            ).delete()[0]:
+                result_action = f'un{action}'
+            else:
+                UserResourceInteraction.objects.get_or_create(
+                    user=request.user,
+                    resource_id=resource_id,
+                    action=action
+                )
+                result_action = action
+            
+            # 计数由交互记录的信号原子更新，变更后在同一事务内一次读回全部计数
+            counts = LearningResource.objects.filter(id=resource_id).values(
+                *RESOURCE_COUNTER_FIELDS.values()
+            ).first()
         
-        return JsonResponse({'success': True, 'action': action})
+        return JsonResponse({
+            'success': True,
+            'action': result_action,
+            'counts': {name: counts[field] for name, field in RESOURCE_COUNTER_FIELDS.items()},
+        })
         
     except Exception as e:
         logger.error(f"Interaction error: {e}")
         return JsonResponse({'error': '操作失败'}, status=500)
 
 
+@login_required
+@require_http_methods(["GET"])
+def api_interactions(request):
+    """批量查询当前用户对一组资源的交互状态（?ids=1,2,3）"""
+    try:
+        resource_ids = [int(value) for value in request.GET.get('ids', '').split(',') if value.strip()]
+    except ValueError:
+        return JsonResponse({'error': '参数格式错误'}, status=400)
+    
+    if len(resource_ids) > MAX_INTERACTION_IDS:
+        return JsonResponse({'error': f'一次最多查询{MAX_INTERACTION_IDS}个资源'}, status=400)
+    
+    interactions = resource_stats.get_user_interactions(request.user, resource_ids) if resource_ids else {}
+    return JsonResponse({'success': True, 'interactions': interactions})
+
+
 @require_http_methods(["GET"])
 def api_categories(request):
     """分类API"""
@@ -225,24 +322,8 @@ def api_sources(request):
 
 @require_http_methods(["GET"])
 def api_stats(request):
-    """统计API"""
-    stats = {
-        'total_resources': LearningResource.objects.filter(is_active=True).count(),
-        'total_categories': ResourceCategory.objects.count(),
-        'total_sources': ResourceSource.objects.filter(is_active=True).count(),
-        'resource_types': list(
-            LearningResource.objects.filter(is_active=True)
-            .values('resource_type')
-            .annotate(count=Count('id'))
-            .order_by('-count')
-        ),
-        'top_categories': list(
-            ResourceCategory.objects.annotate(
-                resource_count=Count('learningresource')
-            ).order_by('-resource_count')[:5]
-            .values('name', 'resource_count')
-        )
-    }
+    """统计API（读取统计快照）"""
+    stats = resource_stats.get_global_stats()
     return JsonResponse(stats)
 
 
@@ -252,18 +333,8 @@ def user_dashboard(request):
     """用户仪表板"""
     user = request.user
     
-    # 用户统计
-    user_stats = {
-        'viewed_count': UserResourceInteraction.objects.filter(
-            user=user, action='view'
-        ).count(),
-        'liked_count': UserResourceInteraction.objects.filter(
-            user=user, action='like'
-        ).count(),
-        'bookmarked_count': UserResourceInteraction.objects.filter(
-            user=user, action='bookmark'
-        ).count(),
-    }
+    # 用户统计（随交互记录增量维护）
+    user_stats = resource_stats.get_user_stats(user)
     
     # 最近查看的资源
     recent_views = UserResourceInteraction.objects.filter(
@@ -301,11 +372,11 @@ def admin_sync_resources(request):
         
         # 搜索并保存资源
         results = sync_search_resources(query, category_slug, None, limit)
-        aggregator_service.save_resources_to_db(results, category_slug)
+        saved = aggregator_service.save_resources_to_db(results, category_slug)
         
         return JsonResponse({
             'success': True,
-            'message': f'成功同步 {len(results)} 个资源'
+            'message': f"成功同步 {len(results)} 个资源（新增 {saved['created']} 个，更新 {saved['updated']} 个）"
         })
         
     except Exception as e: